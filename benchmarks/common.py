@@ -0,0 +1,125 @@
+"""
+벤치마크 공용 함수
+
+- 작업 디렉토리를 임시 폴더로 바꿔 저장소 데이터 파일(golf_courses_data.json 등)을 건드리지 않음
+- 지연 시간 통계(p50/p95/p99)와 기준 결과(baseline) 비교
+"""
+import json
+import math
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+from datetime import datetime
+from typing import Dict, List, Optional
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_FILES = ("golf_courses_data.json", "maps_data.json")
+
+
+def prepare_workdir(data_dir: Optional[str] = None) -> str:
+    """
+    임시 작업 디렉토리를 만들고 이동
+
+    data_dir을 지정하면 그 안의 데이터 파일(generate_data.py 결과)을, 없으면 저장소의 기본 데이터 파일을 복사한다.
+    """
+    workdir = tempfile.mkdtemp(prefix="dy-bench-")
+    source_dir = data_dir or REPO_ROOT
+    for name in os.listdir(source_dir):
+        if name.endswith(".json") and (data_dir or name in DATA_FILES):
+            shutil.copy(os.path.join(source_dir, name), workdir)
+    os.chdir(workdir)
+    if REPO_ROOT not in sys.path:
+        sys.path.insert(0, REPO_ROOT)
+    return workdir
+
+
+def percentile(sorted_values: List[float], percent: float) -> float:
+    """정렬된 값의 nearest-rank 백분위수"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(percent / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(latencies: List[float], errors: int, elapsed: float) -> dict:
+    """지연 시간(초) 목록을 ms 단위 통계로 요약"""
+    values = sorted(latencies)
+    count = len(values)
+    return {
+        "requests": count,
+        "errors": errors,
+        "elapsedSec": round(elapsed, 3),
+        "rps": round(count / elapsed, 1) if elapsed > 0 else 0.0,
+        "meanMs": round(sum(values) / count * 1000, 3) if count else 0.0,
+        "p50Ms": round(percentile(values, 50) * 1000, 3),
+        "p95Ms": round(percentile(values, 95) * 1000, 3),
+        "p99Ms": round(percentile(values, 99) * 1000, 3),
+    }
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, stderr=subprocess.DEVNULL
+        ).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_metadata(**options) -> dict:
+    return {
+        "timestamp": datetime.utcnow().isoformat() + "Z",
+        "gitRevision": git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpuCount": os.cpu_count(),
+        "storageBackend": os.getenv("STORAGE_BACKEND", "json"),
+        **options,
+    }
+
+
+def save_json(path: str, data: dict):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+
+
+def load_json(path: str) -> Optional[dict]:
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def compare_to_baseline(results: Dict[str, dict], baseline: Dict[str, dict], threshold: float, metrics=("rps", "p95Ms")) -> List[str]:
+    """
+    기준 결과 대비 성능 저하 항목 목록
+
+    rps(클수록 좋음)가 threshold 비율 이상 줄거나, 지연 시간(작을수록 좋음)이 threshold 비율 이상 늘면 저하로 본다.
+    """
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if not previous:
+            continue
+        for metric in metrics:
+            before, after = previous.get(metric), current.get(metric)
+            if not before or after is None:
+                continue
+            higher_is_better = metric in ("rps", "opsPerSec")
+            change = (after - before) / before
+            if (higher_is_better and change < -threshold) or (not higher_is_better and change > threshold):
+                regressions.append(f"{name}: {metric} {before} -> {after} ({change:+.1%})")
+    return regressions
+
+
+def print_table(results: Dict[str, dict], columns: List[str]):
+    name_width = max([len("scenario")] + [len(name) for name in results])
+    header = "scenario".ljust(name_width) + "".join(column.rjust(12) for column in columns)
+    print(header)
+    print("-" * len(header))
+    for name, result in results.items():
+        print(name.ljust(name_width) + "".join(str(result.get(column, "")).rjust(12) for column in columns))
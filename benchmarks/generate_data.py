@@ -0,0 +1,271 @@
+"""
+대용량 합성 데이터 생성
+
+    python benchmarks/generate_data.py --courses 10000 --output benchmarks/data/10k
+    python benchmarks/generate_data.py --courses 1000000 --maps-per-course 1 --carts-per-course 0 --output /tmp/1m
+
+생성 파일 (모두 JSON 배열, 레코드 단위로 써서 100만 건도 메모리에 모두 올리지 않음):
+- golf_courses_data.json, maps_data.json: 서버가 그대로 읽는 형식
+- cart_models.json: 카트 모델 목록
+- carts.json: 골프장별 카트 (배터리/위치/사용량 텔레메트리 포함)
+- users_data.json: 골프장별 직원 계정 (비밀번호 미설정, 로그인 불가)
+
+같은 --seed면 같은 데이터가 생성된다.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+from datetime import datetime, timedelta
+from typing import Iterable, Iterator, List
+
+NAME_PREFIXES = ["그린", "블루", "레이크", "오션", "마운틴", "스카이", "로얄", "파인", "선셋", "해피",
+                 "골든", "실버", "크리스탈", "에메랄드", "솔", "한빛", "푸른", "백두", "한라", "동해"]
+NAME_SUFFIXES = ["골프클럽", "컨트리클럽", "CC", "골프리조트", "힐스", "밸리", "GC", "레이크사이드"]
+NAME_EN_PREFIXES = ["Green", "Blue", "Lake", "Ocean", "Mountain", "Sky", "Royal", "Pine", "Sunset", "Happy",
+                    "Golden", "Silver", "Crystal", "Emerald", "Sol", "Hanbit", "Pureun", "Baekdu", "Halla", "Donghae"]
+NAME_EN_SUFFIXES = ["Golf Club", "Country Club", "CC", "Golf Resort", "Hills", "Valley", "GC", "Lakeside"]
+
+# (주소, 위도, 경도, 우편번호 앞자리)
+REGIONS = [
+    ("경기도 용인시 처인구", 37.234, 127.201, "17"),
+    ("경기도 여주시", 37.298, 127.637, "12"),
+    ("경기도 포천시", 37.894, 127.200, "11"),
+    ("강원특별자치도 춘천시", 37.881, 127.729, "24"),
+    ("강원특별자치도 홍천군", 37.697, 127.888, "25"),
+    ("충청북도 충주시", 36.991, 127.926, "27"),
+    ("충청남도 천안시 동남구", 36.806, 127.150, "31"),
+    ("전라북도 군산시", 35.967, 126.736, "54"),
+    ("전라남도 여수시", 34.760, 127.662, "59"),
+    ("경상북도 경주시", 35.856, 129.224, "38"),
+    ("경상남도 남해군", 34.837, 127.892, "52"),
+    ("부산광역시 기장군", 35.244, 129.222, "46"),
+    ("제주특별자치도 서귀포시", 33.253, 126.560, "63"),
+    ("인천광역시 중구", 37.473, 126.621, "22"),
+]
+ROAD_NAMES = ["골프장로", "컨트리로", "호수로", "솔숲길", "언덕길", "해안로", "중앙로", "산림로"]
+TERRAINS = ["flat", "hilly", "mountainous", "coastal"]
+COURSE_NAMES = ["챔피언십 코스", "레이크 코스", "마운틴 코스", "밸리 코스"]
+BATTERY_TYPES = ["48V 리튬", "72V 리튬", "48V 납산", "60V 리튬"]
+FEATURES = ["GPS", "자율주행", "원격제어", "LiDAR", "전자 브레이크", "USB 충전", "에어컨"]
+CART_STATUSES = ["active"] * 7 + ["maintenance", "broken", "inactive"]
+SURNAMES = ["김", "이", "박", "최", "정", "강", "조", "윤", "장", "임", "한", "오", "서", "신", "권"]
+GIVEN_NAMES = ["민준", "서연", "도윤", "지우", "하준", "서윤", "지호", "하은", "준서", "수아", "현우", "지민", "건우", "예은"]
+USER_ROLES = ["MANAGER"] + ["STAFF"] * 3 + ["OPERATOR"]
+USER_STATUSES = ["ACTIVE"] * 8 + ["INACTIVE", "SUSPENDED"]
+DEPARTMENTS = ["운영팀", "코스관리팀", "카트관리팀", "고객지원팀"]
+
+BASE_TIME = datetime(2024, 1, 1)
+
+
+def iso(moment: datetime) -> str:
+    return moment.strftime("%Y-%m-%dT%H:%M:%S.000Z")
+
+
+def generate_golf_courses(count: int, rng: random.Random) -> Iterator[dict]:
+    for i in range(1, count + 1):
+        prefix = rng.randrange(len(NAME_PREFIXES))
+        suffix = rng.randrange(len(NAME_SUFFIXES))
+        region, lat, lng, zip_prefix = rng.choice(REGIONS)
+        created = BASE_TIME + timedelta(minutes=rng.randrange(0, 525600))
+        total_carts = rng.randrange(20, 150)
+        yield {
+            "id": f"GC-{i:07d}",
+            "courseName": f"{NAME_PREFIXES[prefix]}{NAME_SUFFIXES[suffix]} {i}",
+            "courseNameEn": f"{NAME_EN_PREFIXES[prefix]} {NAME_EN_SUFFIXES[suffix]} {i}",
+            "courseCode": f"C{i:07d}",
+            "address": {
+                "zipcode": f"{zip_prefix}{rng.randrange(0, 1000):03d}",
+                "address1": f"{region} {rng.choice(ROAD_NAMES)} {rng.randrange(1, 500)}",
+                "address2": f"{NAME_PREFIXES[prefix]}{NAME_SUFFIXES[suffix]} 클럽하우스"
+            },
+            "contact": {
+                "phone": f"0{rng.randrange(31, 65)}-{rng.randrange(100, 1000)}-{rng.randrange(1000, 10000)}",
+                "fax": f"0{rng.randrange(31, 65)}-{rng.randrange(100, 1000)}-{rng.randrange(1000, 10000)}",
+                "email": f"info{i}@golf{i % 1000}.co.kr"
+            },
+            "location": {
+                "latitude": round(lat + rng.uniform(-0.2, 0.2), 6),
+                "longitude": round(lng + rng.uniform(-0.2, 0.2), 6),
+                "altitude": rng.randrange(0, 600),
+                "coordinateSystem": "WGS84"
+            },
+            "operation": {
+                "totalHoles": rng.choice([9, 18, 18, 27, 36]),
+                "operatingHours": {"summer": "05:30 - 19:30", "winter": "06:30 - 17:30"},
+                "closedDays": rng.choice(["연중무휴", "매주 월요일", "매월 첫째주 화요일"]),
+                "cartPolicy": {
+                    "fairwayAccess": rng.random() < 0.5,
+                    "rainPolicy": rng.choice(["우천시 운행 중지", "소나기 시에만 운행 중지", "상황에 따라 결정"]),
+                    "maxSpeed": rng.choice([15, 18, 20, 25])
+                }
+            },
+            "environment": {
+                "terrain": rng.sample(TERRAINS, rng.randrange(1, 3)),
+                "gpsShadedAreas": {"count": rng.randrange(0, 4), "locations": ""},
+                "specialNotes": ""
+            },
+            "totalCarts": total_carts,
+            "activeCarts": rng.randrange(total_carts // 2, total_carts + 1),
+            "status": "active" if rng.random() < 0.85 else rng.choice(["inactive", "maintenance"]),
+            "lastModified": iso(created + timedelta(days=rng.randrange(0, 60))),
+            "createdAt": iso(created)
+        }
+
+
+def generate_maps(course_count: int, per_course: int, rng: random.Random) -> Iterator[dict]:
+    number = 0
+    for course in range(1, course_count + 1):
+        for _ in range(per_course):
+            number += 1
+            created = BASE_TIME + timedelta(minutes=rng.randrange(0, 525600))
+            yield {
+                "mapId": f"MAP-{number:07d}",
+                "mapName": f"{rng.choice(COURSE_NAMES)} 맵 {number}",
+                "connectedGolfCourseId": f"GC-{course:07d}",
+                "version": f"1.{rng.randrange(0, 5)}.{rng.randrange(0, 10)}",
+                "createdAt": iso(created),
+                "updatedAt": iso(created + timedelta(days=rng.randrange(0, 30))),
+                "mapStatus": {
+                    "status": "active" if rng.random() < 0.7 else rng.choice(["testing", "inactive"]),
+                    "validationStatus": rng.choice(["verified", "pending"])
+                },
+                "mapData": {
+                    "resolution": "2048x2048",
+                    "size": f"{rng.uniform(5, 60):.1f}MB",
+                    "originGps": {"latitude": round(rng.uniform(33.2, 38.5), 6), "longitude": round(rng.uniform(126.1, 129.5), 6)},
+                    "rotation": rng.randrange(0, 360)
+                },
+                "mapFiles": {"imageFile": "", "metadataFile": ""},
+                "courseInfo": {"totalCourses": 18, "defaultMode": "auto", "defaultSpeedLimit": 15}
+            }
+
+
+def generate_cart_models(count: int, rng: random.Random) -> List[dict]:
+    models = []
+    for i in range(1, count + 1):
+        year = rng.randrange(2018, 2026)
+        created = iso(datetime(year, rng.randrange(1, 13), rng.randrange(1, 28)))
+        models.append({
+            "id": f"MODEL-{i:05d}",
+            "modelName": f"DY-CART-{year}-{i}",
+            "modelCode": f"DYC{year}{i:05d}",
+            "year": year,
+            "specs": {"maxSpeed": rng.choice([18, 20, 25, 30]), "batteryType": rng.choice(BATTERY_TYPES), "seats": rng.choice([2, 4, 6])},
+            "features": rng.sample(FEATURES, rng.randrange(1, 5)),
+            "status": "active" if year >= 2021 else rng.choice(["active", "discontinued"]),
+            "createdAt": created,
+            "updatedAt": created
+        })
+    return models
+
+
+def generate_carts(course_count: int, per_course: int, models: List[dict], rng: random.Random) -> Iterator[dict]:
+    number = 0
+    for course in range(1, course_count + 1):
+        course_lat = rng.uniform(33.2, 38.5)
+        course_lng = rng.uniform(126.1, 129.5)
+        for position in range(1, per_course + 1):
+            number += 1
+            model = rng.choice(models)
+            battery = rng.randrange(5, 101)
+            total_hours = round(rng.uniform(10, 3000), 1)
+            deployed = BASE_TIME + timedelta(days=rng.randrange(0, 365))
+            yield {
+                "id": f"cart-{number:08d}",
+                "golfCourseId": f"GC-{course:07d}",
+                "cartNumber": f"CART-{position:03d}",
+                "serialNumber": f"DY-{number:08d}",
+                "modelId": model["id"],
+                "modelName": model["modelName"],
+                "status": rng.choice(CART_STATUSES),
+                "deployedAt": deployed.strftime("%Y-%m-%d"),
+                "lastMaintenanceAt": (deployed + timedelta(days=rng.randrange(0, 90))).strftime("%Y-%m-%d"),
+                "notes": "",
+                "telemetry": {
+                    "batteryLevel": battery,
+                    "batteryVoltage": round(44 + battery * 0.08, 2),
+                    "chargeCycles": rng.randrange(0, 1500),
+                    "isCharging": battery < 30 and rng.random() < 0.6,
+                    "speed": 0 if rng.random() < 0.5 else round(rng.uniform(3, 20), 1),
+                    "location": {
+                        "latitude": round(course_lat + rng.uniform(-0.005, 0.005), 6),
+                        "longitude": round(course_lng + rng.uniform(-0.005, 0.005), 6),
+                        "hole": rng.randrange(1, 19)
+                    },
+                    "usage": {"totalDistance": round(total_hours * rng.uniform(5, 9), 1), "totalHours": total_hours},
+                    "lastUpdate": iso(BASE_TIME + timedelta(seconds=rng.randrange(0, 31536000)))
+                },
+                "createdAt": iso(deployed),
+                "updatedAt": iso(deployed)
+            }
+
+
+def generate_users(course_count: int, per_course: int, rng: random.Random) -> Iterator[dict]:
+    number = 0
+    for course in range(1, course_count + 1):
+        for _ in range(per_course):
+            number += 1
+            created = BASE_TIME + timedelta(minutes=rng.randrange(0, 525600))
+            yield {
+                "id": f"USER-{number:07d}",
+                "email": f"staff{number:07d}@gc{course:07d}.dy-golf.com",
+                "name": rng.choice(SURNAMES) + rng.choice(GIVEN_NAMES),
+                "role": rng.choice(USER_ROLES),
+                "status": rng.choice(USER_STATUSES),
+                "phone": f"010-{rng.randrange(1000, 10000)}-{rng.randrange(1000, 10000)}",
+                "department": rng.choice(DEPARTMENTS),
+                "golfCourseId": f"GC-{course:07d}",
+                "lastLoginAt": iso(created + timedelta(days=rng.randrange(0, 60))),
+                "createdAt": iso(created)
+            }
+
+
+def write_json_array(path: str, records: Iterable[dict]) -> int:
+    """JSON 배열을 레코드 단위로 써서 메모리 사용량을 일정하게 유지"""
+    count = 0
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("[")
+        for record in records:
+            f.write(",\n" if count else "\n")
+            f.write(json.dumps(record, ensure_ascii=False))
+            count += 1
+        f.write("\n]\n")
+    return count
+
+
+def generate(output: str, courses: int, maps_per_course: int = 2, cart_models: int = 50, carts_per_course: int = 20, users_per_course: int = 3, seed: int = 42) -> dict:
+    """데이터 디렉토리 생성, 파일별 레코드 수 반환"""
+    os.makedirs(output, exist_ok=True)
+    rng = random.Random(seed)
+    models = generate_cart_models(cart_models, rng)
+    return {
+        "golf_courses_data.json": write_json_array(os.path.join(output, "golf_courses_data.json"), generate_golf_courses(courses, rng)),
+        "maps_data.json": write_json_array(os.path.join(output, "maps_data.json"), generate_maps(courses, maps_per_course, rng)),
+        "cart_models.json": write_json_array(os.path.join(output, "cart_models.json"), models),
+        "carts.json": write_json_array(os.path.join(output, "carts.json"), generate_carts(courses, carts_per_course, models, rng)),
+        "users_data.json": write_json_array(os.path.join(output, "users_data.json"), generate_users(courses, users_per_course, rng)),
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="대용량 합성 데이터 생성")
+    parser.add_argument("--courses", type=int, default=1000, help="골프장 수 (1000 ~ 1000000)")
+    parser.add_argument("--maps-per-course", type=int, default=2)
+    parser.add_argument("--cart-models", type=int, default=50)
+    parser.add_argument("--carts-per-course", type=int, default=20)
+    parser.add_argument("--users-per-course", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", required=True, help="출력 디렉토리")
+    args = parser.parse_args(argv)
+
+    counts = generate(args.output, args.courses, args.maps_per_course, args.cart_models, args.carts_per_course, args.users_per_course, args.seed)
+    for name, count in counts.items():
+        size = os.path.getsize(os.path.join(args.output, name)) / (1024 * 1024)
+        print(f"💾 {name}: {count}건 ({size:.1f}MB)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
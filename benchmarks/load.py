@@ -0,0 +1,308 @@
+"""
+API 부하 벤치마크
+
+    python benchmarks/load.py                               # 프로세스 내 ASGI 호출, 전체 시나리오
+    python benchmarks/load.py --target uvicorn --workers 2  # 로컬 uvicorn 서버에 HTTP 요청
+    python benchmarks/load.py --scenarios golf_courses_list,auth_me --duration 10 --concurrency 32
+    python benchmarks/load.py --baseline benchmarks/baselines/asgi.json --threshold 0.15
+    python benchmarks/load.py --save-baseline benchmarks/baselines/asgi.json
+
+--baseline을 지정하면 기준 결과와 비교하여 rps/p95가 threshold 이상 나빠진 시나리오가 있으면 종료 코드 1을 반환한다.
+"""
+import argparse
+import asyncio
+import itertools
+import os
+import socket
+import subprocess
+import sys
+import time
+from typing import Awaitable, Callable, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import httpx  # noqa: E402
+
+from common import (  # noqa: E402
+    REPO_ROOT,
+    compare_to_baseline,
+    load_json,
+    prepare_workdir,
+    print_table,
+    run_metadata,
+    save_json,
+    summarize,
+)
+
+ADMIN_EMAIL = "admin@dy.com"
+ADMIN_PASSWORD = "SystemAdminPassword123"
+
+
+class BenchContext:
+    """시나리오 간 공유 값 (로그인 토큰, 검색어, 기존 ID 등)"""
+
+    def __init__(self):
+        self.access_token = ""
+        self.course_names: List[str] = []
+        self.course_codes: List[str] = []
+        self.counter = itertools.count()
+
+    async def setup(self, client: httpx.AsyncClient):
+        response = await client.post("/api/auth/login", json={"email": ADMIN_EMAIL, "password": ADMIN_PASSWORD})
+        response.raise_for_status()
+        self.access_token = response.json()["data"]["accessToken"]
+
+        courses = (await client.get("/api/golf-courses", params={"limit": 100})).json()["data"]["items"]
+        self.course_names = [c["courseName"] for c in courses] or ["골프"]
+        self.course_codes = [c["courseCode"] for c in courses] or ["GC"]
+
+
+Scenario = Callable[[httpx.AsyncClient, BenchContext, int], Awaitable[List[httpx.Response]]]
+SCENARIOS: Dict[str, Scenario] = {}
+
+
+def scenario(name: str):
+    def register(func: Scenario) -> Scenario:
+        SCENARIOS[name] = func
+        return func
+    return register
+
+
+@scenario("golf_courses_list")
+async def golf_courses_list(client, ctx, i):
+    return [await client.get("/api/golf-courses", params={"page": 1, "limit": 20})]
+
+
+@scenario("golf_courses_search")
+async def golf_courses_search(client, ctx, i):
+    name = ctx.course_names[i % len(ctx.course_names)]
+    return [await client.get("/api/golf-courses", params={"search": name[:2], "status": "active"})]
+
+
+@scenario("golf_courses_paginate")
+async def golf_courses_paginate(client, ctx, i):
+    return [await client.get("/api/golf-courses", params={"page": i % 10 + 1, "limit": 10, "sortBy": "courseName"})]
+
+
+@scenario("maps_list")
+async def maps_list(client, ctx, i):
+    return [await client.get("/api/maps", params={"page": 1, "limit": 20})]
+
+
+@scenario("maps_search")
+async def maps_search(client, ctx, i):
+    return [await client.get("/api/maps", params={"search": "맵", "status": "active", "page": i % 5 + 1})]
+
+
+@scenario("duplicate_checks")
+async def duplicate_checks(client, ctx, i):
+    name = ctx.course_names[i % len(ctx.course_names)]
+    code = ctx.course_codes[i % len(ctx.course_codes)]
+    return [
+        await client.get("/api/golf-courses/check-name", params={"name": name}),
+        await client.get("/api/golf-courses/check-code", params={"code": code}),
+    ]
+
+
+@scenario("cart_models_crud")
+async def cart_models_crud(client, ctx, i):
+    """생성 -> 조회 -> 수정 -> 삭제 한 주기를 하나의 작업으로 측정"""
+    code = f"BENCH{os.getpid()}-{next(ctx.counter)}"
+    created = await client.post("/api/cart-models/", json={
+        "modelName": f"벤치마크 {code}",
+        "modelCode": code,
+        "year": 2024,
+        "specs": {"maxSpeed": 20, "batteryType": "48V 리튬", "seats": 4},
+        "features": ["GPS"],
+    })
+    if created.status_code >= 400:
+        return [created]
+    model_id = created.json()["data"]["id"]
+    return [
+        created,
+        await client.get(f"/api/cart-models/{model_id}"),
+        await client.put(f"/api/cart-models/{model_id}", json={"status": "discontinued"}),
+        await client.delete(f"/api/cart-models/{model_id}"),
+    ]
+
+
+@scenario("cart_models_list")
+async def cart_models_list(client, ctx, i):
+    return [await client.get("/api/cart-models/", params={"search": "DY", "sortBy": "year"})]
+
+
+@scenario("auth_login")
+async def auth_login(client, ctx, i):
+    return [await client.post("/api/auth/login", json={"email": ADMIN_EMAIL, "password": ADMIN_PASSWORD})]
+
+
+@scenario("auth_me")
+async def auth_me(client, ctx, i):
+    return [await client.get("/api/auth/me", headers={"Authorization": f"Bearer {ctx.access_token}"})]
+
+
+def is_error(response: httpx.Response) -> bool:
+    if response.status_code >= 400:
+        return True
+    # 기존 API는 일부 오류를 200 + success: false로 반환
+    if response.headers.get("content-type", "").startswith("application/json"):
+        body = response.json()
+        return isinstance(body, dict) and body.get("success") is False
+    return False
+
+
+async def run_scenario(client: httpx.AsyncClient, ctx: BenchContext, name: str, duration: float, concurrency: int, warmup: int, max_requests: int) -> dict:
+    func = SCENARIOS[name]
+    for i in range(warmup):
+        await func(client, ctx, i)
+
+    latencies: List[float] = []
+    errors = 0
+    requests_sent = 0
+    sequence = itertools.count()
+    deadline = time.perf_counter() + duration
+
+    async def worker():
+        nonlocal errors, requests_sent
+        while time.perf_counter() < deadline:
+            i = next(sequence)
+            if max_requests and i >= max_requests:
+                return
+            started = time.perf_counter()
+            try:
+                responses = await func(client, ctx, i)
+            except httpx.HTTPError:
+                errors += 1
+                continue
+            latencies.append(time.perf_counter() - started)
+            requests_sent += len(responses)
+            errors += sum(1 for r in responses if is_error(r))
+
+    started = time.perf_counter()
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    result = summarize(latencies, errors, time.perf_counter() - started)
+    if latencies:
+        result["requestsPerOp"] = round(requests_sent / len(latencies), 2)
+    return result
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_uvicorn(workers: int) -> tuple:
+    """현재(임시) 작업 디렉토리에서 uvicorn 서버 실행 후 준비 상태가 될 때까지 대기"""
+    port = free_port()
+    env = {**os.environ, "PYTHONPATH": REPO_ROOT}
+    command = [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning", "--no-access-log"]
+    if workers > 1:
+        command += ["--workers", str(workers)]
+        env.setdefault("WEB_CONCURRENCY", str(workers))
+    process = subprocess.Popen(command, env=env, stdout=subprocess.DEVNULL)
+
+    base_url = f"http://127.0.0.1:{port}"
+    for _ in range(100):
+        if process.poll() is not None:
+            raise RuntimeError("uvicorn 서버 시작 실패")
+        try:
+            # 저장소 로드/워밍업이 끝나면 200
+            if httpx.get(base_url + "/readyz", timeout=0.5).status_code == 200:
+                return process, base_url
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.1)
+    process.terminate()
+    raise RuntimeError("uvicorn 서버 응답 대기 시간 초과")
+
+
+async def run(args) -> Dict[str, dict]:
+    process = None
+    if args.target == "asgi":
+        from main import app
+        transport = httpx.ASGITransport(app=app)
+        base_url = "http://bench"
+    else:
+        process, base_url = start_uvicorn(args.workers)
+        transport = None
+
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    results = {}
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url=base_url, limits=limits, timeout=30) as client:
+            ctx = BenchContext()
+            await ctx.setup(client)
+            for name in args.scenarios:
+                results[name] = await run_scenario(
+                    client, ctx, name, args.duration, args.concurrency, args.warmup, args.requests
+                )
+                print(f"  {name}: {results[name]['rps']} ops/s, p95 {results[name]['p95Ms']} ms", flush=True)
+    finally:
+        if process:
+            process.terminate()
+            process.wait(timeout=30)
+    return results
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="API 부하 벤치마크")
+    parser.add_argument("--target", choices=("asgi", "uvicorn"), default="asgi", help="asgi: 프로세스 내 호출, uvicorn: 로컬 서버")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn 워커 수")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="쉼표로 구분한 시나리오 이름")
+    parser.add_argument("--duration", type=float, default=5.0, help="시나리오별 측정 시간(초)")
+    parser.add_argument("--requests", type=int, default=0, help="시나리오별 최대 작업 수 (0: 시간으로만 제한)")
+    parser.add_argument("--concurrency", type=int, default=16, help="동시 요청 수")
+    parser.add_argument("--warmup", type=int, default=20, help="측정 전 워밍업 작업 수")
+    parser.add_argument("--data-dir", help="generate_data.py로 만든 데이터 디렉토리")
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    parser.add_argument("--baseline", help="비교할 기준 결과 JSON")
+    parser.add_argument("--save-baseline", help="이번 결과를 기준 결과로 저장할 경로")
+    parser.add_argument("--threshold", type=float, default=0.15, help="허용 성능 저하 비율 (0.15 = 15%%)")
+    args = parser.parse_args(argv)
+    args.scenarios = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    unknown = [name for name in args.scenarios if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"알 수 없는 시나리오: {', '.join(unknown)} (사용 가능: {', '.join(SCENARIOS)})")
+    return args
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    # 결과 파일 경로는 작업 디렉토리 이동 전에 절대 경로로 변환
+    paths = {key: os.path.abspath(getattr(args, key)) for key in ("output", "baseline", "save_baseline", "data_dir") if getattr(args, key)}
+    workdir = prepare_workdir(paths.get("data_dir"))
+    print(f"⏱️ {args.target} 대상, 동시 {args.concurrency}, 시나리오별 {args.duration}초 (작업 디렉토리 {workdir})")
+
+    results = asyncio.run(run(args))
+    report = {
+        "meta": run_metadata(target=args.target, workers=args.workers, concurrency=args.concurrency, duration=args.duration),
+        "results": results,
+    }
+
+    print()
+    print_table(results, ["rps", "p50Ms", "p95Ms", "p99Ms", "errors"])
+
+    if "output" in paths:
+        save_json(paths["output"], report)
+    if "save_baseline" in paths:
+        save_json(paths["save_baseline"], report)
+        print(f"💾 기준 결과 저장: {paths['save_baseline']}")
+
+    if "baseline" in paths:
+        baseline = load_json(paths["baseline"])
+        if baseline is None:
+            print(f"⚠️ 기준 결과 파일이 없습니다: {paths['baseline']}")
+            return 0
+        regressions = compare_to_baseline(results, baseline.get("results", {}), args.threshold)
+        if regressions:
+            print(f"\n❌ 기준 대비 {args.threshold:.0%} 이상 성능 저하:")
+            for line in regressions:
+                print(f"  - {line}")
+            return 1
+        print(f"\n✅ 기준 대비 성능 저하 없음 (허용 {args.threshold:.0%})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
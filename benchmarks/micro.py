@@ -0,0 +1,150 @@
+"""
+데이터 규모별 마이크로벤치마크
+
+    python benchmarks/micro.py --sizes 1000,10000,100000
+    python benchmarks/micro.py --sizes 10000 --baseline benchmarks/baselines/micro.json
+    STORAGE_BACKEND=sqlite python benchmarks/micro.py --sizes 100000
+
+규모마다 generate_data.py로 합성 데이터를 만든 뒤 별도 프로세스에서 모듈을 새로 로드하여
+필터/검색/페이지네이션, 맵 골프장 이름 추가, 사용자 필터/접두어 검색, 저장소 로드/저장 시간을 측정한다.
+결과 이름은 "벤치마크@규모" 형식이며 load.py와 같은 방식으로 기준 결과와 비교한다.
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Callable, Dict
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from common import (  # noqa: E402
+    compare_to_baseline,
+    load_json,
+    prepare_workdir,
+    print_table,
+    run_metadata,
+    save_json,
+    summarize,
+)
+from generate_data import generate  # noqa: E402
+
+
+def measure(func: Callable[[], object], min_time: float, min_runs: int) -> dict:
+    """min_time초 이상, min_runs회 이상 반복 실행한 호출별 지연 시간 통계"""
+    latencies = []
+    started = time.perf_counter()
+    while len(latencies) < min_runs or time.perf_counter() - started < min_time:
+        call_started = time.perf_counter()
+        func()
+        latencies.append(time.perf_counter() - call_started)
+    return summarize(latencies, 0, time.perf_counter() - started)
+
+
+def run_size(size: int, min_time: float, data_dir: str = None) -> Dict[str, dict]:
+    """한 규모의 벤치마크 실행 (모듈 전역 저장소를 쓰므로 규모마다 새 프로세스에서 호출)"""
+    if data_dir is None:
+        data_dir = tempfile.mkdtemp(prefix=f"dy-data-{size}-")
+        generate(data_dir, courses=size, maps_per_course=1, cart_models=max(10, size // 100), carts_per_course=0)
+    prepare_workdir(data_dir)
+
+    load_started = time.perf_counter()
+    from routers.cart_models import cart_model_repository, filter_cart_models
+    from routers.golf_courses import get_golf_courses, golf_course_repository
+    from routers.maps import get_maps, map_repository
+    from routers.users import get_users
+    import_sec = time.perf_counter() - load_started
+
+    with open("cart_models.json", 'r', encoding='utf-8') as f:
+        cart_model_repository.upsert_many(json.load(f))
+
+    loop = asyncio.new_event_loop()
+    run = loop.run_until_complete
+    slow_runs = 3
+
+    benchmarks = {
+        "filter_cart_models": (lambda: filter_cart_models("DY-CART-202", "active", "year", "desc", 0, 20), 20),
+        "golf_courses_list": (lambda: run(get_golf_courses(page=1, limit=20)), 20),
+        "golf_courses_filter_search": (lambda: run(get_golf_courses(page=3, limit=20, search="그린", status="active")), 20),
+        "golf_courses_sort": (lambda: run(get_golf_courses(page=5, limit=20, sortBy="courseName", sortOrder="desc")), 10),
+        "golf_courses_list_fields": (lambda: run(get_golf_courses(page=1, limit=100, fields="courseName,courseCode,status,totalCarts,activeCarts")), 20),
+        "maps_enrichment": (lambda: run(get_maps(page=1, limit=100)), 20),
+        "maps_by_course": (lambda: run(get_maps(golfCourseId="GC-0000001")), 20),
+        "users_filter_search": (lambda: run(get_users(page=1, limit=20, role="STAFF", status="ACTIVE", search="김")), 20),
+        "users_by_course": (lambda: run(get_users(page=1, limit=20, golfCourseId="GC-0000001")), 20),
+    }
+    # 파일 전체 로드/저장은 JSON 백엔드에만 해당
+    if hasattr(golf_course_repository, "save"):
+        benchmarks["golf_courses_save"] = (golf_course_repository.save, slow_runs)
+        benchmarks["golf_courses_load"] = (lambda: golf_course_repository.load([]), slow_runs)
+        benchmarks["maps_save"] = (map_repository.save, slow_runs)
+
+    results = {"startup_import": {"requests": 1, "errors": 0, "elapsedSec": round(import_sec, 3), "rps": round(1 / import_sec, 3), "p95Ms": round(import_sec * 1000, 3)}}
+    for name, (func, min_runs) in benchmarks.items():
+        results[name] = measure(func, min_time, min_runs)
+        print(f"  [{size}] {name}: {results[name]['rps']} ops/s, p95 {results[name]['p95Ms']} ms", file=sys.stderr, flush=True)
+    loop.close()
+    return {f"{name}@{size}": result for name, result in results.items()}
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="데이터 규모별 마이크로벤치마크")
+    parser.add_argument("--sizes", default="1000,10000", help="골프장 수 (쉼표 구분, 맵 1개/골프장)")
+    parser.add_argument("--min-time", type=float, default=1.0, help="벤치마크별 최소 측정 시간(초)")
+    parser.add_argument("--data-dir", help="이미 생성한 데이터 디렉토리 사용 (--sizes는 결과 이름에만 사용)")
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    parser.add_argument("--baseline", help="비교할 기준 결과 JSON")
+    parser.add_argument("--save-baseline", help="이번 결과를 기준 결과로 저장할 경로")
+    parser.add_argument("--threshold", type=float, default=0.2, help="허용 성능 저하 비율 (0.2 = 20%%)")
+    parser.add_argument("--single-size", type=int, help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    if args.single_size:
+        # 하위 프로세스: 결과를 stdout에 JSON으로 출력 (앱 로그를 먼저 모두 출력하여 결과가 마지막 줄이 되도록 함)
+        results = run_size(args.single_size, args.min_time, args.data_dir)
+        from dependencies.logger import flush
+        flush()
+        print(json.dumps(results))
+        return 0
+
+    results = {}
+    for size in [int(s) for s in args.sizes.split(",") if s.strip()]:
+        command = [sys.executable, os.path.abspath(__file__), "--single-size", str(size), "--min-time", str(args.min_time)]
+        if args.data_dir:
+            command += ["--data-dir", os.path.abspath(args.data_dir)]
+        completed = subprocess.run(command, stdout=subprocess.PIPE, check=True)
+        # 앱 모듈이 출력하는 로그 줄은 건너뛰고 마지막 JSON 줄만 사용
+        results.update(json.loads(completed.stdout.decode("utf-8").strip().splitlines()[-1]))
+
+    print()
+    print_table(results, ["rps", "p50Ms", "p95Ms", "p99Ms"])
+
+    report = {"meta": run_metadata(kind="micro", sizes=args.sizes, minTime=args.min_time), "results": results}
+    if args.output:
+        save_json(args.output, report)
+    if args.save_baseline:
+        save_json(args.save_baseline, report)
+        print(f"💾 기준 결과 저장: {args.save_baseline}")
+    if args.baseline:
+        baseline = load_json(args.baseline)
+        if baseline is None:
+            print(f"⚠️ 기준 결과 파일이 없습니다: {args.baseline}")
+            return 0
+        regressions = compare_to_baseline(results, baseline.get("results", {}), args.threshold)
+        if regressions:
+            print(f"\n❌ 기준 대비 {args.threshold:.0%} 이상 성능 저하:")
+            for line in regressions:
+                print(f"  - {line}")
+            return 1
+        print(f"\n✅ 기준 대비 성능 저하 없음 (허용 {args.threshold:.0%})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,137 @@
+"""
+저장소 그룹별 개수 집계 (대시보드 요약)
+
+레코드를 (그룹, {차원: 값})으로 분류하는 함수를 받아 그룹별 레코드 수와 차원/값별 개수를 유지한다.
+전체를 다시 세지 않고 저장소 변경 피드(change_feed)를 따라가며 바뀐 레코드만 이전 분류를 빼고 새 분류를 더한다.
+변경 피드에는 다른 워커(변경 기록 파일)와 다른 프로세스(SQLite)의 변경도 같은 번호로 들어 있으므로
+어느 워커에서 읽어도 같은 값이 된다.
+
+- 주기 작업(refresh)이 마지막으로 반영한 번호 이후 변경을 반영하고, 읽기는 그 이후 남은 변경만 반영
+- 변경 피드가 재동기화를 요구하면(기록에서 밀려남, 재시작) 주기 작업이 전체를 한 번 다시 셈 (읽기는 다시 세지 않음)
+"""
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from dependencies.change_feed import CHANGES_MAX_PAGE_SIZE
+from dependencies.logger import get_logger
+from dependencies.metrics import Counter
+from dependencies.tracing import span
+
+logger = get_logger(__name__)
+
+aggregate_rebuilds_total = Counter(
+    "aggregate_rebuilds_total", "집계 전체 재계산 수 (시작, 변경 피드 재동기화)", ("aggregate",)
+)
+aggregate_updates_total = Counter(
+    "aggregate_updates_total", "변경 피드로 반영한 레코드 수", ("aggregate",)
+)
+
+# (그룹, {차원: 값}), None이면 집계하지 않음
+Classification = Optional[Tuple[str, Dict[str, Any]]]
+# 레코드별로 더해 둔 분류 (빼기용)
+_Contribution = Tuple[str, Tuple[Tuple[str, Any], ...]]
+
+
+class GroupCounts:
+    """저장소 하나의 그룹/차원/값별 개수"""
+
+    def __init__(self, name: str, repository, classify: Callable[[dict], Classification]):
+        self.name = name
+        self.repository = repository
+        self.classify = classify
+        self.seq: Optional[int] = None
+        self.totals: Dict[str, int] = {}
+        self.counts: Dict[str, Dict[str, Dict[Any, int]]] = {}
+        self._contributions: Dict[str, _Contribution] = {}
+        # lock: 개수 변경/복사, _refresh_lock: 반영 작업 하나만 실행
+        self.lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+
+    def _apply(self, contribution: _Contribution, delta: int):
+        group, dimensions = contribution
+        total = self.totals.get(group, 0) + delta
+        if total:
+            self.totals[group] = total
+        else:
+            self.totals.pop(group, None)
+        counts = self.counts.setdefault(group, {})
+        for dimension, value in dimensions:
+            values = counts.setdefault(dimension, {})
+            count = values.get(value, 0) + delta
+            if count:
+                values[value] = count
+            else:
+                values.pop(value, None)
+        if not total:
+            self.counts.pop(group, None)
+
+    def _update(self, key: str, record: Optional[dict]):
+        """레코드의 이전 분류를 빼고 현재 분류를 더함 (삭제된 레코드는 None)"""
+        previous = self._contributions.pop(key, None)
+        if previous is not None:
+            self._apply(previous, -1)
+        classified = self.classify(record) if record is not None else None
+        if classified is not None:
+            group, dimensions = classified
+            contribution = (group, tuple(dimensions.items()))
+            self._contributions[key] = contribution
+            self._apply(contribution, 1)
+
+    def _rebuild(self):
+        # 번호를 먼저 읽으므로 순회 중 변경은 다음 반영 때 다시 적용됨 (같은 레코드는 다시 적용해도 결과가 같음)
+        seq, _, _ = self.repository.changes(-1, 0)
+        # 새 집계를 따로 만든 뒤 바꿔 끼우므로 재계산 중에도 읽기는 이전 값을 바로 받음
+        fresh = GroupCounts(self.name, self.repository, self.classify)
+        with span("aggregate.rebuild", aggregate=self.name) as fields:
+            for record in self.repository.iter_all():
+                fresh._update(self.repository.key_of(record), record)
+            fields["records"] = len(fresh._contributions)
+        with self.lock:
+            self.totals, self.counts, self._contributions = fresh.totals, fresh.counts, fresh._contributions
+            self.seq = seq
+        aggregate_rebuilds_total.inc(self.name)
+        logger.info("집계 전체 재계산", extra={"fields": {"aggregate": self.name, "records": len(fresh._contributions), "seq": seq}})
+
+    def refresh(self, rebuild: bool = True):
+        """
+        마지막으로 반영한 번호 이후 변경 반영
+
+        rebuild=False(읽기)이면 다른 반영이 진행 중일 때 기다리지 않고, 한 페이지만 반영하며, 재동기화가 필요해도
+        전체를 다시 세지 않는다 (주기 작업이 다시 셈). 처음 한 번은 어느 쪽이든 전체를 센다.
+        """
+        if not self._refresh_lock.acquire(blocking=rebuild or self.seq is None):
+            return
+        try:
+            if self.seq is None:
+                self._rebuild()
+                return
+            while True:
+                seq, entries, resync = self.repository.changes(self.seq, CHANGES_MAX_PAGE_SIZE)
+                if resync:
+                    if rebuild:
+                        self._rebuild()
+                    return
+                # 같은 레코드의 여러 변경은 현재 값으로 한 번만 반영
+                keys = list(dict.fromkeys(key for _, _, key, _ in entries))
+                records = [(key, self.repository.get(key)) for key in keys]
+                with self.lock:
+                    for key, record in records:
+                        self._update(key, record)
+                    if entries:
+                        self.seq = entries[-1][0]
+                if keys:
+                    aggregate_updates_total.inc(self.name, amount=len(keys))
+                # 읽기는 한 페이지만 반영하여 읽기 비용을 제한 (남은 변경은 주기 작업이 반영)
+                if not rebuild or not entries or self.seq >= seq:
+                    return
+        finally:
+            self._refresh_lock.release()
+
+    def snapshot(self) -> Tuple[Dict[str, int], Dict[str, Dict[str, Dict[Any, int]]]]:
+        """주기 반영 이후 변경까지 반영한 (그룹별 레코드 수, 그룹별 차원/값별 개수) 사본 (읽기는 전체 재계산을 하지 않음)"""
+        self.refresh(rebuild=False)
+        with self.lock:
+            return dict(self.totals), {
+                group: {dimension: dict(values) for dimension, values in counts.items()}
+                for group, counts in self.counts.items()
+            }
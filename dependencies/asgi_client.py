@@ -0,0 +1,65 @@
+import asyncio
+from typing import Iterable, List, Optional, Tuple
+
+
+async def call_asgi(
+    app,
+    method: str,
+    path: str,
+    query_string: bytes = b"",
+    headers: Optional[Iterable[Tuple[bytes, bytes]]] = None,
+    body: bytes = b"",
+    client: Tuple[str, int] = ("127.0.0.1", 0),
+) -> Tuple[int, List[Tuple[bytes, bytes]], bytes]:
+    """
+    ASGI 앱을 네트워크 없이 프로세스 내에서 직접 호출
+
+    미들웨어를 포함한 전체 앱 스택을 거치며, (상태 코드, 헤더, 본문)을 반환한다.
+    """
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0", "spec_version": "2.4"},
+        "http_version": "1.1",
+        "method": method.upper(),
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode("utf-8"),
+        "query_string": query_string,
+        "root_path": "",
+        "headers": list(headers or []),
+        "client": client,
+        "server": ("localhost", 80),
+        "extensions": {},
+    }
+
+    request_sent = False
+    response_done = asyncio.Event()
+    status_code = 500
+    response_headers: List[Tuple[bytes, bytes]] = []
+    chunks: List[bytes] = []
+
+    async def receive():
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        # 응답이 끝날 때까지 연결이 유지된 것으로 처리
+        await response_done.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        nonlocal status_code, response_headers
+        if message["type"] == "http.response.start":
+            status_code = message["status"]
+            response_headers = list(message.get("headers", []))
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body", False):
+                response_done.set()
+
+    try:
+        await app(scope, receive, send)
+    finally:
+        response_done.set()
+
+    return status_code, response_headers, b"".join(chunks)
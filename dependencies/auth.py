@@ -5,18 +5,25 @@ from passlib.context import CryptContext
 from fastapi import HTTPException, status
 import os
 
+from dependencies.repository import create_repository
+from dependencies.tracing import span
+
 # 환경변수에서 설정값 가져오기 (개발환경에서는 기본값 사용)
 JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY", "your-secret-key-change-this-in-production")
 JWT_ALGORITHM = os.getenv("JWT_ALGORITHM", "HS256")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "15"))
 REFRESH_TOKEN_EXPIRE_DAYS = int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", "7"))
 
+# 사용자 데이터 파일 경로 (로그인과 /users 목록이 같은 저장소 사용)
+USERS_DATA_FILE = 'users_data.json'
+
 # 비밀번호 해싱 컨텍스트
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """비밀번호 검증"""
-    return pwd_context.verify(plain_password, hashed_password)
+    with span("auth.password"):
+        return pwd_context.verify(plain_password, hashed_password)
 
 def get_password_hash(password: str) -> str:
     """비밀번호 해싱"""
@@ -44,47 +51,68 @@ def create_refresh_token(data: dict) -> str:
 
 def verify_token(token: str, token_type: str = "access") -> dict:
     """토큰 검증 및 페이로드 반환"""
-    try:
-        payload = jwt.decode(token, JWT_SECRET_KEY, algorithms=[JWT_ALGORITHM])
+    with span("auth.verify", tokenType=token_type):
+        try:
+            payload = jwt.decode(token, JWT_SECRET_KEY, algorithms=[JWT_ALGORITHM])
         
-        # 토큰 타입 확인
-        if payload.get("type") != token_type:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid token type"
-            )
+            # 토큰 타입 확인
+            if payload.get("type") != token_type:
+                raise HTTPException(
+                    status_code=status.HTTP_401_UNAUTHORIZED,
+                    detail="Invalid token type"
+                )
         
-        # 만료 시간 확인
-        exp = payload.get("exp")
-        if exp is None or datetime.utcnow() > datetime.fromtimestamp(exp):
+            # 만료 시간 확인
+            exp = payload.get("exp")
+            if exp is None or datetime.utcnow() > datetime.fromtimestamp(exp):
+                raise HTTPException(
+                    status_code=status.HTTP_401_UNAUTHORIZED,
+                    detail="Token expired"
+                )
+        
+            return payload
+        
+        except JWTError:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Token expired"
+                detail="Could not validate credentials"
             )
-        
-        return payload
-        
-    except JWTError:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Could not validate credentials"
-        )
 
-# 임시 사용자 데이터 (나중에 데이터베이스로 교체)
-USERS_DB = {
-    "admin@dy.com": {
-        "id": "user_123",
-        "email": "admin@dy.com",
-        "name": "관리자",
-        "role": "ADMIN",
-        "hashed_password": get_password_hash("SystemAdminPassword123")
-    }
-}
+# 사용자 저장소 (이메일 기준)
+# 역할/상태/골프장은 같음 필터 인덱스, 이메일/이름/전화번호는 접두어 검색 인덱스
+user_repository = create_repository(
+    "users",
+    key_field="email",
+    indexes={"id": "id", "role": "role", "status": "status", "golfCourseId": "golfCourseId"},
+    prefix_fields=("email", "name", "phone"),
+    sort_fields=("email", "name", "role", "status", "department", "lastLoginAt", "createdAt"),
+    data_file=USERS_DATA_FILE,
+    initial=[
+        {
+            "id": "user_123",
+            "email": "admin@dy.com",
+            "name": "관리자",
+            "role": "ADMIN",
+            "status": "ACTIVE",
+            "phone": "010-1234-5678",
+            "department": "시스템관리팀",
+            "golfCourseId": None,
+            "lastLoginAt": None,
+            "createdAt": "2024-01-01T09:00:00Z",
+            "hashed_password": get_password_hash("SystemAdminPassword123")
+        }
+    ],
+    label="사용자"
+)
+
+def to_public_user(user: dict) -> dict:
+    """응답용 사용자 정보 (비밀번호 해시 제외)"""
+    return {key: value for key, value in user.items() if key != "hashed_password"}
 
 def authenticate_user(email: str, password: str) -> Optional[dict]:
-    """사용자 인증"""
-    user = USERS_DB.get(email)
-    if not user:
+    """사용자 인증 (비밀번호가 설정되지 않았거나 비활성 계정은 로그인 불가)"""
+    user = user_repository.get(email)
+    if not user or not user.get("hashed_password") or user.get("status", "ACTIVE") != "ACTIVE":
         return None
     if not verify_password(password, user["hashed_password"]):
         return None
@@ -92,4 +120,4 @@ def authenticate_user(email: str, password: str) -> Optional[dict]:
 
 def get_user_by_email(email: str) -> Optional[dict]:
     """이메일로 사용자 조회"""
-    return USERS_DB.get(email)
\ No newline at end of file
+    return user_repository.get(email)
\ No newline at end of file
@@ -0,0 +1,274 @@
+"""
+카트 배터리 상태/주행 가능 거리 추정
+
+텔레메트리 수신 시 카트마다 최근 BATTERY_HISTORY_SIZE개 측정값(시각, 잔량, 전압, 전류, 온도, 충전 여부)과
+누적 방전량으로 센 충방전 횟수(cycles)를 저장해 두고, 추정은 전체 카트를 (카트 수 x 측정 수) 배열로 만들어
+NumPy로 한 번에 계산한다. BatteryEstimator가 결과를 보관하고 BATTERY_RECOMPUTE_INTERVAL초마다 다시 계산하므로
+카트별 조회는 위치 사전 조회, 저잔량 보고서는 배열 비교 한 번이다.
+
+- 소모율(%/시간): 마지막 충전 이후 측정값의 시간-잔량 최소제곱 기울기 (측정이 부족하면 기본값)
+- 내부 저항: (잔량으로 추정한 개방 전압 - 측정 전압) / 방전 전류의 평균
+- 건강도(%): 충방전 횟수/고온 노출로 줄어든 값과 내부 저항 증가로 줄어든 값 중 작은 값
+- 주행 가능 거리(km): 잔량 x 건강도 x 완충 시 주행 거리, 사용 가능 시간(시간): 잔량 / 소모율
+"""
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from dependencies.logger import get_logger
+from dependencies.metrics import record_cache
+from dependencies.tracing import span
+
+# 환경변수에서 설정값 가져오기
+BATTERY_HISTORY_SIZE = int(os.getenv("BATTERY_HISTORY_SIZE", "32"))
+BATTERY_RECOMPUTE_INTERVAL = float(os.getenv("BATTERY_RECOMPUTE_INTERVAL", "60"))
+BATTERY_FULL_RANGE_KM = float(os.getenv("BATTERY_FULL_RANGE_KM", "40"))
+
+# 측정값 열 (batteryHistory 항목 순서)
+SAMPLE_FIELDS = ("time", "level", "voltage", "current", "temperature", "charging")
+
+# 48V 팩 기준 잔량 0%/100% 개방 전압, 새 배터리 내부 저항(옴)
+PACK_EMPTY_VOLTAGE = 42.0
+PACK_FULL_VOLTAGE = 54.0
+NOMINAL_RESISTANCE = 0.05
+# 내부 저항 계산에 쓰는 최소 방전 전류(A)
+MIN_DISCHARGE_CURRENT = 5.0
+# 충방전 1회당, 기준 온도 초과 1도당 건강도 감소(%)
+CYCLE_WEAR = 0.02
+HEAT_THRESHOLD = 35.0
+HEAT_WEAR = 0.5
+# 소모율 계산 조건과 기본값 (%/시간)
+MIN_RATE_SAMPLES = 3
+MIN_RATE_SPAN_SECONDS = 300
+DEFAULT_DISCHARGE_RATE = 13.0
+# 잔량 상태 구간
+LOW_LEVEL = 30
+CRITICAL_LEVEL = 15
+
+logger = get_logger(__name__)
+
+
+def parse_timestamp(value: Optional[str]) -> float:
+    """ISO 8601 시각 -> epoch 초 (없거나 잘못된 값이면 현재 시각)"""
+    if value:
+        try:
+            parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+            if parsed.tzinfo is None:
+                parsed = parsed.replace(tzinfo=timezone.utc)
+            return parsed.timestamp()
+        except ValueError:
+            pass
+    return time.time()
+
+
+def append_battery_sample(previous: dict, telemetry: dict, timestamp: float) -> dict:
+    """
+    텔레메트리 레코드에 배터리 측정값 추가 (batteryHistory, cycles)
+
+    잔량이 없거나 마지막 측정보다 이전 시각이면 측정값을 추가하지 않는다.
+    방전(충전 중이 아니고 잔량 감소)한 양을 누적하여 100%마다 충방전 1회로 센다.
+    """
+    history = list(previous.get("batteryHistory") or [])
+    cycles = previous.get("cycles", 0.0)
+    level = telemetry.get("batteryLevel")
+    if level is None or (history and timestamp <= history[-1][0]):
+        return {"batteryHistory": history, "cycles": cycles}
+
+    charging = bool(telemetry.get("isCharging", previous.get("isCharging", False)))
+    if history and not charging and level < history[-1][1]:
+        cycles += (history[-1][1] - level) / 100
+    history.append([
+        timestamp, level,
+        telemetry.get("voltage", previous.get("voltage")),
+        telemetry.get("current", previous.get("current")),
+        telemetry.get("temperature", previous.get("temperature")),
+        1 if charging else 0,
+    ])
+    return {"batteryHistory": history[-BATTERY_HISTORY_SIZE:], "cycles": round(cycles, 4)}
+
+
+def _level_status(level: float) -> str:
+    if level < CRITICAL_LEVEL:
+        return "CRITICAL"
+    if level < LOW_LEVEL:
+        return "LOW"
+    return "NORMAL"
+
+
+def _optional(value: float, digits: int = 2) -> Optional[float]:
+    return None if np.isnan(value) else round(float(value), digits)
+
+
+class BatteryEstimates:
+    """한 번의 전체 계산 결과 (카트 순서대로 배열)"""
+
+    def __init__(self, cart_ids: List[str], golf_course_ids: List[Optional[str]], updated_at: List[Optional[str]], columns: Dict[str, np.ndarray]):
+        self.cart_ids = cart_ids
+        self.golf_course_ids = np.array(golf_course_ids, dtype=object)
+        self.updated_at = updated_at
+        self.columns = columns
+        self.positions = {cart_id: i for i, cart_id in enumerate(cart_ids)}
+        self.computed_at = time.time()
+        self.computed_at_iso = datetime.fromtimestamp(self.computed_at, timezone.utc).isoformat().replace("+00:00", "Z")
+
+    def __len__(self):
+        return len(self.cart_ids)
+
+    def _item(self, i: int) -> dict:
+        c = self.columns
+        level = c["level"][i]
+        return {
+            "cartId": self.cart_ids[i],
+            "golfCourseId": self.golf_course_ids[i],
+            "level": _optional(level, 1),
+            "voltage": _optional(c["voltage"][i]),
+            "current": _optional(c["current"][i]),
+            "temperature": _optional(c["temperature"][i], 1),
+            "status": None if np.isnan(level) else _level_status(level),
+            "isCharging": bool(c["charging"][i]),
+            "estimatedRange": _optional(c["range"][i], 1),
+            "estimatedTime": _optional(c["time"][i]),
+            "dischargeRate": _optional(c["rate"][i]),
+            "internalResistance": _optional(c["resistance"][i], 4),
+            "cycles": int(c["cycles"][i]),
+            "health": _optional(c["health"][i], 1),
+            "lastUpdate": self.updated_at[i],
+            "computedAt": self.computed_at_iso,
+        }
+
+    def get(self, cart_id: str) -> Optional[dict]:
+        i = self.positions.get(cart_id)
+        return None if i is None else self._item(i)
+
+    def low_range(self, max_range: float, golf_course_id: Optional[str] = None, limit: Optional[int] = None) -> Tuple[List[dict], int]:
+        """주행 가능 거리가 max_range km 미만인 카트 (가까운 순 최대 limit개, 전체 개수)"""
+        ranges = self.columns["range"]
+        mask = ranges < max_range
+        if golf_course_id:
+            mask &= self.golf_course_ids == golf_course_id
+        found = np.flatnonzero(mask)
+        ordered = found[np.argsort(ranges[found], kind="stable")][:limit]
+        return [self._item(i) for i in ordered], len(found)
+
+
+def estimate_batteries(records: List[dict]) -> BatteryEstimates:
+    """텔레메트리 레코드 목록 전체를 한 번에 계산"""
+    n, size = len(records), BATTERY_HISTORY_SIZE
+    samples = np.full((n, size, len(SAMPLE_FIELDS)), np.nan)
+    fallback_level = np.full(n, np.nan)
+    cycles = np.zeros(n)
+    latest_charging = np.zeros(n, dtype=bool)
+    for i, record in enumerate(records):
+        history = (record.get("batteryHistory") or [])[-size:]
+        if history:
+            samples[i, size - len(history):] = np.array(history, dtype=float)
+        if record.get("batteryLevel") is not None:
+            fallback_level[i] = record["batteryLevel"]
+        cycles[i] = record.get("cycles", 0.0)
+        latest_charging[i] = bool(record.get("isCharging"))
+
+    t, level, voltage, current, temperature, charging = np.moveaxis(samples, 2, 0)
+    present = np.isfinite(t) & np.isfinite(level)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        # 마지막 충전 측정 이후 구간에서 잔량 감소 기울기
+        position = np.arange(size)
+        last_charge = np.max(np.where(charging == 1, position, -1), axis=1)
+        discharge = present & (charging == 0) & (position > last_charge[:, None])
+        count = discharge.sum(axis=1)
+        t_mean = np.where(discharge, t, 0).sum(axis=1) / count
+        level_mean = np.where(discharge, level, 0).sum(axis=1) / count
+        dt = np.where(discharge, t - t_mean[:, None], 0)
+        dl = np.where(discharge, level - level_mean[:, None], 0)
+        rate = -(dt * dl).sum(axis=1) / (dt * dt).sum(axis=1) * 3600
+        span_seconds = np.where(discharge, t, -np.inf).max(axis=1) - np.where(discharge, t, np.inf).min(axis=1)
+        valid_rate = (count >= MIN_RATE_SAMPLES) & (span_seconds >= MIN_RATE_SPAN_SECONDS) & (rate > 0)
+        rate = np.where(valid_rate, rate, DEFAULT_DISCHARGE_RATE)
+
+        # 방전 중 측정값으로 내부 저항 추정
+        open_voltage = PACK_EMPTY_VOLTAGE + (PACK_FULL_VOLTAGE - PACK_EMPTY_VOLTAGE) * level / 100
+        loaded = present & np.isfinite(voltage) & (np.nan_to_num(current) >= MIN_DISCHARGE_CURRENT)
+        resistance = np.where(loaded, (open_voltage - voltage) / current, 0).sum(axis=1) / loaded.sum(axis=1)
+        resistance = np.where(resistance > 0, resistance, np.nan)
+
+        measured_temperature = present & np.isfinite(temperature)
+        mean_temperature = np.where(measured_temperature, temperature, 0).sum(axis=1) / measured_temperature.sum(axis=1)
+
+    wear_health = 100 - CYCLE_WEAR * cycles - HEAT_WEAR * np.maximum(np.nan_to_num(mean_temperature) - HEAT_THRESHOLD, 0)
+    resistance_health = np.where(np.isnan(resistance), 100, 100 * NOMINAL_RESISTANCE / resistance)
+    health = np.clip(np.minimum(wear_health, resistance_health), 0, 100)
+
+    def latest(column: np.ndarray) -> np.ndarray:
+        """카트별 값이 있는 마지막 측정값"""
+        finite = np.isfinite(column)
+        last = size - 1 - np.argmax(finite[:, ::-1], axis=1)
+        return np.where(finite.any(axis=1), column[np.arange(n), last], np.nan)
+
+    current_level = latest(level)
+    current_level = np.where(np.isnan(current_level), fallback_level, current_level)
+
+    columns = {
+        "level": current_level,
+        "voltage": latest(voltage),
+        "current": latest(current),
+        "temperature": latest(temperature),
+        "charging": latest_charging,
+        "cycles": cycles,
+        "rate": rate,
+        "resistance": resistance,
+        "health": health,
+        # 잔량을 모르는 카트는 nan (저잔량 비교에서 제외됨)
+        "range": current_level / 100 * health / 100 * BATTERY_FULL_RANGE_KM,
+        "time": current_level / rate,
+    }
+    return BatteryEstimates(
+        [record["cartId"] for record in records],
+        [record.get("golfCourseId") for record in records],
+        [record.get("updatedAt") for record in records],
+        columns,
+    )
+
+
+class BatteryEstimator:
+    """텔레메트리 저장소 전체의 추정 결과 보관 (주기적으로 다시 계산)"""
+
+    def __init__(self, repository, interval: float = BATTERY_RECOMPUTE_INTERVAL):
+        self.repository = repository
+        self.interval = interval
+        self.estimates: Optional[BatteryEstimates] = None
+        self._lock = threading.Lock()
+
+    def recompute(self) -> BatteryEstimates:
+        with self._lock:
+            with span("battery.recompute") as fields:
+                started = time.perf_counter()
+                estimates = estimate_batteries(list(self.repository.iter_all()))
+                fields["carts"] = len(estimates)
+            self.estimates = estimates
+        logger.debug("배터리 추정 재계산", extra={"fields": {
+            "carts": len(estimates), "durationMs": round((time.perf_counter() - started) * 1000, 2)
+        }})
+        return estimates
+
+    def current(self) -> BatteryEstimates:
+        """보관 중인 결과 (없거나 주기 작업이 멈춰 두 주기 넘게 지났으면 다시 계산)"""
+        estimates = self.estimates
+        stale = estimates is None or time.time() - estimates.computed_at > 2 * max(self.interval, 1)
+        record_cache("battery_estimates", not stale)
+        return self.recompute() if stale else estimates
+
+    def get(self, cart_id: str) -> Optional[dict]:
+        """카트 추정값 (마지막 계산 이후 처음 텔레메트리를 보낸 카트는 해당 카트만 계산)"""
+        found = self.current().get(cart_id)
+        if found is None:
+            record = self.repository.get(cart_id)
+            if record is not None:
+                found = estimate_batteries([record]).get(cart_id)
+        return found
+
+    def low_range(self, max_range: float, golf_course_id: Optional[str] = None, limit: Optional[int] = None) -> Tuple[List[dict], int]:
+        return self.current().low_range(max_range, golf_course_id, limit)
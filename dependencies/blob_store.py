@@ -0,0 +1,100 @@
+import hashlib
+import json
+import os
+import tempfile
+from functools import lru_cache
+from typing import Optional
+
+from dependencies.metrics import record_cache
+from dependencies.static_files import UPLOAD_DIR
+
+# 콘텐츠 주소 기반 저장소 (sha256 해시 -> 파일), 같은 내용은 한 번만 저장
+BLOB_DIR = os.path.join(UPLOAD_DIR, "blobs")
+BLOB_URL_PREFIX = "/uploads/blobs"
+# 파싱한 JSON blob 캐시 항목 수
+JSON_CACHE_SIZE = 256
+
+
+def _relative_blob_path(content_hash: str) -> str:
+    return os.path.join(content_hash[:2], content_hash[2:4], content_hash)
+
+
+def blob_path(content_hash: str) -> str:
+    """해시에 해당하는 blob 파일 경로"""
+    return os.path.join(BLOB_DIR, _relative_blob_path(content_hash))
+
+
+def blob_url(content_hash: str) -> str:
+    """blob 다운로드 URL (내용이 해시로 고정되므로 장기 캐시 가능)"""
+    return f"{BLOB_URL_PREFIX}/{content_hash[:2]}/{content_hash[2:4]}/{content_hash}"
+
+
+def has_blob(content_hash: str) -> bool:
+    return os.path.isfile(blob_path(content_hash))
+
+
+def make_work_dir() -> str:
+    """blob 저장소와 같은 파일시스템에 작업 디렉토리 생성 (rename으로 복사 없이 이동 가능)"""
+    os.makedirs(BLOB_DIR, exist_ok=True)
+    return tempfile.mkdtemp(prefix=".work-", dir=BLOB_DIR)
+
+
+def _commit_temp_file(temp_path: str, content_hash: str) -> str:
+    """임시 파일을 blob 위치로 이동 (이미 있으면 중복 저장하지 않음)"""
+    target = blob_path(content_hash)
+    if os.path.exists(target):
+        os.remove(temp_path)
+    else:
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        os.replace(temp_path, target)
+    return content_hash
+
+
+def put_bytes(data: bytes) -> str:
+    """바이트 내용을 저장하고 해시 반환"""
+    content_hash = hashlib.sha256(data).hexdigest()
+    if has_blob(content_hash):
+        return content_hash
+    os.makedirs(BLOB_DIR, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(prefix=".blob-", dir=BLOB_DIR)
+    with os.fdopen(fd, 'wb') as f:
+        f.write(data)
+    return _commit_temp_file(temp_path, content_hash)
+
+
+def put_file(path: str) -> str:
+    """
+    파일을 저장소로 이동하고 해시 반환
+
+    같은 파일시스템 안에서는 rename으로 처리되므로 데이터를 복사하지 않는다.
+    원본 파일은 이동(또는 중복 시 삭제)된다.
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return _commit_temp_file(path, digest.hexdigest())
+
+
+def put_json(data) -> str:
+    """JSON 직렬화(키 정렬) 후 저장, 같은 내용이면 같은 해시"""
+    return put_bytes(json.dumps(data, ensure_ascii=False, sort_keys=True, separators=(",", ":")).encode('utf-8'))
+
+
+@lru_cache(maxsize=JSON_CACHE_SIZE)
+def _read_json_blob(content_hash: str):
+    with open(blob_path(content_hash), 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def read_json(content_hash: Optional[str]):
+    """JSON blob 조회 (내용이 불변이므로 해시 기준으로 캐시, 반환값은 수정하지 말 것)"""
+    if not content_hash:
+        return None
+    misses = _read_json_blob.cache_info().misses
+    try:
+        return _read_json_blob(content_hash)
+    except (OSError, json.JSONDecodeError):
+        return None
+    finally:
+        record_cache("blob_json", _read_json_blob.cache_info().misses == misses)
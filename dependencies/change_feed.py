@@ -0,0 +1,152 @@
+"""
+저장소 변경 피드 (클라이언트 증분 동기화)
+
+저장소마다 레코드 변경(생성/수정/삭제)에 1씩 증가하는 번호를 붙여 최근 CHANGE_LOG_SIZE개를 보관한다.
+클라이언트는 마지막으로 받은 번호를 since로 보내 그 이후 변경된 레코드만 받는다.
+
+- JSON 저장소: 메모리 기록(ChangeLog), 번호는 실행 시작 시각(마이크로초)부터 시작한다.
+  여러 워커는 변경 기록 파일(change_journal)로 번호까지 전달하므로 어느 워커가 응답해도 같은 번호를 쓴다.
+- SQLite 저장소: 같은 DB의 <이름>__changes 테이블 (AUTOINCREMENT라 재시작 후에도 번호가 이어짐)
+
+PATCH처럼 바뀐 경로를 아는 수정은 경로도 함께 기록하여, 구간 안의 변경이 모두 이런 수정이면
+레코드 전체 대신 바뀐 경로(changedPaths)와 그 값만 보낸다. 클라이언트는 changedPaths의 각 경로를
+data의 값으로 바꾸고, data에 없는 경로는 삭제한다.
+
+since가 보관 범위보다 오래되었거나(기록에서 밀려남, 재시작) 현재 번호보다 크면(다른 실행/DB의 번호)
+resyncRequired를 반환한다. 클라이언트는 전체 목록을 다시 받은 뒤 응답의 seq부터 이어 받는다.
+"""
+import itertools
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence, Tuple
+
+from dependencies.projection import get_projection
+
+# 환경변수에서 설정값 가져오기
+CHANGE_LOG_SIZE = int(os.getenv("CHANGE_LOG_SIZE", "10000"))
+CHANGES_PAGE_SIZE = 500
+CHANGES_MAX_PAGE_SIZE = 5000
+
+CREATED, UPDATED, DELETED = "created", "updated", "deleted"
+
+# 바뀐 경로 목록 (None: 레코드 전체 교체)
+ChangedPaths = Optional[Tuple[Tuple[str, ...], ...]]
+# (번호, 종류, 키, 바뀐 경로)
+ChangeEntry = Tuple[int, str, str, ChangedPaths]
+
+
+def new_base_seq() -> int:
+    """
+    변경 번호 시작값 (현재 시각, 마이크로초)
+
+    재시작 후에도 번호가 이전 실행보다 커지므로 이전 실행 기준 번호를 가진 클라이언트는 재동기화 대상이 된다.
+    """
+    return time.time_ns() // 1000
+
+
+class ChangeLog:
+    """최근 변경 기록 (번호가 floor + 1부터 seq까지 빠짐없이 이어짐)"""
+
+    def __init__(self, base_seq: int, max_entries: int = CHANGE_LOG_SIZE):
+        self.seq = base_seq
+        self.floor = base_seq
+        self.max_entries = max_entries
+        self.entries: Deque[ChangeEntry] = deque()
+        self.lock = threading.Lock()
+
+    def reset(self, seq: int):
+        """기록을 비우고 번호를 seq로 맞춤 (이전 번호 기준 클라이언트는 재동기화)"""
+        with self.lock:
+            self.entries.clear()
+            self.seq = self.floor = seq
+
+    def record(self, changes: List[Tuple[str, str]], first_seq: Optional[int] = None, paths: ChangedPaths = None) -> int:
+        """(종류, 키) 목록을 기록하고 첫 번호 반환 (다른 워커의 기록이면 first_seq를 그대로 사용)"""
+        with self.lock:
+            if first_seq is not None and first_seq != self.seq + 1:
+                # 중간 번호를 알 수 없으므로 기록을 비우고 새 번호부터 시작
+                self.entries.clear()
+                self.seq = self.floor = first_seq - 1
+            first = self.seq + 1
+            for op, key in changes:
+                self.seq += 1
+                self.entries.append((self.seq, op, key, paths))
+            while len(self.entries) > self.max_entries:
+                self.floor = self.entries.popleft()[0]
+            return first
+
+    def since(self, since: int, limit: int) -> Tuple[int, List[ChangeEntry], bool]:
+        """since 이후 기록 최대 limit개 -> (현재 번호, 기록, 재동기화 필요 여부)"""
+        with self.lock:
+            if since < self.floor or since > self.seq:
+                return self.seq, [], True
+            start = since - self.floor
+            return self.seq, list(itertools.islice(self.entries, start, start + limit)), False
+
+
+def _delta_projection(changed: Optional[set], always_fields: Sequence[str], key_field: str):
+    """바뀐 경로만 남기는 투영 (경로를 점 표기로 나타낼 수 없으면 None: 레코드 전체 전송)"""
+    if not changed or any(not path or any("." in key for key in path) for path in changed):
+        return None
+    try:
+        return get_projection(",".join(sorted({".".join(path) for path in changed} | set(always_fields))), key_field)
+    except ValueError:
+        return None
+
+
+def get_changes(
+    repository,
+    since: Optional[int],
+    limit: int = CHANGES_PAGE_SIZE,
+    transform: Optional[Callable[[dict], dict]] = None,
+    include: Optional[Callable[[dict], bool]] = None,
+    always_fields: Sequence[str] = (),
+) -> Dict[str, Any]:
+    """
+    since 이후 변경된 레코드 (응답 data)
+
+    같은 레코드의 여러 변경은 마지막 하나로 합치고 레코드는 현재 값을 보낸다.
+    include로 걸러낸 레코드는 보내지 않지만, 삭제는 원래 값을 알 수 없으므로 항상 보낸다
+    (클라이언트에 없는 레코드의 삭제는 무시하면 됨). hasMore이면 응답의 seq로 다시 요청한다.
+    바뀐 경로만 보낼 때도 always_fields(transform이 추가하는 필드 등)는 함께 보낸다.
+    since 없이 요청하면 현재 번호만 반환한다 (전체 목록을 받기 전에 호출하여 시작 번호로 사용).
+    """
+    if since is None:
+        # 보관 범위보다 작은 번호로 조회하면 기록 없이 현재 번호만 돌아옴
+        seq, _, _ = repository.changes(-1, 0)
+        return {"seq": seq, "changes": [], "hasMore": False, "resyncRequired": False}
+
+    seq, entries, resync = repository.changes(since, limit)
+    if resync:
+        return {"seq": seq, "changes": [], "hasMore": False, "resyncRequired": True}
+
+    latest: Dict[str, Tuple[int, str, Optional[set]]] = {}
+    for entry_seq, op, key, paths in entries:
+        previous = latest.pop(key, None)
+        # 구간 안에서 생성된 레코드는 이후 수정되어도 생성으로 전달
+        if previous and previous[1] == CREATED and op == UPDATED:
+            op = CREATED
+        # 경로를 아는 수정만 이어졌으면 경로를 합침
+        changed = None
+        if op == UPDATED and paths is not None and (previous is None or previous[2] is not None):
+            changed = set(paths) | (previous[2] if previous else set())
+        latest[key] = (entry_seq, op, changed)
+
+    changes = []
+    for key, (entry_seq, op, changed) in latest.items():
+        record = None if op == DELETED else repository.get(key)
+        if record is None:
+            changes.append({"type": DELETED, "id": key, "seq": entry_seq})
+        elif include is None or include(record):
+            data = transform(record) if transform else record
+            change = {"type": op, "id": key, "seq": entry_seq, "data": data}
+            project = _delta_projection(changed, always_fields, repository.key_field)
+            if project is not None:
+                change["changedPaths"] = sorted(".".join(path) for path in changed)
+                change["data"] = project(data)
+            changes.append(change)
+
+    next_seq = entries[-1][0] if entries else since
+    return {"seq": next_seq, "changes": changes, "hasMore": next_seq < seq, "resyncRequired": False}
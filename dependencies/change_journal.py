@@ -0,0 +1,217 @@
+import fcntl
+import json
+import os
+import threading
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+from dependencies.change_feed import new_base_seq
+
+# 환경변수에서 설정값 가져오기
+# 여러 워커가 JSON 저장소를 공유할 때 사용하는 변경 기록 파일 (비어 있으면 사용 안 함)
+STORE_JOURNAL = os.getenv("STORE_JOURNAL") or (
+    "store_journal.ndjson" if int(os.getenv("WEB_CONCURRENCY", "1")) > 1 else ""
+)
+# 기록 파일이 이 크기를 넘으면 현재 상태 스냅샷으로 압축
+STORE_JOURNAL_MAX_BYTES = int(os.getenv("STORE_JOURNAL_MAX_BYTES", str(64 * 1024 * 1024)))
+
+
+def _session_id() -> str:
+    """
+    같은 서버 실행에 속한 워커를 구분하는 값
+
+    워커들은 같은 부모 프로세스(uvicorn 마스터 또는 server.py)를 공유하므로
+    부모 PID와 시작 시각으로 이전 실행이 남긴 기록 파일을 구분한다.
+    """
+    session = os.getenv("STORE_JOURNAL_SESSION")
+    if session:
+        return session
+    ppid = os.getppid()
+    try:
+        with open(f"/proc/{ppid}/stat", 'r') as f:
+            start_time = f.read().rsplit(")", 1)[1].split()[19]
+    except (OSError, IndexError):
+        start_time = "0"
+    return f"{ppid}-{start_time}"
+
+
+class ChangeJournal:
+    """
+    워커 간 저장소 변경 전달용 추가 전용(append-only) 기록
+
+    - 변경은 파일 잠금(flock) 안에서 "최신 기록 반영 -> 변경 적용 -> 기록 추가 -> 데이터 파일 저장" 순서로 처리되어
+      워커 간 쓰기가 직렬화되고 데이터 파일이 오래된 내용으로 덮어써지지 않는다.
+    - 읽기 전에는 마지막으로 읽은 위치 이후의 기록만 반영하므로 전체 재로드가 없다.
+    - 파일이 커지면 전체 상태 스냅샷으로 교체하고, 다른 워커는 파일이 바뀐 것을 감지하여 이어 읽는다.
+    """
+
+    def __init__(self, path: str, max_bytes: int = STORE_JOURNAL_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.session = _session_id()
+        # 저장소 변경 번호 시작값 (같은 실행의 워커가 모두 같은 값에서 시작하도록 기록 파일 첫 줄에 둠)
+        self.base_seq = 0
+        self.repositories: Dict[str, object] = {}
+        self.lock = threading.RLock()
+        self._lock_fd: Optional[int] = None
+        self._read_fd: Optional[int] = None
+        self._inode: Optional[int] = None
+        self._offset = 0
+        self._pending = b""
+
+    @contextmanager
+    def exclusive(self):
+        """프로세스 간 쓰기 잠금 (기록 파일 교체와 무관하도록 별도 .lock 파일 사용)"""
+        with self.lock:
+            if self._lock_fd is None:
+                self._lock_fd = os.open(self.path + ".lock", os.O_RDWR | os.O_CREAT, 0o644)
+            fcntl.flock(self._lock_fd, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(self._lock_fd, fcntl.LOCK_UN)
+
+    def _header(self) -> bytes:
+        return (json.dumps({"op": "session", "session": self.session, "baseSeq": self.base_seq}) + "\n").encode("utf-8")
+
+    def _replace(self, content: bytes):
+        """기록 파일을 원자적으로 교체 (잠금 안에서 호출)"""
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.path)
+
+    def start(self):
+        """최초 사용 시 기록 파일 열기, 이전 실행의 기록이면 초기화 (잠금 안에서 호출)"""
+        if self._read_fd is not None:
+            return
+        try:
+            with open(self.path, 'rb') as f:
+                first_line = json.loads(f.readline() or b"{}")
+        except (OSError, ValueError):
+            first_line = {}
+        if first_line.get("session") != self.session:
+            # 데이터 파일이 있는 저장소는 이미 파일에 반영되어 있고, 메모리 저장소는 실행마다 초기화
+            self.base_seq = new_base_seq()
+            self._replace(self._header())
+        else:
+            self.base_seq = first_line.get("baseSeq", 0)
+        self._open()
+
+    def _open(self):
+        if self._read_fd is not None:
+            os.close(self._read_fd)
+        self._read_fd = os.open(self.path, os.O_RDONLY)
+        self._inode = os.fstat(self._read_fd).st_ino
+        self._offset = 0
+        self._pending = b""
+
+    def attach(self, repository):
+        """
+        저장소 등록 후 현재 기록 파일의 해당 저장소 변경을 처음부터 반영 (잠금 안에서 호출)
+
+        다른 저장소는 이미 읽은 위치까지 반영되어 있으므로 새 저장소만 따라잡은 뒤 함께 이어 읽는다.
+        """
+        self.start()
+        self.repositories[repository.name] = repository
+        if self._offset:
+            data = os.pread(self._read_fd, self._offset - len(self._pending), 0)
+            for line in data.splitlines():
+                self._apply_line(line, only=repository.name)
+        self.sync()
+
+    def sync(self):
+        """다른 워커가 추가한 기록을 읽어 저장소에 반영"""
+        if self._read_fd is None:
+            return
+        with self.lock:
+            while True:
+                size = os.fstat(self._read_fd).st_size
+                if size > self._offset:
+                    data = self._pending + os.pread(self._read_fd, size - self._offset, self._offset)
+                    self._offset = size
+                    # 쓰는 중인 마지막 줄은 다음에 반영
+                    complete, _, self._pending = data.rpartition(b"\n")
+                    for line in complete.splitlines():
+                        self._apply_line(line)
+                try:
+                    current_inode = os.stat(self.path).st_ino
+                except FileNotFoundError:
+                    return
+                if current_inode == self._inode:
+                    return
+                # 다른 워커가 압축하여 파일이 교체됨: 남은 내용을 읽은 뒤 새 파일을 처음부터 읽음
+                if os.fstat(self._read_fd).st_size > self._offset:
+                    continue
+                self._open()
+
+    def _apply_line(self, line: bytes, only: Optional[str] = None):
+        try:
+            entry = json.loads(line)
+        except ValueError:
+            # 쓰는 도중 종료된 워커가 남긴 불완전한 줄은 무시
+            return
+        name = entry.get("repo")
+        if name is None or (only is not None and name != only):
+            return
+        repository = self.repositories.get(name)
+        if repository is not None:
+            repository._apply_change(entry)
+
+    def backlog_bytes(self) -> int:
+        """다른 워커가 기록했지만 아직 반영하지 않은 크기 (준비 상태 확인용)"""
+        if self._read_fd is None:
+            return 0
+        return os.fstat(self._read_fd).st_size - self._offset + len(self._pending)
+
+    def append(self, name: str, op: str, **payload):
+        """
+        변경 기록 추가 (exclusive() 안에서 sync() 후 호출)
+
+        잠금 안에서 직전까지 모두 읽었으므로 자신이 쓴 기록은 다시 반영하지 않고 건너뛴다.
+        """
+        line = (json.dumps({"repo": name, "op": op, **payload}, ensure_ascii=False) + "\n").encode("utf-8")
+        if self._pending:
+            line = b"\n" + line
+            self._pending = b""
+        with open(self.path, 'ab') as f:
+            f.write(line)
+        self._offset += len(line)
+        if self._offset > self.max_bytes:
+            self.compact()
+
+    def compact(self):
+        """현재 상태 스냅샷 하나로 기록 파일 교체 (exclusive() 안에서 호출)"""
+        lines = [self._header()]
+        for name, repository in self.repositories.items():
+            snapshot = {"repo": name, "op": "snapshot", "records": repository._snapshot(), "seq": repository.change_log.seq}
+            lines.append((json.dumps(snapshot, ensure_ascii=False) + "\n").encode("utf-8"))
+        self._replace(b"".join(lines))
+        self._open()
+        self._offset = os.fstat(self._read_fd).st_size
+
+
+_journal: Optional[ChangeJournal] = None
+
+
+def _reset_after_fork():
+    """
+    fork된 워커는 부모의 파일 잠금 fd를 공유하면 flock이 서로 배제되지 않으므로 새로 연다
+    (server.py가 저장소를 미리 로드한 뒤 워커를 fork하는 경우)
+    """
+    if _journal is not None:
+        _journal.lock = threading.RLock()
+        _journal._lock_fd = None
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def get_journal() -> Optional[ChangeJournal]:
+    """STORE_JOURNAL 설정 시 프로세스 공용 기록 객체 반환"""
+    global _journal
+    if STORE_JOURNAL and _journal is None:
+        _journal = ChangeJournal(STORE_JOURNAL)
+    return _journal
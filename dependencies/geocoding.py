@@ -0,0 +1,251 @@
+"""
+지오코딩 제공자 + 결과 캐시
+
+routers/address.py는 get_geocoder()가 반환하는 CachedGeocoder만 사용한다.
+제공자(GeocodingProvider)는 우편번호 조회/주소 자동완성/역지오코딩을 구현하며, 외부 API 제공자를 추가할 때는
+같은 메서드를 구현하고 register_provider()로 등록한 뒤 GEOCODING_PROVIDER로 선택한다. 기본값은 로컬 DB(local)이다.
+
+CachedGeocoder
+- LRU + TTL 캐시: 같은 조회는 프로세스 밖으로 나가지 않음 (결과 없음은 GEOCODING_NEGATIVE_TTL 동안만 보관)
+- 단일 실행(single-flight): 같은 키의 조회가 진행 중이면 새로 호출하지 않고 그 결과를 함께 기다림
+- 역지오코딩 좌표는 소수점 5자리(약 1m)로 반올림하여 키로 사용
+"""
+import asyncio
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+
+from dependencies.metrics import Counter, record_cache
+from dependencies.postal_codes import get_postal_db, normalize
+from dependencies.reverse_geocoding import get_reverse_geocoder
+
+# 환경변수에서 설정값 가져오기
+GEOCODING_PROVIDER = os.getenv("GEOCODING_PROVIDER", "local")
+GEOCODING_CACHE_SIZE = int(os.getenv("GEOCODING_CACHE_SIZE", "10000"))
+GEOCODING_CACHE_TTL = float(os.getenv("GEOCODING_CACHE_TTL", "86400"))
+GEOCODING_NEGATIVE_TTL = float(os.getenv("GEOCODING_NEGATIVE_TTL", "300"))
+
+COORDINATE_PRECISION = 5
+
+geocoding_upstream_calls_total = Counter(
+    "geocoding_upstream_calls_total", "지오코딩 제공자 호출 수", ("provider", "method")
+)
+geocoding_coalesced_total = Counter(
+    "geocoding_coalesced_total", "진행 중인 같은 조회에 합류한 지오코딩 요청 수", ("method",)
+)
+
+
+class GeocodingUnavailable(Exception):
+    """제공자를 사용할 수 없음 (DB 파일 없음, 외부 API 장애 등)"""
+
+
+class GeocodingProvider:
+    """지오코딩 제공자 인터페이스 (레코드 형식은 dependencies.postal_codes.FIELDS, 역지오코딩은 distanceMeters 추가)"""
+
+    name = "base"
+
+    def warmup(self):
+        """시작 시 준비 작업 (파일 열기, 연결 등)"""
+
+    async def find_by_postal_code(self, postal_code: str) -> List[dict]:
+        raise NotImplementedError
+
+    async def autocomplete(self, query: str, limit: int) -> List[dict]:
+        raise NotImplementedError
+
+    async def reverse(self, lat: float, lng: float, max_distance: float) -> Optional[dict]:
+        raise NotImplementedError
+
+    async def reverse_many(self, points: List[Tuple[float, float]], max_distance: float) -> List[Optional[dict]]:
+        """여러 좌표 조회 (일괄 API가 없는 제공자는 하나씩 호출)"""
+        return [await self.reverse(lat, lng, max_distance) for lat, lng in points]
+
+
+class LocalGeocodingProvider(GeocodingProvider):
+    """로컬 우편번호 DB/k-d 트리 (조회가 마이크로초 단위라 이벤트 루프에서 바로 실행)"""
+
+    name = "local"
+
+    def warmup(self):
+        get_postal_db()
+        get_reverse_geocoder()
+
+    @staticmethod
+    def _db():
+        db = get_postal_db()
+        if db is None:
+            raise GeocodingUnavailable("우편번호 DB를 사용할 수 없습니다.")
+        return db
+
+    @staticmethod
+    def _geocoder():
+        geocoder = get_reverse_geocoder()
+        if geocoder is None:
+            raise GeocodingUnavailable("우편번호 DB를 사용할 수 없습니다.")
+        return geocoder
+
+    async def find_by_postal_code(self, postal_code: str) -> List[dict]:
+        return self._db().find_by_postal_code(postal_code)
+
+    async def autocomplete(self, query: str, limit: int) -> List[dict]:
+        return self._db().search(query, limit)
+
+    async def reverse(self, lat: float, lng: float, max_distance: float) -> Optional[dict]:
+        return self._geocoder().reverse(lat, lng, max_distance)
+
+    async def reverse_many(self, points: List[Tuple[float, float]], max_distance: float) -> List[Optional[dict]]:
+        geocoder = self._geocoder()
+        # 점이 많으면 이벤트 루프를 막지 않도록 스레드에서 계산
+        return await asyncio.get_running_loop().run_in_executor(None, geocoder.reverse_many, points, max_distance)
+
+
+providers: Dict[str, Callable[[], GeocodingProvider]] = {"local": LocalGeocodingProvider}
+
+
+def register_provider(name: str, factory: Callable[[], GeocodingProvider]):
+    providers[name] = factory
+
+
+class TTLCache:
+    """항목 수 제한(LRU) + 항목별 만료 시각"""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._items: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        item = self._items.get(key)
+        if item is None:
+            return False, None
+        if item[0] < time.monotonic():
+            del self._items[key]
+            return False, None
+        self._items.move_to_end(key)
+        return True, item[1]
+
+    def set(self, key: Hashable, value: Any, ttl: float):
+        self._items[key] = (time.monotonic() + ttl, value)
+        self._items.move_to_end(key)
+        while len(self._items) > self.max_size:
+            self._items.popitem(last=False)
+
+    def clear(self):
+        self._items.clear()
+
+    def __len__(self):
+        return len(self._items)
+
+
+class CachedGeocoder:
+    def __init__(self, provider: GeocodingProvider, max_size: int = GEOCODING_CACHE_SIZE,
+                 ttl: float = GEOCODING_CACHE_TTL, negative_ttl: float = GEOCODING_NEGATIVE_TTL):
+        self.provider = provider
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.cache = TTLCache(max_size)
+        self._in_flight: Dict[Hashable, asyncio.Future] = {}
+
+    def _store(self, key: Hashable, value: Any):
+        self.cache.set(key, value, self.ttl if value else self.negative_ttl)
+
+    async def _lookup(self, key: Hashable, call: Callable[[], Awaitable[Any]]) -> Any:
+        hit, value = self.cache.get(key)
+        record_cache("geocoding", hit)
+        if hit:
+            return value
+
+        task = self._in_flight.get(key)
+        if task is None:
+            # 제공자 호출은 별도 태스크로 실행하여 처음 요청한 쪽이 취소되어도 기다리는 요청은 결과를 받음
+            task = asyncio.ensure_future(self._fetch(key, call))
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+        else:
+            geocoding_coalesced_total.inc(key[0])
+        return await asyncio.shield(task)
+
+    async def _fetch(self, key: Hashable, call: Callable[[], Awaitable[Any]]) -> Any:
+        geocoding_upstream_calls_total.inc(self.provider.name, key[0])
+        value = await call()
+        self._store(key, value)
+        return value
+
+    def _finish(self, key: Hashable, task: asyncio.Future):
+        self._in_flight.pop(key, None)
+        # 기다리던 요청이 모두 취소된 경우 "exception was never retrieved" 경고 방지
+        if not task.cancelled():
+            task.exception()
+
+    @staticmethod
+    def _point_key(lat: float, lng: float) -> Tuple[float, float]:
+        return round(lat, COORDINATE_PRECISION), round(lng, COORDINATE_PRECISION)
+
+    async def find_by_postal_code(self, postal_code: str) -> List[dict]:
+        postal_code = postal_code.strip()
+        return await self._lookup(("postal", postal_code), lambda: self.provider.find_by_postal_code(postal_code))
+
+    async def autocomplete(self, query: str, limit: int) -> List[dict]:
+        query = " ".join(normalize(query).split())
+        return await self._lookup(("autocomplete", query, limit), lambda: self.provider.autocomplete(query, limit))
+
+    async def reverse(self, lat: float, lng: float, max_distance: float) -> Optional[dict]:
+        lat, lng = self._point_key(lat, lng)
+        return await self._lookup(("reverse", lat, lng, max_distance), lambda: self.provider.reverse(lat, lng, max_distance))
+
+    async def reverse_many(self, points: List[Tuple[float, float]], max_distance: float) -> List[Optional[dict]]:
+        """캐시에 없고 진행 중이지 않은 좌표만 모아 제공자를 한 번 호출 (진행 중인 좌표는 그 결과를 기다림)"""
+        keys = [("reverse", *self._point_key(lat, lng), max_distance) for lat, lng in points]
+        results: Dict[Hashable, Any] = {}
+        pending: Dict[Hashable, asyncio.Future] = {}
+        missing: List[Hashable] = []
+        for key in keys:
+            if key in results or key in pending:
+                continue
+            hit, value = self.cache.get(key)
+            record_cache("geocoding", hit)
+            if hit:
+                results[key] = value
+            elif key in self._in_flight:
+                geocoding_coalesced_total.inc(key[0])
+                pending[key] = self._in_flight[key]
+            else:
+                missing.append(key)
+                pending[key] = None
+
+        if missing:
+            # 한 번의 제공자 호출 결과를 좌표별 태스크로 나누어 등록하므로 같은 좌표의 다른 요청은 이 호출을 기다림
+            batch = asyncio.ensure_future(self._fetch_many(missing, max_distance))
+            for key in missing:
+                task = asyncio.ensure_future(self._pick(batch, key))
+                self._in_flight[key] = task
+                task.add_done_callback(lambda done, key=key: self._finish(key, done))
+                pending[key] = task
+
+        if pending:
+            values = await asyncio.gather(*[asyncio.shield(task) for task in pending.values()])
+            results.update(zip(pending, values))
+        return [results[key] for key in keys]
+
+    async def _fetch_many(self, keys: List[Hashable], max_distance: float) -> Dict[Hashable, Any]:
+        geocoding_upstream_calls_total.inc(self.provider.name, "reverse_many")
+        values = await self.provider.reverse_many([(key[1], key[2]) for key in keys], max_distance)
+        for key, value in zip(keys, values):
+            self._store(key, value)
+        return dict(zip(keys, values))
+
+    @staticmethod
+    async def _pick(batch: asyncio.Future, key: Hashable) -> Any:
+        return (await batch)[key]
+
+
+_geocoder: Optional[CachedGeocoder] = None
+
+
+def get_geocoder() -> CachedGeocoder:
+    global _geocoder
+    if _geocoder is None:
+        if GEOCODING_PROVIDER not in providers:
+            raise ValueError(f"알 수 없는 GEOCODING_PROVIDER: {GEOCODING_PROVIDER} (사용 가능: {', '.join(providers)})")
+        _geocoder = CachedGeocoder(providers[GEOCODING_PROVIDER]())
+    return _geocoder
@@ -0,0 +1,91 @@
+"""
+상태 확인 / 준비 상태 (/healthz, /readyz)
+
+워밍업은 저장소를 한 번씩 조회하여 인덱스/SQLite 페이지 캐시를 데우고, 라우터가 register_warmup()으로
+등록한 캐시 워밍업 함수를 실행한다. server.py는 워커를 fork하기 전에 부모에서 실행하여 워커가 결과를 공유하고,
+단독 실행(uvicorn main:app) 시에는 앱 시작 후 백그라운드에서 실행한다.
+
+준비 조건
+- 워밍업 완료, READY_STORES 저장소가 모두 로드됨
+- 다른 워커가 기록했지만 아직 반영하지 않은 변경 기록 크기 < READY_MAX_JOURNAL_BACKLOG (STORE_JOURNAL 사용 시)
+- 처리 중 요청 수 < READY_MAX_IN_FLIGHT (0이면 확인하지 않음)
+"""
+import os
+import threading
+import time
+from typing import Callable, Dict, Tuple
+
+from dependencies.change_journal import get_journal
+from dependencies.logger import get_logger
+from dependencies.metrics import http_requests_in_flight
+from dependencies.repository import repositories
+
+READY_STORES = tuple(s.strip() for s in os.getenv("READY_STORES", "golf_courses,maps,cart_models").split(",") if s.strip())
+READY_MAX_JOURNAL_BACKLOG = int(os.getenv("READY_MAX_JOURNAL_BACKLOG", str(8 * 1024 * 1024)))
+READY_MAX_IN_FLIGHT = int(os.getenv("READY_MAX_IN_FLIGHT", "0"))
+
+logger = get_logger(__name__)
+
+_warmups: Dict[str, Callable[[], object]] = {}
+_warmup_lock = threading.Lock()
+_state = {"warmed": False, "durationMs": None, "error": None}
+
+
+def register_warmup(name: str, func: Callable[[], object]):
+    """준비 상태 전에 실행할 캐시 워밍업 함수 등록"""
+    _warmups[name] = func
+
+
+def is_warmed() -> bool:
+    return _state["warmed"]
+
+
+def warmup():
+    """저장소 조회 + 등록된 워밍업 실행 (여러 번 호출해도 한 번만 실행)"""
+    with _warmup_lock:
+        if _state["warmed"]:
+            return
+        started = time.perf_counter()
+        steps = {}
+        try:
+            for name, repository in list(repositories.items()):
+                step_started = time.perf_counter()
+                repository.count()
+                repository.query(limit=1)
+                steps[f"store:{name}"] = round((time.perf_counter() - step_started) * 1000, 2)
+            for name, func in _warmups.items():
+                step_started = time.perf_counter()
+                func()
+                steps[name] = round((time.perf_counter() - step_started) * 1000, 2)
+        except Exception as e:
+            _state["error"] = str(e)
+            logger.exception("워밍업 실패")
+            return
+        _state.update(warmed=True, error=None, durationMs=round((time.perf_counter() - started) * 1000, 2))
+        logger.info("워밍업 완료", extra={"fields": {"durationMs": _state["durationMs"], "steps": steps}})
+
+
+def readiness() -> Tuple[bool, dict]:
+    """(준비 여부, 확인 항목별 결과)"""
+    checks = {
+        "warmup": {"ok": _state["warmed"], "durationMs": _state["durationMs"], "error": _state["error"]},
+    }
+
+    missing = [name for name in READY_STORES if name not in repositories]
+    checks["stores"] = {
+        "ok": not missing,
+        "missing": missing,
+        "records": {name: repositories[name].count() for name in READY_STORES if name in repositories},
+    }
+
+    journal = get_journal()
+    if journal:
+        backlog = journal.backlog_bytes()
+        checks["journal"] = {"ok": backlog < READY_MAX_JOURNAL_BACKLOG, "backlogBytes": backlog, "limit": READY_MAX_JOURNAL_BACKLOG}
+
+    if READY_MAX_IN_FLIGHT:
+        # 준비 상태 확인 요청 자신은 제외
+        in_flight = int(http_requests_in_flight.get()) - 1
+        checks["inFlight"] = {"ok": in_flight < READY_MAX_IN_FLIGHT, "value": in_flight, "limit": READY_MAX_IN_FLIGHT}
+
+    return all(check["ok"] for check in checks.values()), checks
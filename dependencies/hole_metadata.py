@@ -0,0 +1,164 @@
+import asyncio
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional
+
+# 환경변수에서 설정값 가져오기
+METADATA_PARSE_WORKERS = int(os.getenv("METADATA_PARSE_WORKERS", str(os.cpu_count() or 2)))
+# 파일 수가 적으면 프로세스 간 전달 비용이 파싱보다 커서 현재 프로세스에서 처리
+METADATA_POOL_MIN_FILES = int(os.getenv("METADATA_POOL_MIN_FILES", "8"))
+
+_parse_pool: Optional[ProcessPoolExecutor] = None
+
+
+def get_parse_pool() -> ProcessPoolExecutor:
+    """메타데이터 파싱용 프로세스 풀 (최초 사용 시 생성)"""
+    global _parse_pool
+    if _parse_pool is None:
+        _parse_pool = ProcessPoolExecutor(max_workers=max(1, METADATA_PARSE_WORKERS))
+    return _parse_pool
+
+
+def safe_relative_path(filename: str) -> str:
+    """업로드 파일명(webkitRelativePath 포함)을 안전한 상대 경로로 정규화"""
+    parts = [p for p in re.split(r"[\\/]+", filename or "") if p not in ("", ".", "..")]
+    return os.path.join(*parts) if parts else "unnamed.json"
+
+
+def _extend_bounds(bounds: Optional[list], coordinates) -> Optional[list]:
+    """좌표 배열(중첩 포함)을 순회하며 [west, south, east, north] 갱신"""
+    stack = [coordinates]
+    while stack:
+        current = stack.pop()
+        if not isinstance(current, list) or not current:
+            continue
+        if isinstance(current[0], (int, float)):
+            if len(current) < 2:
+                continue
+            lng, lat = current[0], current[1]
+            if bounds is None:
+                bounds = [lng, lat, lng, lat]
+            else:
+                bounds[0] = min(bounds[0], lng)
+                bounds[1] = min(bounds[1], lat)
+                bounds[2] = max(bounds[2], lng)
+                bounds[3] = max(bounds[3], lat)
+        else:
+            stack.extend(current)
+    return bounds
+
+
+def _to_bounds_dict(bounds: Optional[list]) -> Optional[dict]:
+    if bounds is None:
+        return None
+    return {"west": bounds[0], "south": bounds[1], "east": bounds[2], "north": bounds[3]}
+
+
+def _is_waypoint(feature: dict) -> bool:
+    properties = feature.get("properties") or {}
+    if str(properties.get("type", "")).lower() == "waypoint":
+        return True
+    return (feature.get("geometry") or {}).get("type") in ("Point", "MultiPoint")
+
+
+def _hole_number(relative_path: str, features: List[dict]) -> Optional[int]:
+    """속성(hole/holeNumber) 우선, 없으면 파일명의 마지막 숫자로 홀 번호 결정"""
+    for feature in features:
+        properties = feature.get("properties") or {}
+        for key in ("hole", "holeNumber", "hole_number"):
+            value = properties.get(key)
+            if isinstance(value, int) or (isinstance(value, str) and value.isdigit()):
+                return int(value)
+    numbers = re.findall(r"\d+", os.path.splitext(os.path.basename(relative_path))[0])
+    return int(numbers[-1]) if numbers else None
+
+
+def parse_hole_file(path: str, relative_path: str) -> dict:
+    """
+    홀 메타데이터(GeoJSON) 파일 하나를 파싱하여 인덱스 항목 생성
+
+    프로세스 풀에서 실행되므로 모듈 전역 상태에 의존하지 않는다.
+    """
+    result = {"file": relative_path, "size": 0}
+    try:
+        result["size"] = os.path.getsize(path)
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, UnicodeDecodeError) as e:
+        result["error"] = f"파일 읽기 실패: {e}"
+        return result
+    except json.JSONDecodeError as e:
+        result["error"] = f"JSON 파싱 실패: {e.msg} (line {e.lineno})"
+        return result
+
+    if isinstance(data, dict) and data.get("type") == "Feature":
+        features = [data]
+    elif isinstance(data, dict) and data.get("type") == "FeatureCollection" and isinstance(data.get("features"), list):
+        features = data["features"]
+    else:
+        result["error"] = "올바른 GeoJSON 형식이 아닙니다."
+        return result
+
+    geometry_bounds = None
+    waypoint_bounds = None
+    waypoint_count = 0
+    for feature in features:
+        if not isinstance(feature, dict) or not isinstance(feature.get("geometry"), dict):
+            continue
+        coordinates = feature["geometry"].get("coordinates")
+        if _is_waypoint(feature):
+            waypoint_count += 1
+            waypoint_bounds = _extend_bounds(waypoint_bounds, coordinates)
+        else:
+            geometry_bounds = _extend_bounds(geometry_bounds, coordinates)
+
+    hole = _hole_number(relative_path, features)
+    if hole is None:
+        result["error"] = "홀 번호를 확인할 수 없습니다."
+        return result
+
+    result.update({
+        "hole": hole,
+        "featureCount": len(features),
+        "waypointCount": waypoint_count,
+        "geometryBounds": _to_bounds_dict(geometry_bounds),
+        "waypointBounds": _to_bounds_dict(waypoint_bounds),
+    })
+    return result
+
+
+async def parse_hole_files(files: List[tuple]) -> List[dict]:
+    """(디스크 경로, 상대 경로) 목록을 병렬 파싱"""
+    loop = asyncio.get_running_loop()
+    if len(files) < METADATA_POOL_MIN_FILES:
+        executor = None  # 기본 스레드 풀
+    else:
+        executor = get_parse_pool()
+    return await asyncio.gather(*[
+        loop.run_in_executor(executor, parse_hole_file, path, relative_path)
+        for path, relative_path in files
+    ])
+
+
+def build_hole_index(map_id: str, results: List[dict]) -> dict:
+    """파싱 결과로 홀 번호 -> 경계 박스 인덱스 생성"""
+    holes = {}
+    errors = []
+    for item in results:
+        if "error" in item:
+            errors.append({"file": item["file"], "message": item["error"]})
+            continue
+        key = str(item["hole"])
+        if key in holes:
+            errors.append({"file": item["file"], "message": f"{item['hole']}번 홀 파일이 중복되었습니다."})
+            continue
+        holes[key] = {k: v for k, v in item.items() if k != "hole"}
+
+    return {
+        "mapId": map_id,
+        "holeCount": len(holes),
+        "holes": dict(sorted(holes.items(), key=lambda entry: int(entry[0]))),
+        "errors": errors,
+    }
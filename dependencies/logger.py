@@ -0,0 +1,123 @@
+"""
+구조화 로그 (큐 기반)
+
+로그 호출은 레코드를 메모리 큐에 넣기만 하고, 별도 리스너 스레드가 포맷/출력하므로
+요청 처리 중 stdout 쓰기로 이벤트 루프가 막히지 않는다.
+
+    logger = get_logger(__name__)
+    logger.info("데이터 저장", extra={"fields": {"store": "golf_courses", "records": 120}})
+
+- LOG_FORMAT=json(기본): 한 줄에 JSON 객체 하나 (ts, level, logger, message, requestId, 추가 필드)
+- LOG_FORMAT=text: 개발용 한 줄 텍스트
+- LOG_LEVEL: 로그 수준 (server.py의 uvicorn 로그 수준과 같은 값 사용)
+"""
+import atexit
+import copy
+import json
+import logging
+import os
+import queue
+import sys
+import time
+from contextvars import ContextVar
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "info").upper()
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json").lower()  # json | text
+
+ROOT_LOGGER = "backoffice"
+
+# 현재 요청 ID (tracing 미들웨어에서 설정)
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(record.created)) + f".{int(record.msecs):03d}",
+            "level": record.levelname.lower(),
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if getattr(record, "request_id", None):
+            entry["requestId"] = record.request_id
+        entry.update(getattr(record, "fields", None) or {})
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    def __init__(self):
+        super().__init__("%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    def format(self, record: logging.LogRecord) -> str:
+        line = super().format(record)
+        fields = getattr(record, "fields", None)
+        if fields:
+            line += " " + " ".join(f"{key}={json.dumps(value, ensure_ascii=False, default=str)}" for key, value in fields.items())
+        return line
+
+
+class _QueueHandler(QueueHandler):
+    """호출한 스레드에서는 메시지 조립과 요청 ID 기록만 하고 포맷은 리스너 스레드에 맡김"""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        # 요청 ID는 로그를 호출한 태스크의 컨텍스트에서 읽어야 함
+        record.request_id = request_id_var.get()
+        if record.exc_info:
+            record.exc_text = _exception_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+_exception_formatter = logging.Formatter()
+
+
+def _build_listener(log_queue: queue.SimpleQueue) -> QueueListener:
+    output = logging.StreamHandler(sys.stdout)
+    output.setFormatter(TextFormatter() if LOG_FORMAT == "text" else JsonFormatter())
+    return QueueListener(log_queue, output, respect_handler_level=False)
+
+
+_queue: queue.SimpleQueue = queue.SimpleQueue()
+_handler = _QueueHandler(_queue)
+_listener = _build_listener(_queue)
+
+_root = logging.getLogger(ROOT_LOGGER)
+_root.setLevel(LOG_LEVEL if isinstance(logging.getLevelName(LOG_LEVEL), int) else "INFO")
+_root.addHandler(_handler)
+_root.propagate = False
+_listener.start()
+
+
+def get_logger(name: str) -> logging.Logger:
+    """backoffice.<name> 로거 (모듈에서 get_logger(__name__)로 사용)"""
+    return logging.getLogger(f"{ROOT_LOGGER}.{name}")
+
+
+def flush():
+    """큐에 남은 로그를 모두 출력하고 리스너 종료 (프로세스 종료 직전 호출)"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def _restart_after_fork():
+    """리스너 스레드는 fork 후 자식에 남지 않으므로 새 큐/리스너로 다시 시작"""
+    global _queue, _listener
+    _queue = queue.SimpleQueue()
+    _handler.queue = _queue
+    _listener = _build_listener(_queue)
+    _listener.start()
+
+
+atexit.register(flush)
+os.register_at_fork(after_in_child=_restart_after_fork)
@@ -0,0 +1,247 @@
+import json
+import os
+import shutil
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from dependencies import blob_store
+from dependencies.repository import create_repository
+
+# 맵 버전 이력 파일 경로
+VERSIONS_FILE = 'map_versions_data.json'
+
+# 버전 스냅샷에서 제외하는 필드 (버전마다 달라지거나 조회 시 계산되는 값)
+RECORD_EXCLUDED_FIELDS = ("version", "updatedAt", "golfCourseName")
+# 롤백 시 유지하는 필드
+RECORD_IMMUTABLE_FIELDS = ("mapId", "createdAt")
+
+
+def migrate_versions_file():
+    """이전 형식(맵 ID -> 버전 목록 사전) 파일을 저장소 레코드 목록 형식으로 변환"""
+    if not os.path.exists(VERSIONS_FILE):
+        return
+    try:
+        with open(VERSIONS_FILE, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (json.JSONDecodeError, IOError):
+        return
+    if isinstance(data, dict):
+        with open(VERSIONS_FILE, 'w', encoding='utf-8') as f:
+            json.dump([{"mapId": map_id, "revisions": revisions} for map_id, revisions in data.items()], f, ensure_ascii=False, indent=2)
+
+
+migrate_versions_file()
+
+# 맵 버전 이력 저장소, 레코드: {"mapId", "revisions": 버전 목록 (오래된 순)}
+version_repository = create_repository(
+    "map_versions",
+    key_field="mapId",
+    data_file=VERSIONS_FILE,
+    label="맵 버전 이력"
+)
+
+
+def bump_version(version: str) -> str:
+    """맵 버전의 patch 번호 증가 (예: 1.2.0 -> 1.2.1)"""
+    parts = (version or "1.0.0").split(".")
+    try:
+        parts[-1] = str(int(parts[-1]) + 1)
+    except ValueError:
+        parts.append("1")
+    return ".".join(parts)
+
+
+def snapshot_record(map_item: dict) -> dict:
+    """버전에 저장할 맵 레코드 스냅샷"""
+    return {k: v for k, v in map_item.items() if k not in RECORD_EXCLUDED_FIELDS}
+
+
+def get_revisions(map_id: str) -> List[dict]:
+    record = version_repository.get(map_id)
+    return record["revisions"] if record else []
+
+
+def get_revision(map_id: str, version: str) -> Optional[dict]:
+    return next((r for r in reversed(get_revisions(map_id)) if r["version"] == version), None)
+
+
+def get_manifest(revision: Optional[dict]) -> Dict[str, dict]:
+    """버전의 파일 목록 (경로 -> {hash, size}), 캐시된 객체이므로 수정하지 말 것"""
+    if not revision:
+        return {}
+    return blob_store.read_json(revision["manifest"]) or {}
+
+
+def get_head_manifest(map_id: str) -> Dict[str, dict]:
+    revisions = get_revisions(map_id)
+    return get_manifest(revisions[-1] if revisions else None)
+
+
+def _append_revision(map_item: dict, version: str, record_hash: str, manifest_hash: str, manifest: dict, message: str, parent: Optional[str]) -> dict:
+    revision = {
+        "version": version,
+        "parent": parent,
+        "createdAt": datetime.utcnow().isoformat() + "Z",
+        "message": message,
+        "record": record_hash,
+        "manifest": manifest_hash,
+        "fileCount": len(manifest),
+        "totalSize": sum(entry["size"] for entry in manifest.values()),
+    }
+    # 저장된 목록을 제자리에서 수정하지 않고 새 레코드로 교체
+    version_repository.update({
+        "mapId": map_item["mapId"],
+        "revisions": get_revisions(map_item["mapId"]) + [revision]
+    })
+    return revision
+
+
+def ensure_history(map_item: dict):
+    """버전 이력이 없는 맵은 현재 상태를 기준 버전으로 기록"""
+    if get_revisions(map_item["mapId"]):
+        return
+    _append_revision(
+        map_item,
+        map_item.get("version", "1.0.0"),
+        blob_store.put_json(snapshot_record(map_item)),
+        blob_store.put_json({}),
+        {},
+        "초기 버전",
+        None
+    )
+
+
+def commit_revision(map_item: dict, manifest_updates: Optional[Dict[str, dict]] = None, replace_prefixes: tuple = (), message: str = "") -> dict:
+    """
+    맵의 새 버전 기록
+
+    파일은 해시로만 참조하므로 변경되지 않은 타일/메타데이터는 이전 버전과 공유된다.
+    replace_prefixes에 해당하는 기존 파일은 manifest_updates로 대체된다.
+    """
+    ensure_history(map_item)
+    parent = get_revisions(map_item["mapId"])[-1]
+
+    manifest = {
+        path: entry for path, entry in get_manifest(parent).items()
+        if not any(path.startswith(prefix) for prefix in replace_prefixes)
+    }
+    manifest.update(manifest_updates or {})
+
+    new_version = bump_version(map_item.get("version", "1.0.0"))
+    map_item["version"] = new_version
+    map_item["updatedAt"] = datetime.utcnow().isoformat() + "Z"
+
+    return _append_revision(
+        map_item,
+        new_version,
+        blob_store.put_json(snapshot_record(map_item)),
+        blob_store.put_json(manifest),
+        manifest,
+        message,
+        parent["version"]
+    )
+
+
+def rollback(map_item: dict, target_version: str) -> Optional[dict]:
+    """
+    이전 버전으로 롤백
+
+    대상 버전의 레코드/파일 목록 해시를 그대로 참조하는 새 버전을 만들므로 데이터 복사가 없다.
+    """
+    target = get_revision(map_item["mapId"], target_version)
+    if not target:
+        return None
+
+    record = blob_store.read_json(target["record"]) or {}
+    for key in list(map_item.keys()):
+        if key not in RECORD_IMMUTABLE_FIELDS and key not in RECORD_EXCLUDED_FIELDS:
+            map_item.pop(key)
+    map_item.update({k: v for k, v in record.items() if k not in RECORD_IMMUTABLE_FIELDS})
+
+    parent = get_revisions(map_item["mapId"])[-1]
+    new_version = bump_version(map_item.get("version", "1.0.0"))
+    map_item["version"] = new_version
+    map_item["updatedAt"] = datetime.utcnow().isoformat() + "Z"
+
+    return _append_revision(
+        map_item,
+        new_version,
+        target["record"],
+        target["manifest"],
+        get_manifest(target),
+        f"{target_version} 버전으로 롤백",
+        parent["version"]
+    )
+
+
+def diff_revisions(map_id: str, from_version: str, to_version: str) -> Optional[dict]:
+    """두 버전의 레코드 필드와 파일 목록 비교 (해시 비교만 하므로 파일을 읽지 않음)"""
+    source = get_revision(map_id, from_version)
+    target = get_revision(map_id, to_version)
+    if not source or not target:
+        return None
+
+    record_changes = []
+    if source["record"] != target["record"]:
+        source_record = blob_store.read_json(source["record"]) or {}
+        target_record = blob_store.read_json(target["record"]) or {}
+        record_changes = sorted(
+            key for key in set(source_record) | set(target_record)
+            if source_record.get(key) != target_record.get(key)
+        )
+
+    added, removed, changed = [], [], []
+    shared_size = 0
+    if source["manifest"] != target["manifest"]:
+        source_manifest = get_manifest(source)
+        target_manifest = get_manifest(target)
+        for path, entry in target_manifest.items():
+            previous = source_manifest.get(path)
+            if previous is None:
+                added.append(path)
+            elif previous["hash"] != entry["hash"]:
+                changed.append(path)
+            else:
+                shared_size += entry["size"]
+        removed = [path for path in source_manifest if path not in target_manifest]
+    else:
+        shared_size = target["totalSize"]
+
+    return {
+        "from": from_version,
+        "to": to_version,
+        "recordChanges": record_changes,
+        "added": sorted(added),
+        "removed": sorted(removed),
+        "changed": sorted(changed),
+        "sharedSize": shared_size,
+    }
+
+
+def delete_history(map_id: str):
+    """맵 삭제 시 버전 이력 제거 (blob은 다른 맵/버전과 공유될 수 있어 유지)"""
+    version_repository.delete(map_id)
+
+
+def ingest_file(path: str, manifest_path: str) -> Dict[str, dict]:
+    """파일을 blob 저장소로 이동하고 manifest 항목 반환"""
+    size = os.path.getsize(path)
+    return {manifest_path: {"hash": blob_store.put_file(path), "size": size}}
+
+
+def ingest_json(data, manifest_path: str) -> Dict[str, dict]:
+    """JSON 데이터를 blob으로 저장하고 manifest 항목 반환"""
+    content_hash = blob_store.put_json(data)
+    return {manifest_path: {"hash": content_hash, "size": os.path.getsize(blob_store.blob_path(content_hash))}}
+
+
+def ingest_directory(directory: str, prefix: str) -> Dict[str, dict]:
+    """디렉토리 내 모든 파일을 blob 저장소로 옮기고 manifest 항목 반환 (디렉토리는 삭제)"""
+    entries = {}
+    for root, _, files in os.walk(directory):
+        for name in files:
+            path = os.path.join(root, name)
+            relative_path = os.path.relpath(path, directory).replace(os.sep, "/")
+            entries.update(ingest_file(path, f"{prefix}{relative_path}"))
+    shutil.rmtree(directory, ignore_errors=True)
+    return entries
@@ -0,0 +1,87 @@
+"""
+JSON Merge Patch (RFC 7386)와 변경 경로 계산
+
+PATCH 요청 본문을 기존 레코드에 깊게 병합하고, 실제로 바뀐 경로만 골라 저장소(변경 기록 파일, 변경 피드)에 넘긴다.
+경로는 키 튜플이다 (예: ("operation", "openTime")).
+
+- 값이 null이면 해당 키 삭제, 객체면 하위 키끼리 병합, 그 외(목록 포함)는 통째로 교체
+- null 값 자체는 설정할 수 없음 (RFC 7386 제약)
+"""
+from typing import Any, Dict, List, Tuple
+
+Path = Tuple[str, ...]
+
+_MISSING = object()
+
+
+def apply_merge_patch(target: Any, patch: Any) -> Any:
+    """병합 결과 반환 (원본은 수정하지 않고, 바뀌지 않은 하위 객체는 원본과 공유)"""
+    if not isinstance(patch, dict):
+        return patch
+    result = dict(target) if isinstance(target, dict) else {}
+    for key, value in patch.items():
+        if value is None:
+            result.pop(key, None)
+        else:
+            result[key] = apply_merge_patch(result.get(key), value)
+    return result
+
+
+def diff_paths(old: Any, new: Any, prefix: Path = ()) -> List[Path]:
+    """old와 new가 다른 경로 목록 (객체는 하위 키까지 비교, 추가/삭제된 키는 그 키 경로)"""
+    if old is new or old == new:
+        return []
+    if not (isinstance(old, dict) and isinstance(new, dict)):
+        return [prefix]
+    paths = []
+    for key in list(old) + [key for key in new if key not in old]:
+        if key not in old or key not in new:
+            paths.append(prefix + (key,))
+        else:
+            paths.extend(diff_paths(old[key], new[key], prefix + (key,)))
+    return paths
+
+
+def get_value(record: dict, path: Path) -> Any:
+    """경로 값 (없으면 _MISSING)"""
+    value: Any = record
+    for key in path:
+        if not isinstance(value, dict) or key not in value:
+            return _MISSING
+        value = value[key]
+    return value
+
+
+def _set(record: dict, path: Path, value: Any) -> dict:
+    result = dict(record)
+    key = path[0]
+    if len(path) == 1:
+        if value is _MISSING:
+            result.pop(key, None)
+        else:
+            result[key] = value
+        return result
+    child = result.get(key)
+    result[key] = _set(child if isinstance(child, dict) else {}, path[1:], value)
+    return result
+
+
+def make_delta(record: dict, paths: List[Path]) -> Dict[str, list]:
+    """바뀐 경로의 새 값 (변경 기록 파일 전달용, 경로는 키 목록)"""
+    delta: Dict[str, list] = {"set": [], "unset": []}
+    for path in paths:
+        value = get_value(record, path)
+        if value is _MISSING:
+            delta["unset"].append(list(path))
+        else:
+            delta["set"].append([list(path), value])
+    return delta
+
+
+def apply_delta(record: dict, delta: Dict[str, list]) -> dict:
+    """make_delta 결과를 레코드에 적용한 새 레코드"""
+    for path, value in delta.get("set", []):
+        record = _set(record, tuple(path), value)
+    for path in delta.get("unset", []):
+        record = _set(record, tuple(path), _MISSING)
+    return record
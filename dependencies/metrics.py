@@ -0,0 +1,244 @@
+"""
+Prometheus 텍스트 형식 메트릭
+
+외부 라이브러리 없이 카운터/게이지/히스토그램을 프로세스 메모리에 기록하고 /metrics 요청 시 문자열로 만든다.
+기록 비용은 사전 조회와 정수 덧셈 정도이므로 항상 켜 두어도 된다.
+저장소 레코드 수처럼 요청 시점에 계산하는 값은 register_collector()로 등록한다.
+여러 워커로 실행하면 각 워커가 자기 값만 보고하므로 수집 측에서 합산한다.
+"""
+import bisect
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+# 요청 처리 시간 구간 (초)
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# (메트릭 이름, 종류, 설명, [(레이블, 값)])
+MetricFamily = Tuple[str, str, str, List[Tuple[Dict[str, str], float]]]
+
+_metrics: List["Metric"] = []
+_collectors: List[Callable[[], Iterable[MetricFamily]]] = []
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+class Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        # 스레드 풀에서 실행되는 핸들러도 기록하므로 잠금 사용 (경합이 거의 없어 비용이 작음)
+        self._lock = threading.Lock()
+        _metrics.append(self)
+
+    def _labels(self, labelvalues: tuple) -> Dict[str, str]:
+        return dict(zip(self.labelnames, labelvalues))
+
+    def samples(self) -> List[Tuple[str, Dict[str, str], float]]:
+        raise NotImplementedError
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help, labelnames)
+        self._values: Dict[tuple, float] = {}
+
+    def inc(self, *labelvalues, amount: float = 1):
+        with self._lock:
+            self._values[labelvalues] = self._values.get(labelvalues, 0) + amount
+
+    def get(self, *labelvalues) -> float:
+        return self._values.get(labelvalues, 0)
+
+    def samples(self):
+        return [(self.name, self._labels(key), value) for key, value in list(self._values.items())]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, *labelvalues, amount: float = 1):
+        self.inc(*labelvalues, amount=-amount)
+
+    def set(self, value: float, *labelvalues):
+        with self._lock:
+            self._values[labelvalues] = value
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # 레이블 -> [구간별 개수(누적 아님)..., +Inf 개수, 합계]
+        self._values: Dict[tuple, list] = {}
+
+    def observe(self, value: float, *labelvalues):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(labelvalues)
+            if state is None:
+                state = self._values[labelvalues] = [0] * (len(self.buckets) + 1) + [0.0]
+            state[index] += 1
+            state[-1] += value
+
+    def samples(self):
+        result = []
+        for key, state in list(self._values.items()):
+            labels = self._labels(key)
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), state[:-1]):
+                cumulative += count
+                result.append((f"{self.name}_bucket", {**labels, "le": _format_value(float(bound))}, cumulative))
+            result.append((f"{self.name}_count", labels, cumulative))
+            result.append((f"{self.name}_sum", labels, state[-1]))
+        return result
+
+
+class Timer:
+    """with 블록 실행 시간을 히스토그램에 기록"""
+
+    def __init__(self, histogram: Histogram, *labelvalues):
+        self.histogram = histogram
+        self.labelvalues = labelvalues
+        self.elapsed = 0.0
+
+    def __enter__(self):
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.elapsed = time.perf_counter() - self._started
+        self.histogram.observe(self.elapsed, *self.labelvalues)
+
+
+def register_collector(collector: Callable[[], Iterable[MetricFamily]]):
+    """/metrics 요청 시 호출하여 (이름, 종류, 설명, [(레이블, 값)]) 목록을 받는 함수 등록"""
+    _collectors.append(collector)
+
+
+def render() -> str:
+    """Prometheus 텍스트 형식(0.0.4) 출력"""
+    lines = []
+    for metric in _metrics:
+        samples = metric.samples()
+        if not samples:
+            continue
+        lines.append(f"# HELP {metric.name} {metric.help}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        lines.extend(f"{name}{_format_labels(labels)} {_format_value(value)}" for name, labels, value in samples)
+
+    for collector in _collectors:
+        try:
+            families = list(collector())
+        except Exception as e:
+            # 수집 함수 하나의 오류로 전체 메트릭이 빠지지 않도록 함
+            lines.append(f"# collector error: {_escape(e)}")
+            continue
+        for name, kind, help, samples in families:
+            if not samples:
+                continue
+            lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} {kind}")
+            lines.extend(f"{name}{_format_labels(labels)} {_format_value(value)}" for labels, value in samples)
+    return "\n".join(lines) + "\n"
+
+
+# HTTP 요청 메트릭
+http_requests_total = Counter("http_requests_total", "처리한 HTTP 요청 수", ("method", "route", "status"))
+http_request_duration_seconds = Histogram("http_request_duration_seconds", "HTTP 요청 처리 시간", ("method", "route"))
+http_requests_in_flight = Gauge("http_requests_in_flight", "처리 중인 HTTP 요청 수")
+http_requests_in_flight.set(0)
+
+# 저장소 저장(flush) 메트릭
+store_flush_duration_seconds = Histogram("store_flush_duration_seconds", "저장소 영구 저장 시간", ("store",))
+store_flush_bytes_total = Counter("store_flush_bytes_total", "저장소 영구 저장 시 쓴 바이트 수", ("store",))
+
+# 캐시 적중 메트릭 (cache_hit_ratio는 아래 수집 함수에서 계산)
+cache_requests_total = Counter("cache_requests_total", "캐시 조회 수", ("cache", "result"))
+
+
+def record_cache(cache: str, hit: bool):
+    cache_requests_total.inc(cache, "hit" if hit else "miss")
+
+
+def _collect_cache_ratios():
+    totals: Dict[str, List[float]] = {}
+    for (cache, result), value in list(cache_requests_total._values.items()):
+        totals.setdefault(cache, [0, 0])[0 if result == "hit" else 1] += value
+    yield (
+        "cache_hit_ratio", "gauge", "캐시 적중률 (프로세스 시작 이후)",
+        [({"cache": cache}, hits / (hits + misses)) for cache, (hits, misses) in totals.items() if hits + misses]
+    )
+
+
+register_collector(_collect_cache_ratios)
+
+
+def route_label(scope: dict) -> str:
+    """경로 변수 대신 라우트 템플릿(/api/maps/{id})을 레이블로 사용하여 레이블 종류 수를 제한"""
+    route = scope.get("route")
+    template = getattr(route, "path_format", None) or getattr(route, "path", None)
+    if not template:
+        return "<unmatched>"
+    # include_router 접두사(/api)는 라우트 템플릿에 포함되지 않으므로 실제 경로에서 찾아 붙임
+    try:
+        concrete = template.format(**scope.get("path_params", {}))
+    except (KeyError, IndexError, ValueError):
+        return template
+    path = scope.get("path", "")
+    if concrete and path.endswith(concrete):
+        return path[:len(path) - len(concrete)] + template
+    return template
+
+
+class MetricsMiddleware:
+    """요청 수/상태 코드/처리 시간/처리 중 요청 수를 기록하는 ASGI 미들웨어"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        started = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        http_requests_in_flight.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            http_requests_in_flight.dec()
+            route = route_label(scope)
+            http_requests_total.inc(scope["method"], route, str(status_code))
+            http_request_duration_seconds.observe(time.perf_counter() - started, scope["method"], route)
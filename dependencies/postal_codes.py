@@ -0,0 +1,298 @@
+"""
+우편번호/주소 DB (정렬된 바이너리 파일 + mmap)
+
+빌드 시 주소 레코드를 우편번호 순으로 정렬하여 한 파일에 저장하고, 시작 시에는 파일을 mmap으로 열기만 한다.
+조회할 때 필요한 레코드만 읽어 해석하므로 전체 데이터를 파이썬 객체로 만들지 않는다.
+
+파일 구성 (리틀 엔디언)
+- 헤더: HEADER 참고
+- 레코드 위치 표: u32 * (레코드 수 + 1), 레코드 데이터 영역 기준 위치
+- 레코드 데이터: "우편번호\\t도로명주소\\t지번주소\\t영문주소\\t건물명\\t위도\\t경도" UTF-8
+- 우편번호 앞 3자리 색인: u32 * 1001, 앞 3자리가 p 이상인 첫 레코드 번호
+- 토큰 표: (토큰 위치, 토큰 길이, 레코드 번호) u32 * 3, 토큰 바이트 순 정렬
+- 토큰 데이터: 중복 없는 토큰 UTF-8 바이트
+
+우편번호 조회는 앞 3자리 색인으로 범위를 정한 뒤 이진 탐색하고, 주소 자동완성은 토큰 표에서
+입력 단어로 시작하는 토큰 범위를 이진 탐색한다 (UTF-8은 바이트 순서가 문자 순서와 같아 접두사 비교가 그대로 성립).
+"""
+import bisect
+import mmap
+import os
+import re
+import struct
+import threading
+import unicodedata
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from dependencies.logger import get_logger
+
+APP_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 환경변수에서 설정값 가져오기
+POSTAL_DB_PATH = os.getenv("POSTAL_DB_PATH", "postal_codes.bin")
+# POSTAL_DB_PATH 파일이 없을 때 빌드할 원본 (기본: 저장소에 포함된 샘플)
+POSTAL_DB_SOURCE = os.getenv("POSTAL_DB_SOURCE", os.path.join(APP_ROOT, "data", "postal_codes_sample.tsv"))
+
+MAGIC = b"DYPOST01"
+# 매직, 레코드 수, 토큰 수, 레코드 위치 표/레코드 데이터/우편번호 색인/토큰 표/토큰 데이터 시작 위치
+HEADER = struct.Struct("<8sIIQQQQQ")
+TOKEN_ENTRY = struct.Struct("<III")
+PREFIX_SLOTS = 1000
+# 자동완성 한 번에 확인할 최대 토큰 항목 수
+MAX_SCAN = 5000
+
+FIELDS = ("postalCode", "roadAddress", "jibunAddress", "englishAddress", "buildingName", "latitude", "longitude")
+
+_TOKEN_SPLIT = re.compile(r"[\s,()\[\]·/]+")
+_NUMBER_TOKEN = re.compile(r"^[\d\-]+$")
+
+logger = get_logger(__name__)
+
+
+def normalize(text: str) -> str:
+    return unicodedata.normalize("NFC", text).strip().lower()
+
+
+def tokenize(record: Dict[str, str]) -> List[str]:
+    """자동완성 색인 단어 (번지/건물 번호 같은 숫자만 있는 단어는 우편번호 조회로 대체하므로 제외)"""
+    text = " ".join(record.get(field) or "" for field in ("roadAddress", "jibunAddress", "englishAddress", "buildingName"))
+    tokens = {t for t in _TOKEN_SPLIT.split(normalize(text)) if t and not _NUMBER_TOKEN.match(t)}
+    return sorted(tokens)
+
+
+def build_database(records: Iterable[Dict[str, str]], output: str) -> int:
+    """주소 레코드로 DB 파일 생성 (임시 파일에 쓴 뒤 교체), 레코드 수 반환"""
+    rows = []
+    for record in records:
+        code = (record.get("postalCode") or "").strip()
+        if not re.fullmatch(r"\d{5}", code):
+            continue
+        rows.append({field: str(record.get(field) or "").replace("\t", " ").replace("\n", " ").strip() for field in FIELDS})
+    rows.sort(key=lambda r: (r["postalCode"], r["roadAddress"]))
+
+    record_data = bytearray()
+    record_offsets = [0]
+    prefix_table = [0] * (PREFIX_SLOTS + 1)
+    token_ids: Dict[bytes, int] = {}
+    token_data = bytearray()
+    token_entries: List[Tuple[bytes, int]] = []
+
+    slot = 0
+    for index, row in enumerate(rows):
+        prefix = int(row["postalCode"][:3])
+        while slot <= prefix:
+            prefix_table[slot] = index
+            slot += 1
+        record_data += "\t".join(row[field] for field in FIELDS).encode("utf-8")
+        record_offsets.append(len(record_data))
+        for token in tokenize(row):
+            token_entries.append((token.encode("utf-8"), index))
+    while slot <= PREFIX_SLOTS:
+        prefix_table[slot] = len(rows)
+        slot += 1
+
+    token_entries.sort()
+    token_table = bytearray()
+    for token, index in token_entries:
+        if token not in token_ids:
+            token_ids[token] = len(token_data)
+            token_data += token
+        token_table += TOKEN_ENTRY.pack(token_ids[token], len(token), index)
+
+    offsets_pos = HEADER.size
+    data_pos = offsets_pos + 4 * len(record_offsets)
+    prefix_pos = data_pos + len(record_data)
+    token_table_pos = prefix_pos + 4 * len(prefix_table)
+    token_data_pos = token_table_pos + len(token_table)
+
+    temp_file = f"{output}.{os.getpid()}.tmp"
+    with open(temp_file, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, len(rows), len(token_entries), offsets_pos, data_pos, prefix_pos, token_table_pos, token_data_pos))
+        f.write(struct.pack(f"<{len(record_offsets)}I", *record_offsets))
+        f.write(record_data)
+        f.write(struct.pack(f"<{len(prefix_table)}I", *prefix_table))
+        f.write(token_table)
+        f.write(token_data)
+    os.replace(temp_file, output)
+    return len(rows)
+
+
+def read_source(path: str) -> Iterable[Dict[str, str]]:
+    """
+    원본 주소 파일 읽기
+
+    - 헤더가 FIELDS 이름인 탭 구분 파일 (저장소 샘플 형식)
+    - 우체국 도로명주소 우편번호 DB ('|' 구분, 첫 줄에 우편번호/시도/시군구/도로명 ... 헤더)
+    """
+    with open(path, 'r', encoding='utf-8-sig') as f:
+        header_line = f.readline().rstrip("\r\n")
+        delimiter = "|" if "|" in header_line else "\t"
+        header = header_line.split(delimiter)
+        for line in f:
+            values = line.rstrip("\r\n").split(delimiter)
+            if len(values) < len(header):
+                continue
+            row = dict(zip(header, values))
+            yield _from_epost(row) if "우편번호" in row else row
+
+
+def _from_epost(row: Dict[str, str]) -> Dict[str, str]:
+    def number(main: str, sub: str) -> str:
+        return f"{main}-{sub}" if sub and sub != "0" else main
+
+    def join(*parts: str) -> str:
+        return " ".join(p for p in parts if p)
+
+    building_number = number(row.get("건물번호본번", ""), row.get("건물번호부번", ""))
+    lot_number = number(row.get("지번본번", ""), row.get("지번부번", ""))
+    if row.get("산여부") == "1":
+        lot_number = f"산{lot_number}"
+    return {
+        "postalCode": row.get("우편번호", ""),
+        "roadAddress": join(row.get("시도"), row.get("시군구"), row.get("읍면"), row.get("도로명"), building_number),
+        "jibunAddress": join(row.get("시도"), row.get("시군구"), row.get("읍면") or row.get("법정동명"), row.get("리명"), lot_number),
+        "englishAddress": ", ".join(p for p in (
+            join(building_number, row.get("도로명영문")), row.get("읍면영문"), row.get("시군구영문"), row.get("시도영문")
+        ) if p),
+        "buildingName": row.get("시군구용건물명") or row.get("다량배달처명") or "",
+    }
+
+
+class _Keys:
+    """이진 탐색용 지연 시퀀스 (i번째 항목의 비교 키만 읽음)"""
+
+    def __init__(self, length: int, key_at):
+        self.length = length
+        self.key_at = key_at
+
+    def __len__(self):
+        return self.length
+
+    def __getitem__(self, index: int) -> bytes:
+        return self.key_at(index)
+
+
+class PostalCodeDatabase:
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, self.record_count, self.token_count, self._offsets_pos, self._data_pos,
+         self._prefix_pos, self._token_table_pos, self._token_data_pos) = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            raise ValueError(f"우편번호 DB 형식이 아닙니다: {path}")
+
+    def close(self):
+        self._mm.close()
+
+    # 레코드
+    def _record_bounds(self, index: int) -> Tuple[int, int]:
+        start, end = struct.unpack_from("<II", self._mm, self._offsets_pos + 4 * index)
+        return self._data_pos + start, self._data_pos + end
+
+    def _postal_code_at(self, index: int) -> bytes:
+        start, _ = self._record_bounds(index)
+        return self._mm[start:start + 5]
+
+    def record(self, index: int) -> dict:
+        start, end = self._record_bounds(index)
+        values = self._mm[start:end].decode("utf-8").split("\t")
+        record = dict(zip(FIELDS, values))
+        for field in ("latitude", "longitude"):
+            record[field] = float(record[field]) if record.get(field) else None
+        return record
+
+    def _record_text(self, index: int) -> str:
+        start, end = self._record_bounds(index)
+        return normalize(self._mm[start:end].decode("utf-8"))
+
+    # 우편번호 조회
+    def _postal_range(self, prefix: str) -> Tuple[int, int]:
+        """prefix로 시작하는 우편번호 레코드 번호 범위 [start, end)"""
+        slot_low = int(prefix[:3].ljust(3, "0")) if prefix else 0
+        slot_high = int(prefix[:3].ljust(3, "9")) + 1 if prefix else PREFIX_SLOTS
+        low = struct.unpack_from("<I", self._mm, self._prefix_pos + 4 * slot_low)[0]
+        high = struct.unpack_from("<I", self._mm, self._prefix_pos + 4 * slot_high)[0]
+        if len(prefix) <= 3:
+            return low, high
+        keys = _Keys(self.record_count, lambda i: self._postal_code_at(i)[:len(prefix)])
+        target = prefix.encode()
+        return bisect.bisect_left(keys, target, low, high), bisect.bisect_right(keys, target, low, high)
+
+    def find_by_postal_code(self, postal_code: str, limit: int = 20) -> List[dict]:
+        """우편번호(또는 앞자리)로 시작하는 레코드"""
+        postal_code = postal_code.strip()
+        if not postal_code.isdigit() or len(postal_code) > 5:
+            return []
+        start, end = self._postal_range(postal_code)
+        return [self.record(i) for i in range(start, min(end, start + limit))]
+
+    # 주소 자동완성
+    def _token_at(self, index: int) -> bytes:
+        offset, length, _ = TOKEN_ENTRY.unpack_from(self._mm, self._token_table_pos + TOKEN_ENTRY.size * index)
+        start = self._token_data_pos + offset
+        return self._mm[start:start + length]
+
+    def _token_range(self, prefix: bytes) -> Tuple[int, int]:
+        keys = _Keys(self.token_count, self._token_at)
+        # UTF-8 바이트에는 0xFF가 없으므로 prefix + 0xFF는 prefix로 시작하는 모든 토큰보다 큼
+        return bisect.bisect_left(keys, prefix), bisect.bisect_left(keys, prefix + b"\xff")
+
+    def search(self, query: str, limit: int = 10) -> List[dict]:
+        """
+        주소 자동완성
+
+        입력 단어로 시작하는 토큰이 있는 레코드를 후보로 하여(일치 범위가 좁은 단어부터),
+        모든 단어가 레코드 문자열에 포함되는지 확인한다 ("용인 골프" -> 용인* 레코드 중 "골프" 포함).
+        """
+        words = [w for w in _TOKEN_SPLIT.split(normalize(query)) if w]
+        if not words:
+            return []
+        if all(_NUMBER_TOKEN.match(w) for w in words):
+            return self.find_by_postal_code(words[0], limit) if len(words) == 1 else []
+
+        text_words = [w for w in words if not _NUMBER_TOKEN.match(w)]
+        ranges = [self._token_range(w.encode("utf-8")) for w in text_words]
+        ranges = sorted((r for r in ranges if r[1] > r[0]), key=lambda r: r[1] - r[0])
+
+        results, seen = [], set()
+        scanned = 0
+        for start, end in ranges:
+            for i in range(start, end):
+                # "경기도"처럼 넓은 단어만 입력한 경우 전체 범위를 훑지 않도록 제한
+                scanned += 1
+                if scanned > MAX_SCAN:
+                    return results
+                index = TOKEN_ENTRY.unpack_from(self._mm, self._token_table_pos + TOKEN_ENTRY.size * i)[2]
+                if index in seen:
+                    continue
+                seen.add(index)
+                if len(words) > 1:
+                    text = self._record_text(index)
+                    if not all(w in text for w in words):
+                        continue
+                results.append(self.record(index))
+                if len(results) >= limit:
+                    return results
+        return results
+
+
+_db: Optional[PostalCodeDatabase] = None
+_db_lock = threading.Lock()
+
+
+def get_postal_db() -> Optional[PostalCodeDatabase]:
+    """DB 파일을 열어 반환 (없으면 POSTAL_DB_SOURCE로 빌드, 원본도 없으면 None)"""
+    global _db
+    if _db is not None:
+        return _db
+    with _db_lock:
+        if _db is None:
+            if not os.path.exists(POSTAL_DB_PATH):
+                if not os.path.exists(POSTAL_DB_SOURCE):
+                    logger.warning("우편번호 DB 파일과 원본이 없습니다", extra={"fields": {"path": POSTAL_DB_PATH, "source": POSTAL_DB_SOURCE}})
+                    return None
+                count = build_database(read_source(POSTAL_DB_SOURCE), POSTAL_DB_PATH)
+                logger.info("우편번호 DB 생성", extra={"fields": {"path": POSTAL_DB_PATH, "source": POSTAL_DB_SOURCE, "records": count}})
+            _db = PostalCodeDatabase(POSTAL_DB_PATH)
+    return _db
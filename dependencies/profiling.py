@@ -0,0 +1,181 @@
+"""
+요청 단위 CPU 프로파일링 (선택 사용)
+
+PROFILE_TOKEN을 설정하고 요청에 X-Profile-Token 헤더를 같은 값으로 보내거나,
+PROFILE_SAMPLE_RATE(0~1) 비율로 무작위 선택된 요청을 프로파일링한다.
+
+프로파일링 중에는 별도 스레드가 PROFILE_INTERVAL_MS 간격으로 sys._current_frames()에서
+요청을 처리하는 이벤트 루프 스레드와 앱 코드를 실행 중인 스레드 풀 스레드의 스택을 수집하고,
+요청이 끝나면 PROFILE_DIR에 flamegraph.pl / speedscope에서 바로 열 수 있는 folded stack 파일로 저장한다.
+(저장소 조회, 의존성, JSON 인코딩 시간이 모두 포함됨)
+
+비활성 상태에서는 헤더 조회와 난수 비교만 하며, 프로세스당 한 번에 하나의 요청만 프로파일링한다.
+같은 워커에서 동시에 처리된 다른 요청의 스택이 섞일 수 있으므로 부하가 낮을 때 사용하는 것이 좋다.
+"""
+import hmac
+import os
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Dict
+
+from dependencies.logger import get_logger
+
+PROFILE_TOKEN = os.getenv("PROFILE_TOKEN", "")
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+PROFILE_DIR = os.getenv("PROFILE_DIR", "profiles")
+PROFILE_INTERVAL_MS = float(os.getenv("PROFILE_INTERVAL_MS", "2"))
+PROFILE_MAX_SECONDS = float(os.getenv("PROFILE_MAX_SECONDS", "30"))
+
+PROFILE_HEADER = b"x-profile-token"
+PROFILE_ID_HEADER = b"x-profile-id"
+
+APP_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_SITE_PACKAGES = ("site-packages", "dist-packages")
+
+logger = get_logger(__name__)
+
+_active = threading.Lock()
+
+
+def is_enabled() -> bool:
+    return bool(PROFILE_TOKEN) or PROFILE_SAMPLE_RATE > 0
+
+
+def _is_app_file(filename: str) -> bool:
+    return filename.startswith(APP_ROOT) and not any(part in filename for part in _SITE_PACKAGES)
+
+
+def _frame_label(code) -> str:
+    filename = code.co_filename
+    if _is_app_file(filename):
+        filename = os.path.relpath(filename, APP_ROOT)
+    else:
+        filename = os.path.basename(filename)
+    # folded stack 형식에서 ';'는 프레임 구분자, 공백 뒤 숫자는 샘플 수이므로 이름에서 제거
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})".replace(";", ":")
+
+
+class Sampler:
+    """주기적으로 스레드 스택을 수집하여 folded stack 별 샘플 수를 센다"""
+
+    def __init__(self, request_thread: int, interval: float, max_seconds: float):
+        self.request_thread = request_thread
+        self.interval = interval
+        self.max_seconds = max_seconds
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+
+    def start(self):
+        # 요청 스레드가 GIL을 오래 잡고 있으면 샘플링 간격이 기본 전환 간격(5ms)으로 늘어나므로 임시로 줄임
+        self._switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(min(self._switch_interval, self.interval / 2))
+        self.started = time.perf_counter()
+        self._thread.start()
+
+    def stop(self) -> float:
+        elapsed = time.perf_counter() - self.started
+        self._stop.set()
+        self._thread.join()
+        sys.setswitchinterval(self._switch_interval)
+        return elapsed
+
+    def _run(self):
+        own = threading.get_ident()
+        names = {}
+        deadline = self.started + self.max_seconds
+        while not self._stop.wait(self.interval) and time.perf_counter() < deadline:
+            frames = sys._current_frames()
+            if self._stop.is_set():
+                break
+            for ident, frame in frames.items():
+                if ident == own:
+                    continue
+                stack = []
+                in_app = False
+                while frame is not None:
+                    stack.append(_frame_label(frame.f_code))
+                    in_app = in_app or _is_app_file(frame.f_code.co_filename)
+                    frame = frame.f_back
+                # 요청 스레드는 대기 시간도 포함하고, 다른 스레드는 앱 코드를 실행 중일 때만 포함
+                if ident != self.request_thread and not in_app:
+                    continue
+                if ident not in names:
+                    names = {t.ident: t.name for t in threading.enumerate()}
+                stack.append(names.get(ident, str(ident)))
+                self.stacks[";".join(reversed(stack))] += 1
+            self.samples += 1
+
+    def folded(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+def _safe_name(value: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_.-]+", "_", value).strip("_")[:80] or "root"
+
+
+def profile_name(method: str, path: str) -> str:
+    return f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{method}-{_safe_name(path)}.folded"
+
+
+def write_profile(sampler: Sampler, name: str, method: str, path: str, elapsed: float):
+    """folded stack 파일 저장 (첫 줄은 요청 정보 주석)"""
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    header = (
+        f"# {method} {path} elapsedMs={elapsed * 1000:.1f} samples={sampler.samples} "
+        f"intervalMs={sampler.interval * 1000:g}\n"
+    )
+    with open(os.path.join(PROFILE_DIR, name), 'w', encoding='utf-8') as f:
+        f.write(header)
+        f.write(sampler.folded())
+
+
+def should_profile(headers: Dict[bytes, bytes]) -> bool:
+    if PROFILE_TOKEN:
+        token = headers.get(PROFILE_HEADER)
+        if token is not None and hmac.compare_digest(token, PROFILE_TOKEN.encode()):
+            return True
+    return PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE
+
+
+class ProfilingMiddleware:
+    """선택된 요청의 처리 과정을 샘플링하여 PROFILE_DIR에 저장하는 ASGI 미들웨어"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not is_enabled() or not should_profile(dict(scope["headers"])):
+            await self.app(scope, receive, send)
+            return
+        # 다른 요청을 프로파일링 중이면 그대로 처리
+        if not _active.acquire(blocking=False):
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            method, path = scope["method"], scope["path"]
+            name = profile_name(method, path)
+
+            async def send_wrapper(message):
+                if message["type"] == "http.response.start":
+                    message["headers"] = list(message.get("headers", [])) + [(PROFILE_ID_HEADER, name.encode())]
+                await send(message)
+
+            sampler = Sampler(threading.get_ident(), PROFILE_INTERVAL_MS / 1000, PROFILE_MAX_SECONDS)
+            sampler.start()
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                elapsed = sampler.stop()
+                try:
+                    write_profile(sampler, name, method, path, elapsed)
+                except OSError as e:
+                    logger.error("프로파일 저장 실패", extra={"fields": {"file": name, "error": str(e)}})
+        finally:
+            _active.release()
@@ -0,0 +1,93 @@
+"""
+목록 응답 필드 선택 (fields= 파라미터)
+
+"courseName,status,address.address1"처럼 점 표기 경로를 쉼표로 나열하면 레코드를 해당 경로만 남긴 사본으로 바꾼다.
+경로 목록마다 투영 함수를 한 번 만들어 캐시하므로 요청마다 경로를 다시 해석하지 않는다.
+
+- 상위 경로가 있으면 하위 경로는 무시 (address, address.address1 -> address 전체)
+- 없는 필드는 결과에서 빠짐, 중간 값이 목록이면 각 항목에 하위 경로를 적용
+- 키 필드(id, mapId 등)는 항상 포함
+"""
+import re
+from functools import lru_cache
+from typing import Callable, Dict, FrozenSet, Optional, Tuple
+
+from dependencies.metrics import record_cache
+
+PROJECTION_CACHE_SIZE = 256
+MAX_FIELDS = 100
+
+_PATH_PATTERN = re.compile(r"^[A-Za-z0-9_]+(\.[A-Za-z0-9_]+)*$")
+
+
+class Projection:
+    """컴파일된 필드 선택 (레코드 -> 선택한 경로만 남긴 새 dict)"""
+
+    def __init__(self, paths: Tuple[str, ...]):
+        self.paths = paths
+        tree: Dict[str, Optional[dict]] = {}
+        for path in sorted(paths, key=lambda p: p.count(".")):
+            node = tree
+            *parents, leaf = path.split(".")
+            for name in parents:
+                if node.get(name, {}) is None:
+                    break
+                node = node.setdefault(name, {})
+            else:
+                node[leaf] = None
+        self.top_level: FrozenSet[str] = frozenset(tree)
+        self._project = _compile(tree)
+
+    def __call__(self, record: dict) -> dict:
+        return self._project(record)
+
+
+def _compile(tree: Dict[str, Optional[dict]]) -> Callable[[dict], dict]:
+    leaves = tuple(name for name, child in tree.items() if child is None)
+    nested = tuple((name, _compile(child)) for name, child in tree.items() if child is not None)
+
+    def project(record: dict) -> dict:
+        result = {name: record[name] for name in leaves if name in record}
+        for name, sub in nested:
+            if name not in record:
+                continue
+            value = record[name]
+            if isinstance(value, dict):
+                result[name] = sub(value)
+            elif isinstance(value, list):
+                result[name] = [sub(item) if isinstance(item, dict) else item for item in value]
+            else:
+                result[name] = value
+        return result
+
+    return project
+
+
+@lru_cache(maxsize=PROJECTION_CACHE_SIZE)
+def _compile_fields(fields: str, key_field: str) -> Projection:
+    paths = {path.strip() for path in fields.split(",") if path.strip()}
+    if len(paths) > MAX_FIELDS:
+        raise ValueError(f"fields는 최대 {MAX_FIELDS}개까지 지정할 수 있습니다.")
+    invalid = sorted(path for path in paths if not _PATH_PATTERN.match(path))
+    if invalid:
+        raise ValueError(f"잘못된 필드 경로: {', '.join(invalid)}")
+    paths.add(key_field)
+    return Projection(tuple(sorted(paths)))
+
+
+def get_projection(fields: Optional[str], key_field: str = "id") -> Optional[Projection]:
+    """fields 파라미터의 투영 함수 (없으면 None, 잘못된 경로는 ValueError)"""
+    if not fields or not fields.strip():
+        return None
+    misses = _compile_fields.cache_info().misses
+    try:
+        return _compile_fields(fields, key_field)
+    finally:
+        record_cache("projection", _compile_fields.cache_info().misses == misses)
+
+
+def invalid_fields_error(error: ValueError) -> dict:
+    return {
+        "success": False,
+        "error": {"code": "INVALID_FIELDS", "message": str(error)}
+    }
@@ -0,0 +1,871 @@
+import bisect
+import json
+import os
+import re
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+from dependencies.change_feed import CREATED, DELETED, UPDATED, CHANGE_LOG_SIZE, ChangeEntry, ChangeLog, new_base_seq
+from dependencies.change_journal import get_journal
+from dependencies.logger import get_logger
+from dependencies.merge_patch import Path, apply_delta, make_delta
+from dependencies.metrics import Timer, register_collector, store_flush_bytes_total, store_flush_duration_seconds
+from dependencies.scheduler import register_periodic
+from dependencies.tracing import span
+
+# 환경변수에서 설정값 가져오기 (json: 기존 JSON 파일/메모리 저장, sqlite: 내장 SQLite)
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "json").lower()
+SQLITE_PATH = os.getenv("SQLITE_PATH", "backoffice.db")
+# SQLite 레코드 수/인덱스별 서로 다른 값의 수(메트릭) 재계산 주기 (초, 스크레이프마다 세지 않음)
+STORE_STATS_INTERVAL = float(os.getenv("STORE_STATS_INTERVAL", "60"))
+
+logger = get_logger(__name__)
+
+_NAME_PATTERN = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+_TOKEN_SEPARATORS = re.compile(r"[\s@._\-+/()]+")
+_PHONE_PATTERN = re.compile(r"^[\d\s\-+()]+$")
+# 접두어 토큰 상한 (검색어 범위 끝 계산용)
+_TOKEN_MAX = "\U0010ffff"
+
+# 생성된 저장소 목록 (이름 -> 저장소)
+repositories: Dict[str, "Repository"] = {}
+
+
+def get_path(record: dict, path: str) -> Any:
+    """점 표기 경로로 중첩 필드 조회 (예: mapStatus.status)"""
+    value = record
+    for key in path.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+    return value
+
+
+def prefix_tokens(value: Any) -> Set[str]:
+    """
+    접두어 인덱스 토큰 (소문자)
+
+    전체 값과 구분자(공백, @ . _ - + / 괄호)로 나눈 단어를 색인하고, 전화번호 형식이면 숫자만 모은 값도 넣는다.
+    예: "Kim.Cs@dy.com" -> kim.cs@dy.com, kim, cs, dy, com / "010-1234-5678" -> 010-1234-5678, 010, 1234, 5678, 01012345678
+    """
+    if value is None:
+        return set()
+    text = str(value).strip().lower()
+    if not text:
+        return set()
+    tokens = {text}
+    tokens.update(word for word in _TOKEN_SEPARATORS.split(text) if word)
+    if _PHONE_PATTERN.match(text):
+        tokens.add(re.sub(r"\D", "", text))
+    tokens.discard("")
+    return tokens
+
+
+def search_words(search: str) -> List[str]:
+    """접두어 검색어를 공백 기준 단어로 분리 (모든 단어가 일치해야 함)"""
+    return search.strip().lower().split()
+
+
+class Repository:
+    """
+    레코드 저장소 인터페이스
+
+    - indexes: 인덱스 이름 -> 필드 경로, 같음(=) 필터는 인덱스 이름으로만 지정
+    - search_fields: 대소문자 구분 없는 부분 일치 검색 대상 필드 경로
+    - prefix_fields: 접두어 인덱스 대상 필드 경로, 지정하면 search는 전체 순회 대신 이 인덱스로
+      검색어의 각 단어가 어느 필드 토큰(prefix_tokens)의 앞부분과 일치하는 레코드를 찾는다
+    - sort_fields: 정렬 허용 필드 경로
+    """
+
+    def __init__(
+        self,
+        name: str,
+        key_field: str = "id",
+        indexes: Optional[Dict[str, str]] = None,
+        search_fields: Sequence[str] = (),
+        sort_fields: Sequence[str] = (),
+        prefix_fields: Sequence[str] = (),
+        label: Optional[str] = None,
+    ):
+        if not _NAME_PATTERN.match(name) or not all(_NAME_PATTERN.match(i) for i in (indexes or {})):
+            raise ValueError(f"잘못된 저장소/인덱스 이름: {name}")
+        self.name = name
+        self.key_field = key_field
+        self.indexes = dict(indexes or {})
+        self.search_fields = tuple(search_fields)
+        self.sort_fields = tuple(sort_fields)
+        self.prefix_fields = tuple(prefix_fields)
+        self.label = label or name
+
+    def key_of(self, record: dict) -> str:
+        return record[self.key_field]
+
+    def tokens_of(self, record: dict) -> Set[str]:
+        """접두어 인덱스에 넣을 레코드 토큰"""
+        tokens = set()
+        for field in self.prefix_fields:
+            tokens |= prefix_tokens(get_path(record, field))
+        return tokens
+
+    # 조회
+    def get(self, key: str) -> Optional[dict]:
+        raise NotImplementedError
+
+    def count(self, filters: Optional[Dict[str, Any]] = None) -> int:
+        raise NotImplementedError
+
+    def find_keys(self, index: str, value: Any) -> List[str]:
+        """인덱스 값이 일치하는 레코드 키 목록"""
+        raise NotImplementedError
+
+    def query(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        search: Optional[str] = None,
+        sort_by: Optional[str] = None,
+        sort_order: str = "asc",
+        offset: int = 0,
+        limit: Optional[int] = None,
+    ) -> Tuple[List[dict], int]:
+        """필터/검색/정렬/페이지네이션 후 (항목, 전체 개수) 반환"""
+        raise NotImplementedError
+
+    def iter_all(self, batch_size: int = 500) -> Iterator[dict]:
+        """전체 레코드를 저장 순서대로 순회 (대량 내보내기용)"""
+        raise NotImplementedError
+
+    def changes(self, since: int, limit: int) -> Tuple[int, List[ChangeEntry], bool]:
+        """since 이후 변경 기록 (번호, 종류, 키) 최대 limit개 -> (현재 번호, 기록, 재동기화 필요 여부)"""
+        raise NotImplementedError
+
+    # 변경
+    def insert(self, record: dict):
+        self.upsert_many([record])
+
+    def update(self, record: dict):
+        self.upsert_many([record])
+
+    def upsert_many(self, records: Iterable[dict]):
+        """여러 레코드를 추가/교체하고 한 번만 저장"""
+        raise NotImplementedError
+
+    def patch(self, record: dict, paths: List[Path]) -> dict:
+        """
+        바뀐 경로를 아는 수정 (merge_patch.diff_paths 결과)
+
+        저장 직전의 최신 레코드에 해당 경로만 반영하여 저장한 레코드를 반환한다.
+        경로가 없으면 저장하지 않는다. 변경 피드에는 경로를 함께 기록한다.
+        """
+        raise NotImplementedError
+
+    def delete(self, key: str) -> Optional[dict]:
+        raise NotImplementedError
+
+    def delete_many(self, keys: Iterable[str]) -> int:
+        raise NotImplementedError
+
+    def record_count(self) -> int:
+        """레코드 수 (메트릭용)"""
+        return self.count()
+
+    def index_sizes(self) -> Dict[str, int]:
+        """인덱스별 서로 다른 값의 수 (메트릭용)"""
+        return {}
+
+    def _check_sort(self, sort_by: Optional[str]) -> Optional[str]:
+        return sort_by if sort_by in self.sort_fields else None
+
+
+class JsonRepository(Repository):
+    """
+    메모리 저장소 (기존 동작)
+
+    data_file이 있으면 변경 시마다 전체 목록을 JSON 파일로 저장하고, 없으면 프로세스 메모리에만 유지한다.
+    인덱스 필드는 값 -> 키 집합 사전으로 관리하여 같음 필터를 전체 순회 없이 처리한다.
+    접두어 인덱스는 토큰 -> 키 집합 사전과 정렬된 토큰 목록(이진 탐색으로 접두어 범위 조회)으로 관리한다.
+    변경 피드 번호는 변경 기록 파일 항목에 함께 적어 다른 워커도 같은 번호로 기록한다.
+    여러 워커로 실행하면(STORE_JOURNAL) 변경을 공용 기록 파일로 주고받아 워커 간 상태를 맞춘다.
+    """
+
+    def __init__(self, name: str, data_file: Optional[str] = None, initial: Optional[List[dict]] = None, **options):
+        super().__init__(name, **options)
+        self.data_file = data_file
+        self._records: Dict[str, dict] = {}
+        self._order: Dict[str, int] = {}
+        self._next_order = 0
+        self._index_maps: Dict[str, Dict[Any, set]] = {index: {} for index in self.indexes}
+        self._indexed_values: Dict[str, Dict[str, Any]] = {}
+        self._prefix_keys: Dict[str, set] = {}
+        self._record_tokens: Dict[str, Set[str]] = {}
+        # 정렬된 토큰 목록 (대량 반영 중에는 None으로 두고 끝난 뒤 한 번에 정렬)
+        self._sorted_tokens: Optional[List[str]] = []
+        self.journal = get_journal()
+        if self.journal:
+            with self.journal.exclusive():
+                self.journal.start()
+                self.change_log = ChangeLog(self.journal.base_seq)
+                self.load(initial or [])
+                self.journal.attach(self)
+        else:
+            self.change_log = ChangeLog(new_base_seq())
+            self.load(initial or [])
+
+    def load(self, initial: List[dict]):
+        """파일에서 데이터 로드 (파일이 없거나 읽기 실패 시 초기 데이터 사용)"""
+        records = None
+        if self.data_file and os.path.exists(self.data_file):
+            try:
+                with span("store.load", store=self.name), open(self.data_file, 'r', encoding='utf-8') as f:
+                    records = json.load(f)
+            except (json.JSONDecodeError, IOError):
+                logger.warning("데이터 파일 읽기 실패, 초기 데이터로 복원", extra={"fields": {"store": self.name, "file": self.data_file}})
+
+        self._reset(records if records is not None else [dict(r) for r in initial])
+        if records is None and self.data_file:
+            self.save()
+
+    def _reset(self, records: Iterable[dict]):
+        self._records.clear()
+        self._order.clear()
+        self._indexed_values.clear()
+        for index_map in self._index_maps.values():
+            index_map.clear()
+        self._prefix_keys.clear()
+        self._record_tokens.clear()
+        self._sorted_tokens = None
+        try:
+            for record in records:
+                self._put(record)
+        finally:
+            self._sorted_tokens = sorted(self._prefix_keys)
+
+    def _record_upserts(self, records: List[dict], first_seq: Optional[int] = None) -> int:
+        """반영 전에 호출하여 생성/수정을 구분해 변경 피드에 기록"""
+        return self.change_log.record(
+            [(UPDATED if self.key_of(record) in self._records else CREATED, self.key_of(record)) for record in records],
+            first_seq
+        )
+
+    def _put_many(self, records: List[dict]):
+        if len(records) <= 100:
+            for record in records:
+                self._put(record)
+            return
+        self._sorted_tokens = None
+        try:
+            for record in records:
+                self._put(record)
+        finally:
+            self._sorted_tokens = sorted(self._prefix_keys)
+
+    def save(self):
+        """전체 목록을 파일에 저장 (다른 워커가 쓰는 중인 파일을 읽지 않도록 임시 파일 후 교체)"""
+        if not self.data_file:
+            return
+        temp_file = f"{self.data_file}.{os.getpid()}.tmp"
+        try:
+            with span("store.save", store=self.name) as fields, Timer(store_flush_duration_seconds, self.name) as timer:
+                with open(temp_file, 'w', encoding='utf-8') as f:
+                    json.dump(list(self._records.values()), f, ensure_ascii=False, indent=2)
+                    fields["bytes"] = f.tell()
+                os.replace(temp_file, self.data_file)
+            store_flush_bytes_total.inc(self.name, amount=fields["bytes"])
+            logger.debug(f"{self.label} 데이터 저장", extra={"fields": {
+                "store": self.name, "file": self.data_file, "records": len(self._records),
+                "bytes": fields["bytes"], "durationMs": round(timer.elapsed * 1000, 2),
+            }})
+        except IOError as e:
+            logger.error("데이터 저장 실패", extra={"fields": {"store": self.name, "file": self.data_file, "error": str(e)}})
+
+    # 워커 간 동기화
+    def _sync(self):
+        """다른 워커의 변경 반영 (기록 파일이 그대로면 stat 호출만 함)"""
+        if self.journal:
+            self.journal.sync()
+
+    @contextmanager
+    def _write(self):
+        """변경 구간: 워커 간 잠금을 잡고 최신 상태를 반영한 뒤 변경"""
+        if not self.journal:
+            yield
+            return
+        with self.journal.exclusive():
+            self.journal.sync()
+            yield
+
+    def _publish(self, op: str, **payload):
+        if self.journal:
+            self.journal.append(self.name, op, **payload)
+
+    def _apply_change(self, entry: dict):
+        """다른 워커가 기록한 변경 적용 (데이터 파일은 기록한 워커가 이미 저장함)"""
+        if entry["op"] == "upsert":
+            self._record_upserts(entry["records"], entry.get("seq"))
+            self._put_many(entry["records"])
+        elif entry["op"] == "patch":
+            delta = entry["delta"]
+            paths = tuple(tuple(path) for path, _ in delta["set"]) + tuple(tuple(path) for path in delta["unset"])
+            self.change_log.record([(UPDATED, entry["key"])], entry.get("seq"), paths=paths)
+            current = self._records.get(entry["key"])
+            if current is not None:
+                self._put(apply_delta(current, delta))
+        elif entry["op"] == "delete":
+            self.change_log.record([(DELETED, key) for key in entry["keys"]], entry.get("seq"))
+            for key in entry["keys"]:
+                self._remove(key)
+        elif entry["op"] == "snapshot":
+            self._reset(entry["records"])
+            # 이미 같은 번호까지 반영한 워커는 기록을 유지
+            if entry.get("seq", 0) != self.change_log.seq:
+                self.change_log.reset(entry.get("seq", 0))
+
+    def _snapshot(self) -> List[dict]:
+        return list(self._records.values())
+
+    def index_sizes(self) -> Dict[str, int]:
+        """인덱스별 서로 다른 값의 수"""
+        sizes = {index: len(index_map) for index, index_map in self._index_maps.items()}
+        if self.prefix_fields:
+            sizes["prefix"] = len(self._prefix_keys)
+        return sizes
+
+    def _index_value(self, record: dict, index: str):
+        value = get_path(record, self.indexes[index])
+        return value if isinstance(value, (str, int, float, bool, type(None))) else json.dumps(value)
+
+    def _put(self, record: dict):
+        key = self.key_of(record)
+        if key in self._records:
+            self._unindex(key)
+        else:
+            self._order[key] = self._next_order
+            self._next_order += 1
+        self._records[key] = record
+        # 색인 당시 값을 보관하여, 레코드를 제자리에서 수정한 뒤 update해도 이전 값을 정확히 제거
+        values = {index: self._index_value(record, index) for index in self._index_maps}
+        self._indexed_values[key] = values
+        for index, value in values.items():
+            self._index_maps[index].setdefault(value, set()).add(key)
+        if self.prefix_fields:
+            tokens = self.tokens_of(record)
+            self._record_tokens[key] = tokens
+            for token in tokens:
+                keys = self._prefix_keys.get(token)
+                if keys is None:
+                    self._prefix_keys[token] = keys = set()
+                    if self._sorted_tokens is not None:
+                        bisect.insort(self._sorted_tokens, token)
+                keys.add(key)
+
+    def _unindex(self, key: str):
+        for index, value in self._indexed_values.pop(key, {}).items():
+            keys = self._index_maps[index].get(value)
+            if keys:
+                keys.discard(key)
+                if not keys:
+                    self._index_maps[index].pop(value, None)
+        for token in self._record_tokens.pop(key, ()):
+            keys = self._prefix_keys.get(token)
+            if keys:
+                keys.discard(key)
+                if not keys:
+                    del self._prefix_keys[token]
+                    if self._sorted_tokens is not None:
+                        del self._sorted_tokens[bisect.bisect_left(self._sorted_tokens, token)]
+
+    def _remove(self, key: str) -> Optional[dict]:
+        record = self._records.pop(key, None)
+        if record is not None:
+            self._unindex(key)
+            self._order.pop(key, None)
+        return record
+
+    def get(self, key: str) -> Optional[dict]:
+        self._sync()
+        return self._records.get(key)
+
+    def find_keys(self, index: str, value: Any) -> List[str]:
+        self._sync()
+        return list(self._index_maps[index].get(value, ()))
+
+    def _prefix_match(self, word: str) -> set:
+        """토큰이 word로 시작하는 레코드 키"""
+        tokens = self._sorted_tokens
+        start = bisect.bisect_left(tokens, word)
+        end = bisect.bisect_left(tokens, word + _TOKEN_MAX, start)
+        if end - start == 1:
+            return self._prefix_keys[tokens[start]]
+        keys = set()
+        for token in tokens[start:end]:
+            keys |= self._prefix_keys[token]
+        return keys
+
+    def _candidates(self, filters: Optional[Dict[str, Any]], search: Optional[str] = None) -> List[dict]:
+        """인덱스 집합(같음 필터, 접두어 검색 단어별) 교집합으로 후보를 좁힌 뒤 저장 순서대로 반환"""
+        active = {k: v for k, v in (filters or {}).items() if v is not None}
+        key_sets = [self._index_maps[index].get(value, set()) for index, value in active.items()]
+        if search and self.prefix_fields:
+            key_sets.extend(self._prefix_match(word) for word in search_words(search))
+        if not key_sets:
+            return list(self._records.values())
+        key_sets.sort(key=len)
+        keys = set(key_sets[0]).intersection(*key_sets[1:]) if key_sets[0] else set()
+        return [self._records[k] for k in sorted(keys, key=self._order.__getitem__)]
+
+    def count(self, filters: Optional[Dict[str, Any]] = None) -> int:
+        self._sync()
+        if not filters:
+            return len(self._records)
+        return len(self._candidates(filters))
+
+    def query(self, filters=None, search=None, sort_by=None, sort_order="asc", offset=0, limit=None):
+        self._sync()
+        with span("search", store=self.name) as fields:
+            items = self._candidates(filters, search)
+            if search and not self.prefix_fields:
+                search_lower = search.lower()
+                items = [
+                    record for record in items
+                    if any(search_lower in str(get_path(record, field) or "").lower() for field in self.search_fields)
+                ]
+            fields["matched"] = len(items)
+
+        with span("paginate", store=self.name, sortBy=sort_by, offset=offset, limit=limit):
+            sort_by = self._check_sort(sort_by)
+            if sort_by:
+                def sort_key(record):
+                    value = get_path(record, sort_by)
+                    return (value is None, "" if value is None else value)
+                items.sort(key=sort_key, reverse=sort_order == "desc")
+
+            total = len(items)
+            end = None if limit is None else offset + limit
+            return items[offset:end], total
+
+    def iter_all(self, batch_size: int = 500) -> Iterator[dict]:
+        # 참조 목록만 복사하므로 순회 중 변경이 있어도 안전
+        self._sync()
+        return iter(list(self._records.values()))
+
+    def changes(self, since: int, limit: int) -> Tuple[int, List[ChangeEntry], bool]:
+        self._sync()
+        return self.change_log.since(since, limit)
+
+    def upsert_many(self, records: Iterable[dict]):
+        records = list(records)
+        if not records:
+            return
+        with self._write():
+            first_seq = self._record_upserts(records)
+            self._put_many(records)
+            self._publish("upsert", records=records, seq=first_seq)
+            self.save()
+
+    def patch(self, record: dict, paths: List[Path]) -> dict:
+        if not paths:
+            return record
+        key = self.key_of(record)
+        delta = make_delta(record, paths)
+        with self._write():
+            # 다른 워커가 그사이 바꾼 값은 유지하고 바뀐 경로만 덮어씀
+            current = self._records.get(key)
+            if current is not None:
+                record = apply_delta(current, delta)
+            first_seq = self.change_log.record([(UPDATED, key)], paths=tuple(paths))
+            self._put(record)
+            self._publish("patch", key=key, delta=delta, seq=first_seq)
+            self.save()
+        return record
+
+    def delete(self, key: str) -> Optional[dict]:
+        with self._write():
+            record = self._remove(key)
+            if record is not None:
+                first_seq = self.change_log.record([(DELETED, key)])
+                self._publish("delete", keys=[key], seq=first_seq)
+                self.save()
+        return record
+
+    def delete_many(self, keys: Iterable[str]) -> int:
+        with self._write():
+            deleted = [key for key in list(keys) if self._remove(key) is not None]
+            if deleted:
+                first_seq = self.change_log.record([(DELETED, key) for key in deleted])
+                self._publish("delete", keys=deleted, seq=first_seq)
+                self.save()
+        return len(deleted)
+
+
+class SqliteRepository(Repository):
+    """
+    내장 SQLite 저장소
+
+    레코드 전체는 JSON 컬럼(data)에 두고, 인덱스 필드는 별도 컬럼과 인덱스로 추출하여
+    필터/정렬/페이지네이션을 쿼리로 처리한다. WAL 모드로 읽기와 쓰기가 서로 막지 않는다.
+    접두어 인덱스는 (토큰, 키) 테이블(<이름>__prefix)의 범위 조회로 처리한다.
+    변경 피드는 같은 트랜잭션에서 <이름>__changes 테이블에 기록하고 최근 CHANGE_LOG_SIZE개만 남긴다.
+    """
+
+    _connections: Dict[str, Tuple[sqlite3.Connection, threading.RLock]] = {}
+
+    def __init__(self, name: str, db_path: str = SQLITE_PATH, data_file: Optional[str] = None, initial: Optional[List[dict]] = None, **options):
+        super().__init__(name, **options)
+        self.db_path = db_path
+        self.conn, self.lock = self._connect(db_path)
+        self._index_columns = {index: f"idx_{index}" for index in self.indexes}
+        self._prefix_table = f"{name}__prefix"
+        self._changes_table = f"{name}__changes"
+        # 처음 만든 테이블만 채움 (운영 중 모두 삭제한 테이블을 재시작 때 다시 채우지 않음)
+        if self._create_table():
+            self._seed(data_file, initial or [])
+        self._record_count = 0
+        self._index_sizes: Dict[str, int] = {}
+        self.refresh_stats()
+
+    @classmethod
+    def _connect(cls, db_path: str) -> Tuple[sqlite3.Connection, threading.RLock]:
+        """DB 파일별 연결 하나를 공유 (sqlite3 모듈이 문장별 prepared statement를 캐시)"""
+        if db_path not in cls._connections:
+            conn = sqlite3.connect(db_path, check_same_thread=False, cached_statements=256, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=5000")
+            cls._connections[db_path] = (conn, threading.RLock())
+        return cls._connections[db_path]
+
+    def _create_table(self) -> bool:
+        """테이블/인덱스 생성, 테이블을 새로 만들었으면 True"""
+        columns = "".join(f", {column}" for column in self._index_columns.values())
+        with self.lock:
+            exists = self.conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (self.name,)
+            ).fetchone()
+            self.conn.execute(
+                f'CREATE TABLE IF NOT EXISTS "{self.name}" ('
+                f'seq INTEGER PRIMARY KEY AUTOINCREMENT, key TEXT NOT NULL UNIQUE, data TEXT NOT NULL{columns})'
+            )
+            existing = {row[1] for row in self.conn.execute(f'PRAGMA table_info("{self.name}")')}
+            for column in self._index_columns.values():
+                if column not in existing:
+                    self.conn.execute(f'ALTER TABLE "{self.name}" ADD COLUMN {column}')
+                self.conn.execute(f'CREATE INDEX IF NOT EXISTS "{self.name}_{column}" ON "{self.name}" ({column})')
+            if self.prefix_fields:
+                self._create_prefix_table()
+            self.conn.execute(
+                f'CREATE TABLE IF NOT EXISTS "{self._changes_table}" ('
+                f'seq INTEGER PRIMARY KEY AUTOINCREMENT, op TEXT NOT NULL, key TEXT NOT NULL, paths TEXT)'
+            )
+            if "paths" not in {row[1] for row in self.conn.execute(f'PRAGMA table_info("{self._changes_table}")')}:
+                self.conn.execute(f'ALTER TABLE "{self._changes_table}" ADD COLUMN paths TEXT')
+
+        self._upsert_sql = (
+            f'INSERT INTO "{self.name}" (key, data{columns}) VALUES (?, ?{", ?" * len(self._index_columns)}) '
+            f'ON CONFLICT(key) DO UPDATE SET data = excluded.data'
+            + "".join(f", {column} = excluded.{column}" for column in self._index_columns.values())
+        )
+        return not exists
+
+    def _create_prefix_table(self):
+        exists = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (self._prefix_table,)
+        ).fetchone()
+        self.conn.execute(
+            f'CREATE TABLE IF NOT EXISTS "{self._prefix_table}" (token TEXT NOT NULL, key TEXT NOT NULL, '
+            f'PRIMARY KEY (token, key)) WITHOUT ROWID'
+        )
+        self.conn.execute(f'CREATE INDEX IF NOT EXISTS "{self._prefix_table}_key" ON "{self._prefix_table}" (key)')
+        if not exists:
+            # 접두어 인덱스 없이 만들어진 기존 테이블이면 채움
+            self.conn.execute("BEGIN")
+            try:
+                for key, data in self.conn.execute(f'SELECT key, data FROM "{self.name}"').fetchall():
+                    self._insert_tokens(key, json.loads(data))
+                self.conn.execute("COMMIT")
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+
+    def _insert_tokens(self, key: str, record: dict):
+        self.conn.executemany(
+            f'INSERT OR IGNORE INTO "{self._prefix_table}" (token, key) VALUES (?, ?)',
+            [(token, key) for token in self.tokens_of(record)]
+        )
+
+    def _delete_tokens(self, key: str):
+        self.conn.execute(f'DELETE FROM "{self._prefix_table}" WHERE key = ?', (key,))
+
+    def _record_changes(self, changes: List[Tuple[str, str]], paths: Optional[List[Path]] = None):
+        """변경 피드 기록 후 오래된 기록 정리 (트랜잭션 안에서 호출)"""
+        paths_json = json.dumps([list(path) for path in paths], ensure_ascii=False) if paths else None
+        self.conn.executemany(
+            f'INSERT INTO "{self._changes_table}" (op, key, paths) VALUES (?, ?, ?)',
+            [(op, key, paths_json) for op, key in changes]
+        )
+        # executemany 후 cursor.lastrowid는 None이므로 연결의 마지막 삽입 번호 사용
+        last_seq = self.conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+        if last_seq > CHANGE_LOG_SIZE:
+            self.conn.execute(f'DELETE FROM "{self._changes_table}" WHERE seq <= ?', (last_seq - CHANGE_LOG_SIZE,))
+
+    def _existing_keys(self, keys: List[str]) -> set:
+        existing = set()
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            existing.update(row[0] for row in self.conn.execute(
+                f'SELECT key FROM "{self.name}" WHERE key IN ({", ".join("?" * len(chunk))})', chunk
+            ))
+        return existing
+
+    def _seed(self, data_file: Optional[str], initial: List[dict]):
+        """새로 만든 테이블을 기존 JSON 파일(없으면 초기 데이터)로 채움"""
+        records = initial
+        if data_file and os.path.exists(data_file):
+            try:
+                with open(data_file, 'r', encoding='utf-8') as f:
+                    records = json.load(f)
+            except (json.JSONDecodeError, IOError):
+                logger.warning("데이터 파일 읽기 실패, 초기 데이터로 생성", extra={"fields": {"store": self.name, "file": data_file}})
+        # 초기 데이터는 변경 피드에 기록하지 않음 (클라이언트는 처음에 전체 목록을 받음)
+        self._upsert(records, record_changes=False)
+
+    def _row_values(self, record: dict) -> tuple:
+        values = [self.key_of(record), json.dumps(record, ensure_ascii=False)]
+        for path in self.indexes.values():
+            value = get_path(record, path)
+            values.append(value if isinstance(value, (str, int, float, type(None))) else json.dumps(value))
+        return tuple(values)
+
+    def _where(self, filters: Optional[Dict[str, Any]], search: Optional[str]) -> Tuple[str, list]:
+        clauses, params = [], []
+        for index, value in (filters or {}).items():
+            if value is None:
+                continue
+            clauses.append(f"{self._index_columns[index]} = ?")
+            params.append(value)
+        if search and self.prefix_fields:
+            for word in search_words(search):
+                clauses.append(f'key IN (SELECT key FROM "{self._prefix_table}" WHERE token >= ? AND token < ?)')
+                params.extend([word, word + _TOKEN_MAX])
+        elif search and self.search_fields:
+            clauses.append("(" + " OR ".join("instr(lower(json_extract(data, ?)), ?) > 0" for _ in self.search_fields) + ")")
+            for field in self.search_fields:
+                params.extend([f"$.{field}", search.lower()])
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def get(self, key: str) -> Optional[dict]:
+        with self.lock:
+            row = self.conn.execute(f'SELECT data FROM "{self.name}" WHERE key = ?', (key,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def count(self, filters: Optional[Dict[str, Any]] = None) -> int:
+        where, params = self._where(filters, None)
+        with self.lock:
+            return self.conn.execute(f'SELECT COUNT(*) FROM "{self.name}"{where}', params).fetchone()[0]
+
+    def find_keys(self, index: str, value: Any) -> List[str]:
+        with self.lock:
+            rows = self.conn.execute(
+                f'SELECT key FROM "{self.name}" WHERE {self._index_columns[index]} = ?', (value,)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def query(self, filters=None, search=None, sort_by=None, sort_order="asc", offset=0, limit=None):
+        where, params = self._where(filters, search)
+        sort_by = self._check_sort(sort_by)
+        direction = "DESC" if sort_order == "desc" else "ASC"
+        order = f"ORDER BY json_extract(data, ?) IS NULL, json_extract(data, ?) {direction}, seq" if sort_by else "ORDER BY seq"
+        order_params = [f"$.{sort_by}", f"$.{sort_by}"] if sort_by else []
+
+        with self.lock:
+            with span("search", store=self.name) as fields:
+                total = self.conn.execute(f'SELECT COUNT(*) FROM "{self.name}"{where}', params).fetchone()[0]
+                fields["matched"] = total
+            with span("paginate", store=self.name, sortBy=sort_by, offset=offset, limit=limit):
+                rows = self.conn.execute(
+                    f'SELECT data FROM "{self.name}"{where} {order} LIMIT ? OFFSET ?',
+                    params + order_params + [-1 if limit is None else limit, offset]
+                ).fetchall()
+        return [json.loads(row[0]) for row in rows], total
+
+    def iter_all(self, batch_size: int = 500) -> Iterator[dict]:
+        # seq 기준 키셋 페이지네이션으로 전체를 메모리에 올리지 않음
+        last_seq = 0
+        while True:
+            with self.lock:
+                rows = self.conn.execute(
+                    f'SELECT seq, data FROM "{self.name}" WHERE seq > ? ORDER BY seq LIMIT ?', (last_seq, batch_size)
+                ).fetchall()
+            if not rows:
+                return
+            for seq, data in rows:
+                last_seq = seq
+                yield json.loads(data)
+
+    def upsert_many(self, records: Iterable[dict]):
+        self._upsert(records)
+
+    def patch(self, record: dict, paths: List[Path]) -> dict:
+        if not paths:
+            return record
+        with self.lock:
+            current = self.get(self.key_of(record))
+            if current is not None:
+                record = apply_delta(current, make_delta(record, paths))
+            self._upsert([record], paths=paths)
+        return record
+
+    def _upsert(self, records: Iterable[dict], record_changes: bool = True, paths: Optional[List[Path]] = None):
+        records = list(records)
+        rows = [self._row_values(record) for record in records]
+        if not rows:
+            return
+        with self.lock, span("store.save", store=self.name, records=len(rows)), Timer(store_flush_duration_seconds, self.name):
+            self.conn.execute("BEGIN")
+            try:
+                if record_changes:
+                    existing = self._existing_keys([row[0] for row in rows])
+                    self._record_changes([(UPDATED if row[0] in existing else CREATED, row[0]) for row in rows], paths)
+                self.conn.executemany(self._upsert_sql, rows)
+                if self.prefix_fields:
+                    for row, record in zip(rows, records):
+                        self._delete_tokens(row[0])
+                        self._insert_tokens(row[0], record)
+                self.conn.execute("COMMIT")
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+        store_flush_bytes_total.inc(self.name, amount=sum(len(row[1]) for row in rows))
+
+    def record_count(self) -> int:
+        """마지막 주기 재계산 값 (COUNT(*)는 전체 테이블을 읽으므로 메트릭 수집 때마다 세지 않음)"""
+        return self._record_count
+
+    def index_sizes(self) -> Dict[str, int]:
+        """마지막 주기 재계산 값 (전체 테이블을 세므로 메트릭 수집 때마다 세지 않음)"""
+        return dict(self._index_sizes)
+
+    def refresh_stats(self):
+        """메트릭용 레코드 수와 인덱스별 서로 다른 값의 수 재계산"""
+        with self.lock:
+            record_count = self.conn.execute(f'SELECT COUNT(*) FROM "{self.name}"').fetchone()[0]
+            sizes = {
+                index: self.conn.execute(f'SELECT COUNT(DISTINCT {column}) FROM "{self.name}"').fetchone()[0]
+                for index, column in self._index_columns.items()
+            }
+            if self.prefix_fields:
+                sizes["prefix"] = self.conn.execute(f'SELECT COUNT(DISTINCT token) FROM "{self._prefix_table}"').fetchone()[0]
+        self._record_count, self._index_sizes = record_count, sizes
+
+    def delete(self, key: str) -> Optional[dict]:
+        with self.lock:
+            record = self.get(key)
+            if record is not None:
+                self.conn.execute("BEGIN")
+                try:
+                    self.conn.execute(f'DELETE FROM "{self.name}" WHERE key = ?', (key,))
+                    if self.prefix_fields:
+                        self._delete_tokens(key)
+                    self._record_changes([(DELETED, key)])
+                    self.conn.execute("COMMIT")
+                except Exception:
+                    self.conn.execute("ROLLBACK")
+                    raise
+        return record
+
+    def delete_many(self, keys: Iterable[str]) -> int:
+        keys = list(keys)
+        with self.lock:
+            self.conn.execute("BEGIN")
+            try:
+                deleted_keys = [
+                    key for key in keys
+                    if self.conn.execute(f'DELETE FROM "{self.name}" WHERE key = ?', (key,)).rowcount
+                ]
+                if self.prefix_fields:
+                    for key in deleted_keys:
+                        self._delete_tokens(key)
+                if deleted_keys:
+                    self._record_changes([(DELETED, key) for key in deleted_keys])
+                self.conn.execute("COMMIT")
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+        return len(deleted_keys)
+
+    def changes(self, since: int, limit: int) -> Tuple[int, List[ChangeEntry], bool]:
+        with self.lock:
+            row = self.conn.execute("SELECT seq FROM sqlite_sequence WHERE name = ?", (self._changes_table,)).fetchone()
+            seq = row[0] if row else 0
+            oldest = self.conn.execute(f'SELECT MIN(seq) FROM "{self._changes_table}"').fetchone()[0]
+            # 남은 가장 오래된 기록 직전 번호까지는 빠짐없이 이어짐 (기록이 없으면 현재 번호)
+            floor = oldest - 1 if oldest is not None else seq
+            if since < floor or since > seq:
+                return seq, [], True
+            rows = self.conn.execute(
+                f'SELECT seq, op, key, paths FROM "{self._changes_table}" WHERE seq > ? ORDER BY seq LIMIT ?', (since, limit)
+            ).fetchall()
+        return seq, [
+            (row_seq, op, key, tuple(tuple(path) for path in json.loads(paths)) if paths else None)
+            for row_seq, op, key, paths in rows
+        ], False
+
+
+def _collect_store_metrics():
+    stores = list(repositories.values())
+    yield ("store_records", "gauge", "저장소 레코드 수", [({"store": r.name}, r.record_count()) for r in stores])
+    yield (
+        "store_index_entries", "gauge", "저장소 인덱스별 서로 다른 값의 수",
+        [({"store": r.name, "index": index}, size) for r in stores for index, size in r.index_sizes().items()]
+    )
+
+
+register_collector(_collect_store_metrics)
+
+
+def _refresh_store_stats():
+    for repository in list(repositories.values()):
+        if isinstance(repository, SqliteRepository):
+            repository.refresh_stats()
+
+
+register_periodic("store_stats", _refresh_store_stats, STORE_STATS_INTERVAL)
+
+
+def _reconnect_after_fork():
+    """SQLite 연결은 fork 후 공유하면 안 되므로 워커에서 새로 연결 (부모 연결은 닫지 않고 버림)"""
+    SqliteRepository._connections = {}
+    for repository in repositories.values():
+        if isinstance(repository, SqliteRepository):
+            repository.conn, repository.lock = repository._connect(repository.db_path)
+
+
+os.register_at_fork(after_in_child=_reconnect_after_fork)
+
+
+def create_repository(
+    name: str,
+    key_field: str = "id",
+    indexes: Optional[Dict[str, str]] = None,
+    search_fields: Sequence[str] = (),
+    sort_fields: Sequence[str] = (),
+    prefix_fields: Sequence[str] = (),
+    data_file: Optional[str] = None,
+    initial: Optional[List[dict]] = None,
+    label: Optional[str] = None,
+    backend: Optional[str] = None,
+) -> Repository:
+    """STORAGE_BACKEND 설정(backend를 주면 그 값)에 맞는 저장소 생성"""
+    options = dict(
+        key_field=key_field, indexes=indexes, search_fields=search_fields, sort_fields=sort_fields,
+        prefix_fields=prefix_fields, label=label
+    )
+    backend = backend or STORAGE_BACKEND
+    if backend == "sqlite":
+        repository = SqliteRepository(name, data_file=data_file, initial=initial, **options)
+    elif backend == "json":
+        repository = JsonRepository(name, data_file=data_file, initial=initial, **options)
+    else:
+        raise ValueError(f"지원하지 않는 STORAGE_BACKEND: {backend}")
+    repositories[name] = repository
+    return repository
@@ -0,0 +1,161 @@
+"""
+역지오코딩 (좌표 -> 가장 가까운 주소)
+
+우편번호 DB에서 좌표가 있는 주소 레코드로 k-d 트리를 만든다. 트리는 배열 하나에 중앙값 순서로 배치한
+암묵적 트리(구간 [lo, hi)의 가운데 원소가 분할점, 깊이에 따라 위도/경도를 번갈아 사용)라서 노드 객체가 없고,
+배열 그대로 파일(<POSTAL_DB_PATH>.kdtree)에 저장해 두었다가 다음 시작 시 mmap으로 열기만 한다.
+우편번호 DB 파일이 바뀌면(크기/수정 시각) 다시 만든다.
+
+거리는 조회 지점 위도의 cos 값으로 경도를 보정한 평면 근사(등장방형)를 사용한다.
+같은 보정값으로 분할면까지의 거리도 계산하므로 이 거리 기준으로는 정확한 최근접 주소를 찾는다.
+"""
+import math
+import mmap
+import os
+import struct
+import threading
+from array import array
+from typing import List, Optional, Tuple
+
+from dependencies.logger import get_logger
+from dependencies.postal_codes import PostalCodeDatabase, get_postal_db
+
+# 이 거리보다 먼 주소는 결과로 사용하지 않음 (미터, 0: 제한 없음)
+REVERSE_GEOCODE_MAX_DISTANCE = float(os.getenv("REVERSE_GEOCODE_MAX_DISTANCE", "2000"))
+
+MAGIC = b"DYKDT001"
+# 매직, 점 개수, 우편번호 DB 크기, 우편번호 DB 수정 시각(ns)
+HEADER = struct.Struct("<8sIQQ")
+LEAF_SIZE = 8
+EARTH_RADIUS_M = 6371008.8
+METERS_PER_DEGREE = math.pi * EARTH_RADIUS_M / 180
+
+logger = get_logger(__name__)
+
+
+def _source_stamp(db: PostalCodeDatabase) -> Tuple[int, int]:
+    stat = os.stat(db.path)
+    return stat.st_size, stat.st_mtime_ns
+
+
+def build_kdtree(db: PostalCodeDatabase, output: str) -> int:
+    """좌표가 있는 주소 레코드로 트리 파일 생성, 점 개수 반환"""
+    points = []
+    for index in range(db.record_count):
+        record = db.record(index)
+        if record["latitude"] is not None and record["longitude"] is not None:
+            points.append((record["latitude"], record["longitude"], index))
+
+    # 재귀 대신 스택으로 구간마다 분할 축 기준 정렬
+    stack = [(0, len(points), 0)]
+    while stack:
+        lo, hi, depth = stack.pop()
+        if hi - lo <= LEAF_SIZE:
+            continue
+        axis = depth % 2
+        points[lo:hi] = sorted(points[lo:hi], key=lambda p: p[axis])
+        mid = (lo + hi) // 2
+        stack.append((lo, mid, depth + 1))
+        stack.append((mid + 1, hi, depth + 1))
+
+    size, mtime_ns = _source_stamp(db)
+    temp_file = f"{output}.{os.getpid()}.tmp"
+    with open(temp_file, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, len(points), size, mtime_ns))
+        array('d', (p[0] for p in points)).tofile(f)
+        array('d', (p[1] for p in points)).tofile(f)
+        array('I', (p[2] for p in points)).tofile(f)
+    os.replace(temp_file, output)
+    return len(points)
+
+
+class ReverseGeocoder:
+    def __init__(self, db: PostalCodeDatabase, path: str):
+        self.db = db
+        with open(path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.count, self.source_size, self.source_mtime_ns = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            raise ValueError(f"역지오코딩 트리 파일 형식이 아닙니다: {path}")
+        view = memoryview(self._mm)
+        offset = HEADER.size
+        self.lat = view[offset:offset + 8 * self.count].cast('d')
+        self.lng = view[offset + 8 * self.count:offset + 16 * self.count].cast('d')
+        self.record_index = view[offset + 16 * self.count:offset + 20 * self.count].cast('I')
+
+    def is_current(self) -> bool:
+        return (self.source_size, self.source_mtime_ns) == _source_stamp(self.db)
+
+    def nearest_point(self, lat: float, lng: float) -> Optional[Tuple[int, float]]:
+        """가장 가까운 점의 (레코드 번호, 거리(m))"""
+        if not self.count:
+            return None
+        lat_arr, lng_arr = self.lat, self.lng
+        scale = math.cos(math.radians(lat))
+        best_index, best_d2 = -1, math.inf
+
+        stack = [(0, self.count, 0)]
+        while stack:
+            lo, hi, depth = stack.pop()
+            if hi - lo <= LEAF_SIZE:
+                for i in range(lo, hi):
+                    d2 = (lat_arr[i] - lat) ** 2 + ((lng_arr[i] - lng) * scale) ** 2
+                    if d2 < best_d2:
+                        best_index, best_d2 = i, d2
+                continue
+            mid = (lo + hi) // 2
+            d2 = (lat_arr[mid] - lat) ** 2 + ((lng_arr[mid] - lng) * scale) ** 2
+            if d2 < best_d2:
+                best_index, best_d2 = mid, d2
+            if depth % 2 == 0:
+                diff = lat - lat_arr[mid]
+            else:
+                diff = (lng - lng_arr[mid]) * scale
+            near, far = ((lo, mid), (mid + 1, hi)) if diff < 0 else ((mid + 1, hi), (lo, mid))
+            # 먼 쪽은 분할면까지의 거리가 현재 최단 거리보다 가까울 때만 탐색 (스택이므로 먼저 넣음)
+            if diff * diff < best_d2:
+                stack.append((far[0], far[1], depth + 1))
+            stack.append((near[0], near[1], depth + 1))
+        return self.record_index[best_index], math.sqrt(best_d2) * METERS_PER_DEGREE
+
+    def reverse(self, lat: float, lng: float, max_distance: float = REVERSE_GEOCODE_MAX_DISTANCE) -> Optional[dict]:
+        """가장 가까운 주소 레코드 + distanceMeters (max_distance보다 멀면 None)"""
+        found = self.nearest_point(lat, lng)
+        if found is None:
+            return None
+        index, distance = found
+        if max_distance and distance > max_distance:
+            return None
+        return {**self.db.record(index), "distanceMeters": round(distance, 1)}
+
+    def reverse_many(self, points: List[Tuple[float, float]], max_distance: float = REVERSE_GEOCODE_MAX_DISTANCE) -> List[Optional[dict]]:
+        """여러 좌표 조회 (같은 좌표는 한 번만 계산)"""
+        results = {}
+        return [
+            results[point] if point in results else results.setdefault(point, self.reverse(point[0], point[1], max_distance))
+            for point in points
+        ]
+
+
+_geocoder: Optional[ReverseGeocoder] = None
+_lock = threading.Lock()
+
+
+def get_reverse_geocoder() -> Optional[ReverseGeocoder]:
+    """트리 파일을 열어 반환 (없거나 우편번호 DB가 바뀌었으면 생성, 우편번호 DB가 없으면 None)"""
+    global _geocoder
+    if _geocoder is not None:
+        return _geocoder
+    with _lock:
+        if _geocoder is None:
+            db = get_postal_db()
+            if db is None:
+                return None
+            path = db.path + ".kdtree"
+            geocoder = ReverseGeocoder(db, path) if os.path.exists(path) else None
+            if geocoder is None or not geocoder.is_current():
+                count = build_kdtree(db, path)
+                logger.info("역지오코딩 트리 생성", extra={"fields": {"path": path, "points": count}})
+                geocoder = ReverseGeocoder(db, path)
+            _geocoder = geocoder
+    return _geocoder
@@ -0,0 +1,45 @@
+"""
+주기 작업 (앱 시작 시 워커마다 실행)
+
+라우터가 register_periodic()으로 등록한 함수를 interval초마다 스레드 풀에서 실행한다.
+main.py의 lifespan이 시작/종료하며, 작업이 실패해도 로그만 남기고 다음 주기에 다시 실행한다.
+"""
+import asyncio
+from typing import Callable, Dict, List, Tuple
+
+from dependencies.logger import get_logger
+from dependencies.metrics import Counter
+
+logger = get_logger(__name__)
+
+periodic_runs_total = Counter("periodic_runs_total", "주기 작업 실행 수", ("task", "result"))
+
+_tasks: Dict[str, Tuple[Callable[[], object], float]] = {}
+
+
+def register_periodic(name: str, func: Callable[[], object], interval: float):
+    """interval초마다 실행할 함수 등록 (interval이 0 이하면 실행하지 않음)"""
+    if interval > 0:
+        _tasks[name] = (func, interval)
+
+
+async def _run(name: str, func: Callable[[], object], interval: float):
+    loop = asyncio.get_running_loop()
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await loop.run_in_executor(None, func)
+            periodic_runs_total.inc(name, "ok")
+        except Exception:
+            periodic_runs_total.inc(name, "error")
+            logger.exception("주기 작업 실패", extra={"fields": {"task": name}})
+
+
+def start_periodic() -> List[asyncio.Task]:
+    return [asyncio.ensure_future(_run(name, func, interval)) for name, (func, interval) in _tasks.items()]
+
+
+async def stop_periodic(tasks: List[asyncio.Task]):
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
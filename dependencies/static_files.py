@@ -0,0 +1,124 @@
+import hashlib
+import os
+import re
+import stat
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from fastapi.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, QueryParams
+from starlette.responses import FileResponse, PlainTextResponse, Response
+
+from dependencies.metrics import record_cache
+
+# 업로드 파일 루트 (docker-compose에서 ./uploads 마운트)
+UPLOAD_DIR = os.getenv("UPLOAD_DIR", "uploads")
+# 콘텐츠 해시 캐시 최대 항목 수
+ETAG_CACHE_SIZE = int(os.getenv("UPLOAD_ETAG_CACHE_SIZE", "4096"))
+
+# 버전(v)이 콘텐츠 해시와 일치하는 URL은 내용이 바뀌지 않으므로 장기 캐시
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+# 버전 없는 URL은 ETag로 재검증 (변경이 없으면 304로 본문 전송 생략)
+REVALIDATE_CACHE_CONTROL = "public, no-cache"
+# URL 버전 파라미터로 사용하는 해시 길이
+VERSION_LENGTH = 16
+# 콘텐츠 주소 저장소 경로 (dependencies.blob_store)
+BLOBS_PREFIX = "/blobs/"
+BLOB_NAME_PATTERN = re.compile(r"[0-9a-f]{64}")
+
+# 경로 -> ((inode, mtime_ns, size), sha256 hex)
+_hash_cache: "OrderedDict[str, Tuple[tuple, str]]" = OrderedDict()
+
+
+def _stat_key(stat_result: os.stat_result) -> tuple:
+    return (stat_result.st_ino, stat_result.st_mtime_ns, stat_result.st_size)
+
+
+def compute_content_hash(path: str, stat_result: Optional[os.stat_result] = None) -> str:
+    """
+    파일 내용의 sha256 해시 (강한 ETag용)
+
+    파일이 바뀌지 않았다면(inode, mtime, size 동일) 캐시된 값을 재사용한다.
+    """
+    stat_result = stat_result or os.stat(path)
+    key = _stat_key(stat_result)
+    cached = _hash_cache.get(path)
+    record_cache("etag", bool(cached and cached[0] == key))
+    if cached and cached[0] == key:
+        _hash_cache.move_to_end(path)
+        return cached[1]
+
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    content_hash = digest.hexdigest()
+
+    _hash_cache[path] = (key, content_hash)
+    _hash_cache.move_to_end(path)
+    while len(_hash_cache) > ETAG_CACHE_SIZE:
+        _hash_cache.popitem(last=False)
+    return content_hash
+
+
+class UploadFileResponse(FileResponse):
+    # 대용량 맵 이미지 전송 시 await 횟수를 줄이기 위해 청크 크기 확대
+    chunk_size = 1024 * 1024
+
+
+class UploadFiles:
+    """
+    업로드 파일 정적 서빙 (ASGI 앱, /uploads 마운트)
+
+    - Range / If-Range 요청 지원 (부분 다운로드 및 이어받기)
+    - 콘텐츠 해시 기반 강한 ETag, If-None-Match 시 304 응답
+    - 서버가 ASGI pathsend 확장을 지원하면 전체 파일 전송은 zero-copy(sendfile)로 처리
+    """
+
+    def __init__(self, directory: str = UPLOAD_DIR):
+        self.directory = directory
+
+    def resolve_path(self, relative_path: str) -> Optional[str]:
+        """요청 경로를 업로드 루트 내부의 실제 경로로 변환 (루트 밖이면 None)"""
+        root = os.path.realpath(self.directory)
+        full_path = os.path.realpath(os.path.join(root, relative_path.lstrip("/")))
+        if full_path != root and not full_path.startswith(root + os.sep):
+            return None
+        return full_path
+
+    async def __call__(self, scope, receive, send):
+        if scope["method"] not in ("GET", "HEAD"):
+            response = PlainTextResponse("Method Not Allowed", status_code=405, headers={"Allow": "GET, HEAD"})
+            return await response(scope, receive, send)
+
+        # Mount 하위에서는 root_path(/uploads)를 제외한 경로가 파일 경로
+        request_path = scope["path"]
+        root_path = scope.get("root_path", "")
+        if root_path and request_path.startswith(root_path):
+            request_path = request_path[len(root_path):]
+        path = self.resolve_path(request_path)
+        try:
+            stat_result = await run_in_threadpool(os.stat, path) if path else None
+        except (FileNotFoundError, NotADirectoryError):
+            stat_result = None
+        if stat_result is None or not stat.S_ISREG(stat_result.st_mode):
+            return await PlainTextResponse("Not Found", status_code=404)(scope, receive, send)
+
+        if request_path.startswith(BLOBS_PREFIX) and BLOB_NAME_PATTERN.fullmatch(os.path.basename(path)) and ".." not in request_path:
+            # 콘텐츠 주소 blob은 파일명이 곧 해시이므로 다시 계산하지 않음
+            content_hash = os.path.basename(path)
+            is_versioned = True
+        else:
+            content_hash = await run_in_threadpool(compute_content_hash, path, stat_result)
+            version = QueryParams(scope.get("query_string", b"")).get("v")
+            is_versioned = version is not None and len(version) >= VERSION_LENGTH and content_hash.startswith(version)
+        etag = f'"{content_hash}"'
+        cache_control = IMMUTABLE_CACHE_CONTROL if is_versioned else REVALIDATE_CACHE_CONTROL
+        headers = {"etag": etag, "cache-control": cache_control}
+
+        if_none_match = Headers(scope=scope).get("if-none-match")
+        if if_none_match and (if_none_match.strip() == "*" or etag in [t.strip() for t in if_none_match.split(",")]):
+            return await Response(status_code=304, headers=headers)(scope, receive, send)
+
+        response = UploadFileResponse(path, headers=headers, stat_result=stat_result)
+        await response(scope, receive, send)
@@ -0,0 +1,119 @@
+import math
+import os
+import shutil
+import tempfile
+import warnings
+from typing import Optional
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow 미설치 환경에서는 타일링을 건너뜀
+    Image = None
+
+# 환경변수에서 설정값 가져오기
+TILE_SIZE = int(os.getenv("MAP_TILE_SIZE", "256"))
+TILE_JPEG_QUALITY = int(os.getenv("MAP_TILE_JPEG_QUALITY", "85"))
+
+# 디코딩할 최대 픽셀 수 (가장 큰 코스 이미지 8192x8192 기준, 압축 폭탄 이미지로 메모리를 다 쓰지 않도록 제한)
+MAP_MAX_IMAGE_PIXELS = int(os.getenv("MAP_MAX_IMAGE_PIXELS", str(8192 * 8192)))
+
+if Image is not None:
+    Image.MAX_IMAGE_PIXELS = MAP_MAX_IMAGE_PIXELS
+    # 제한의 2배 이하는 Pillow가 경고만 하므로 오류로 바꿔 제한을 넘는 이미지는 모두 거부
+    warnings.simplefilter("error", Image.DecompressionBombWarning)
+
+# 픽셀 제한을 넘는 이미지를 열 때 발생하는 오류 (Pillow 미설치 시 없음)
+IMAGE_TOO_LARGE_ERRORS = (Image.DecompressionBombError, Image.DecompressionBombWarning) if Image is not None else ()
+
+
+def is_tiling_available() -> bool:
+    """타일링 가능 여부 (Pillow 설치 여부)"""
+    return Image is not None
+
+
+def read_image_size(image_path: str) -> Optional[tuple]:
+    """이미지 헤더만 읽어 해상도 조회 (실패 시 None)"""
+    if Image is None:
+        return None
+    try:
+        with Image.open(image_path) as image:
+            return image.size
+    except (OSError, ValueError):
+        return None
+
+
+def calculate_max_zoom(width: int, height: int, tile_size: int = TILE_SIZE) -> int:
+    """원본 해상도를 모두 담을 수 있는 최대 줌 레벨 계산"""
+    longest = max(width, height, 1)
+    return max(0, math.ceil(math.log2(longest / tile_size)))
+
+
+def _save_level(level_image, level_dir: str, tile_size: int, tile_format: str) -> int:
+    """한 줌 레벨의 이미지를 tile_size 단위로 잘라 저장"""
+    width, height = level_image.size
+    cols = math.ceil(width / tile_size)
+    rows = math.ceil(height / tile_size)
+    save_options = {"quality": TILE_JPEG_QUALITY, "optimize": True} if tile_format == "jpg" else {"optimize": True}
+    pil_format = "JPEG" if tile_format == "jpg" else "PNG"
+
+    for x in range(cols):
+        column_dir = os.path.join(level_dir, str(x))
+        os.makedirs(column_dir, exist_ok=True)
+        for y in range(rows):
+            box = (x * tile_size, y * tile_size, min((x + 1) * tile_size, width), min((y + 1) * tile_size, height))
+            tile = level_image.crop(box)
+            # 가장자리 타일도 동일한 크기로 맞춰 클라이언트 좌표 계산을 단순화
+            if tile.size != (tile_size, tile_size):
+                canvas = Image.new(level_image.mode, (tile_size, tile_size))
+                canvas.paste(tile, (0, 0))
+                tile = canvas
+            tile.save(os.path.join(column_dir, f"{y}.{tile_format}"), pil_format, **save_options)
+    return cols * rows
+
+
+def build_tile_pyramid(image_path: str, output_dir: str, tile_size: int = TILE_SIZE) -> dict:
+    """
+    이미지를 z/x/y 타일 피라미드로 분할하여 output_dir에 저장
+
+    최대 줌 레벨은 원본 해상도이며, 하위 레벨은 바로 위 레벨을 절반으로 축소해 만든다.
+    임시 디렉토리에서 생성한 뒤 교체하므로 생성 중인 타일이 노출되지 않는다.
+    """
+    if Image is None:
+        raise RuntimeError("Pillow가 설치되어 있지 않아 타일을 생성할 수 없습니다.")
+
+    with Image.open(image_path) as source:
+        has_alpha = source.mode in ("RGBA", "LA") or "transparency" in source.info
+        tile_format = "png" if has_alpha else "jpg"
+        level_image = source.convert("RGBA" if has_alpha else "RGB")
+
+    width, height = level_image.size
+    max_zoom = calculate_max_zoom(width, height, tile_size)
+
+    parent_dir = os.path.dirname(os.path.abspath(output_dir))
+    os.makedirs(parent_dir, exist_ok=True)
+    work_dir = tempfile.mkdtemp(prefix=".tiles-", dir=parent_dir)
+
+    try:
+        tile_count = 0
+        for z in range(max_zoom, -1, -1):
+            tile_count += _save_level(level_image, os.path.join(work_dir, str(z)), tile_size, tile_format)
+            if z > 0:
+                next_size = (max(1, math.ceil(level_image.width / 2)), max(1, math.ceil(level_image.height / 2)))
+                level_image = level_image.resize(next_size, Image.LANCZOS)
+
+        if os.path.exists(output_dir):
+            shutil.rmtree(output_dir)
+        os.replace(work_dir, output_dir)
+    except Exception:
+        shutil.rmtree(work_dir, ignore_errors=True)
+        raise
+
+    return {
+        "tileSize": tile_size,
+        "minZoom": 0,
+        "maxZoom": max_zoom,
+        "width": width,
+        "height": height,
+        "format": tile_format,
+        "tileCount": tile_count,
+    }
@@ -0,0 +1,112 @@
+"""
+요청 단위 추적 구간(span)과 느린 요청 로그
+
+    with span("search", store="golf_courses") as fields:
+        ...
+        fields["matched"] = len(items)
+
+TracingMiddleware가 요청마다 추적 정보를 컨텍스트 변수에 두고, 요청 처리 중 span()으로 감싼 구간의
+시작 시각/소요 시간/추가 필드를 모은다. 요청 처리 시간이 SLOW_REQUEST_MS 이상이면 구간별 시간을 포함하여
+경고 로그를 남긴다. 요청 밖(시작 시 로드 등)에서는 컨텍스트 변수 조회만 하고 아무것도 기록하지 않는다.
+스레드 풀에서 실행되는 동기 핸들러/의존성도 컨텍스트가 복사되므로 같은 요청에 기록된다.
+"""
+import os
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import List, Optional
+
+from dependencies.logger import get_logger, request_id_var
+from dependencies.metrics import route_label
+
+SLOW_REQUEST_MS = float(os.getenv("SLOW_REQUEST_MS", "500"))
+# 한 요청에서 기록할 최대 구간 수 (대량 처리 요청에서 메모리 사용 제한)
+MAX_SPANS = 200
+
+REQUEST_ID_HEADER = b"x-request-id"
+
+logger = get_logger(__name__)
+
+
+class Trace:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.spans: List[dict] = []
+        self.depth = 0
+        self.dropped = 0
+
+
+_trace: ContextVar[Optional[Trace]] = ContextVar("trace", default=None)
+
+
+@contextmanager
+def span(name: str, **fields):
+    """구간 소요 시간 기록 (yield한 사전에 넣은 값도 함께 기록)"""
+    trace = _trace.get()
+    if trace is None:
+        yield fields
+        return
+    started = time.perf_counter()
+    trace.depth += 1
+    try:
+        yield fields
+    finally:
+        trace.depth -= 1
+        if len(trace.spans) < MAX_SPANS:
+            trace.spans.append({
+                "name": name,
+                "startMs": round((started - trace.started) * 1000, 2),
+                "durationMs": round((time.perf_counter() - started) * 1000, 2),
+                "depth": trace.depth,
+                **fields,
+            })
+        else:
+            trace.dropped += 1
+
+
+def current_spans() -> List[dict]:
+    trace = _trace.get()
+    return sorted(trace.spans, key=lambda s: s["startMs"]) if trace else []
+
+
+class TracingMiddleware:
+    """요청 ID 부여(X-Request-ID), 구간 수집, 느린 요청 로그를 남기는 ASGI 미들웨어"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = dict(scope["headers"]).get(REQUEST_ID_HEADER, b"").decode("latin-1")[:64] or uuid.uuid4().hex[:16]
+        trace = Trace()
+        trace_token = _trace.set(trace)
+        request_token = request_id_var.set(request_id)
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                message["headers"] = list(message.get("headers", [])) + [(REQUEST_ID_HEADER, request_id.encode("latin-1"))]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed_ms = (time.perf_counter() - trace.started) * 1000
+            if elapsed_ms >= SLOW_REQUEST_MS:
+                logger.warning("느린 요청", extra={"fields": {
+                    "method": scope["method"],
+                    "path": scope["path"],
+                    "route": route_label(scope),
+                    "status": status_code,
+                    "durationMs": round(elapsed_ms, 2),
+                    "spans": current_spans(),
+                    "droppedSpans": trace.dropped,
+                }})
+            _trace.reset(trace_token)
+            request_id_var.reset(request_token)
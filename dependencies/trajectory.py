@@ -0,0 +1,312 @@
+"""
+카트 위치 이력 압축 (궤적 단순화 + 델타 인코딩)
+
+GPS 측정값을 모두 저장하지 않고, 수신할 때마다 온라인 단순화로 필요한 점만 남긴다.
+마지막으로 남긴 점(anchor)에서 새 측정값까지 등속으로 이동한다고 보고, 그 사이 측정값이 모두
+LOCATION_TOLERANCE_METERS 안에 있으면 새 측정값을 후보로 이어가고, 아니면 이전 후보를 남긴 뒤 거기서 다시 시작한다.
+오차는 동기화 거리(같은 시각에 선분 위를 등속으로 움직였을 때 위치와의 거리)로 재므로 재생 시 시간 위치도 오차 안에 있다.
+
+사이 측정값을 보관하지 않도록, 각 측정값이 허용하는 anchor 기준 속도 범위(원에 내접하는 정사각형)의 교집합만
+속도 상자(box)로 유지한다. 새 측정값의 속도가 상자 안이면 사이 점이 모두 오차 안에 있다 (원 대신 정사각형이라 조금 더 남김).
+따라서 측정값마다 저장하는 궤적 상태는 anchor, 마지막 측정값, 상자뿐이다.
+
+남긴 점은 카트별 열린 조각에 (시각 ms, 위도/경도 1e-6도 정수)의 이전 점과의 차이를 zigzag varint로 이어 붙이고
+(점을 남길 때만 저장), TRACK_CHUNK_POINTS개가 차거나 궤적이 끊기면 닫아 조각 저장소에 한 행으로 추가한다.
+조각에는 시작/끝 시각이 있어 재생 시 구간과 겹치는 조각만 디코딩한다.
+LOCATION_GAP_SECONDS 넘게 측정이 없으면 이전 궤적을 닫고 새로 시작한다 (라운드 사이 등).
+닫힌 조각은 TRACK_RETENTION_DAYS가 지나면 삭제한다.
+"""
+import base64
+import itertools
+import math
+import os
+import threading
+import time
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from dependencies.logger import get_logger
+from dependencies.metrics import Counter
+
+logger = get_logger(__name__)
+
+# 환경변수에서 설정값 가져오기
+LOCATION_TOLERANCE_METERS = float(os.getenv("LOCATION_TOLERANCE_METERS", "3"))
+LOCATION_GAP_SECONDS = float(os.getenv("LOCATION_GAP_SECONDS", "300"))
+TRACK_CHUNK_POINTS = int(os.getenv("TRACK_CHUNK_POINTS", "256"))
+TRACK_RETENTION_DAYS = float(os.getenv("TRACK_RETENTION_DAYS", "30"))
+
+# 좌표 정수화 단위 (1e-6도, 약 0.1m)
+COORDINATE_SCALE = 1_000_000
+CHUNK_ENCODING = "delta-zigzag-varint"
+
+# 위도 1도 / 적도에서 경도 1도의 거리 (m)
+_METERS_PER_LAT = 110_574.0
+_METERS_PER_LNG = 111_320.0
+
+track_fixes_total = Counter("track_fixes_total", "수신한 카트 위치 측정값 수")
+track_points_stored_total = Counter("track_points_stored_total", "단순화 후 저장한 위치 점 수")
+track_chunks_expired_total = Counter("track_chunks_expired_total", "보관 기간이 지나 삭제한 위치 이력 조각 수")
+
+# (시각 epoch ms, 위도, 경도)
+Point = Tuple[int, float, float]
+
+
+def _velocity(anchor: Point, point: Point) -> Tuple[float, float, float]:
+    """anchor -> point 평균 속도 (동쪽, 북쪽 m/s)와 경과 시간 (s)"""
+    elapsed = (point[0] - anchor[0]) / 1000
+    dx = (point[2] - anchor[2]) * _METERS_PER_LNG * math.cos(math.radians(anchor[1]))
+    dy = (point[1] - anchor[1]) * _METERS_PER_LAT
+    return dx / elapsed, dy / elapsed, elapsed
+
+
+def _allowed_box(anchor: Point, point: Point, tolerance: float) -> List[float]:
+    """point를 tolerance 안에서 지나는 anchor 기준 속도 범위 [vx 최소, vx 최대, vy 최소, vy 최대] (원에 내접하는 정사각형)"""
+    vx, vy, elapsed = _velocity(anchor, point)
+    half = tolerance / elapsed / math.sqrt(2)
+    return [vx - half, vx + half, vy - half, vy + half]
+
+
+def new_track_state(cart_id: str) -> dict:
+    return {"cartId": cart_id, "anchor": None, "last": None, "box": None}
+
+
+def add_fix(state: dict, point: Point, tolerance: float = LOCATION_TOLERANCE_METERS) -> List[Optional[Point]]:
+    """
+    측정값 하나 반영 (state를 직접 수정), 새로 남길 점 목록 반환 (None은 그 자리에서 열린 조각을 닫음)
+
+    마지막 측정보다 이전 시각의 측정값은 무시한다.
+    """
+    last = tuple(state["last"]) if state.get("last") else None
+    if last is not None and point[0] <= last[0]:
+        return []
+    track_fixes_total.inc()
+
+    kept: List[Optional[Point]] = []
+    anchor = tuple(state["anchor"]) if state.get("anchor") else None
+    if anchor is not None and point[0] - last[0] > LOCATION_GAP_SECONDS * 1000:
+        # 끊기기 전 마지막 위치를 남기고 닫음
+        if last != anchor:
+            kept.append(last)
+        kept.append(None)
+        anchor = None
+
+    if anchor is None:
+        anchor, box = point, None
+        kept.append(point)
+    else:
+        box = state.get("box")
+        vx, vy, _ = _velocity(anchor, point)
+        if box is not None and not (box[0] <= vx <= box[1] and box[2] <= vy <= box[3]):
+            # 이전 측정값까지는 허용 오차 안이었으므로 그 점을 남기고 새 기준으로 사용
+            anchor, box = last, None
+            kept.append(last)
+        allowed = _allowed_box(anchor, point, tolerance)
+        box = allowed if box is None else [
+            max(box[0], allowed[0]), min(box[1], allowed[1]), max(box[2], allowed[2]), min(box[3], allowed[3])
+        ]
+
+    state["anchor"], state["last"], state["box"] = list(anchor), list(point), box
+    return kept
+
+
+def _zigzag(value: int) -> int:
+    return value << 1 if value >= 0 else ((-value) << 1) - 1
+
+
+def _unzigzag(value: int) -> int:
+    return value >> 1 if not value & 1 else -((value + 1) >> 1)
+
+
+def _quantize(point: Point) -> Tuple[int, int, int]:
+    return int(point[0]), round(point[1] * COORDINATE_SCALE), round(point[2] * COORDINATE_SCALE)
+
+
+def _encode(points: Iterable[Point], previous: Tuple[int, int, int], out: bytearray) -> Tuple[int, int, int]:
+    """previous 다음 점들의 차이를 out에 이어 씀, 마지막 점(정수화) 반환"""
+    for point in points:
+        current = _quantize(point)
+        for value, before in zip(current, previous):
+            value = _zigzag(value - before)
+            while value >= 0x80:
+                out.append((value & 0x7F) | 0x80)
+                value >>= 7
+            out.append(value)
+        previous = current
+    return previous
+
+
+def encode_points(points: Iterable[Point]) -> str:
+    """점 목록 -> 이전 점과의 차이(zigzag varint) base64 문자열"""
+    out = bytearray()
+    _encode(points, (0, 0, 0), out)
+    return base64.b64encode(bytes(out)).decode("ascii")
+
+
+def decode_points(data: str) -> Iterator[Point]:
+    raw = base64.b64decode(data)
+    values, value, shift = [], 0, 0
+    for byte in raw:
+        value |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+            continue
+        values.append(_unzigzag(value))
+        value, shift = 0, 0
+    t = lat = lng = 0
+    for i in range(0, len(values) - 2, 3):
+        t += values[i]
+        lat += values[i + 1]
+        lng += values[i + 2]
+        yield t, lat / COORDINATE_SCALE, lng / COORDINATE_SCALE
+
+
+def append_points(chunk: Optional[dict], cart_id: str, points: List[Point]) -> dict:
+    """열린 조각에 점을 이어 붙인 새 레코드 (기존 점은 다시 인코딩하지 않고 마지막 점(tail)과의 차이만 추가)"""
+    track_points_stored_total.inc(amount=len(points))
+    if chunk is None:
+        chunk = {"cartId": cart_id, "startTime": points[0][0], "count": 0, "points": "", "tail": [0, 0, 0]}
+    out = bytearray(base64.b64decode(chunk["points"]))
+    tail = _encode(points, tuple(chunk["tail"]), out)
+    return {
+        **chunk,
+        "endTime": points[-1][0],
+        "count": chunk["count"] + len(points),
+        "encoding": CHUNK_ENCODING,
+        "points": base64.b64encode(bytes(out)).decode("ascii"),
+        "tail": list(tail),
+    }
+
+
+def close_chunk(chunk: dict) -> dict:
+    """열린 조각 -> 조각 저장소 레코드 (시작/끝 시각으로 재생 구간과 겹치는지 디코딩 없이 판단)"""
+    closed = {key: value for key, value in chunk.items() if key != "tail"}
+    return {"id": f"{chunk['cartId']}-{chunk['startTime']}", **closed}
+
+
+def iter_track(chunks: Iterable[dict], tail: Iterable[Point], start: int, end: int) -> Iterator[Point]:
+    """
+    시작 시각 순 조각과 그 뒤 점(tail)에서 [start, end] ms 구간의 점
+
+    구간 경계까지 이어 그릴 수 있도록 구간 직전/직후 점도 하나씩 포함한다.
+    구간 전에 끝난 조각은 마지막 하나만, 구간 뒤 조각은 첫 하나만 디코딩한다.
+    """
+    chunks = list(chunks)
+    # 조각은 시각이 겹치지 않으므로 구간 전에 끝난 조각은 앞쪽에 모여 있음
+    before = sum(1 for chunk in chunks if chunk["endTime"] < start)
+    sources = [decode_points(chunk["points"]) for chunk in chunks[max(before - 1, 0):]]
+    sources.append(tuple(point) for point in tail)
+    previous = None
+    for point in itertools.chain.from_iterable(sources):
+        if point[0] < start:
+            previous = point
+            continue
+        if previous is not None:
+            yield previous
+            previous = None
+        yield point
+        if point[0] > end:
+            return
+
+
+class TrackRecorder:
+    """
+    카트 위치 이력 저장/재생
+
+    states: 카트별 궤적 상태 (측정값마다 저장, 작은 레코드), open_chunks: 카트별 열린 조각 (점을 남길 때만 저장),
+    chunks: 닫힌 조각 (조각마다 한 행, 보관 기간이 지나면 삭제)
+    """
+
+    def __init__(self, states, open_chunks, chunks):
+        self.states = states
+        self.open_chunks = open_chunks
+        self.chunks = chunks
+        # 같은 워커의 수신과 주기 작업(닫기/삭제)이 같은 카트의 열린 조각을 동시에 바꾸지 않도록 함
+        self.lock = threading.Lock()
+
+    def record(self, fixes: Dict[str, List[Point]]):
+        """카트별 측정값(시각 순) 반영, 저장소별로 한 번씩 저장"""
+        states, opened, closed, finished = {}, {}, [], []
+        with self.lock:
+            for cart_id, points in fixes.items():
+                state = dict(self.states.get(cart_id) or new_track_state(cart_id))
+                chunk = original = self.open_chunks.get(cart_id)
+                pending: List[Point] = []
+                for point in points:
+                    for kept in add_fix(state, point):
+                        if kept is not None:
+                            pending.append(kept)
+                        if kept is None or len(pending) + (chunk["count"] if chunk else 0) >= TRACK_CHUNK_POINTS:
+                            if pending:
+                                chunk = append_points(chunk, cart_id, pending)
+                                pending = []
+                            if chunk is not None:
+                                closed.append(close_chunk(chunk))
+                                chunk = None
+                if pending:
+                    chunk = append_points(chunk, cart_id, pending)
+                states[cart_id] = state
+                if chunk is not None and chunk is not original:
+                    opened[cart_id] = chunk
+                elif chunk is None and original is not None:
+                    finished.append(cart_id)
+
+            self.chunks.upsert_many(closed)
+            self.open_chunks.upsert_many(opened.values())
+            self.open_chunks.delete_many(finished)
+            self.states.upsert_many(states.values())
+
+    def replay(self, cart_id: str, start: int, end: int) -> Optional[Iterator[Point]]:
+        """[start, end] ms 구간의 점 (이력이 없으면 None)"""
+        state = self.states.get(cart_id)
+        if state is None:
+            return None
+        chunk_list, _ = self.chunks.query(filters={"cartId": cart_id}, sort_by="startTime")
+        chunk = self.open_chunks.get(cart_id)
+        if chunk is not None:
+            chunk_list.append(chunk)
+        # 아직 남기지 않은 현재 위치
+        tail = []
+        if state.get("last") and (not chunk_list or state["last"][0] > chunk_list[-1]["endTime"]):
+            tail.append(tuple(state["last"]))
+        return iter_track(chunk_list, tail, start, end)
+
+    def flush_idle(self):
+        """LOCATION_GAP_SECONDS 넘게 측정이 없는 카트의 열린 조각을 닫아 조각 저장소에 보관 (주기 작업)"""
+        cutoff = int(time.time() * 1000 - LOCATION_GAP_SECONDS * 1000)
+        closed, finished, states = [], [], []
+        with self.lock:
+            for chunk in list(self.open_chunks.iter_all()):
+                state = self.states.get(chunk["cartId"])
+                last = state.get("last") if state else None
+                if (last[0] if last else chunk["endTime"]) >= cutoff:
+                    continue
+                if last and last[0] > chunk["endTime"]:
+                    chunk = append_points(chunk, chunk["cartId"], [tuple(last)])
+                closed.append(close_chunk(chunk))
+                finished.append(chunk["cartId"])
+                if state:
+                    # 다음 측정값은 새 궤적으로 시작 (last는 유지하여 이전 시각 측정값 무시)
+                    states.append({**state, "anchor": None, "box": None})
+            self.chunks.upsert_many(closed)
+            self.open_chunks.delete_many(finished)
+            self.states.upsert_many(states)
+        if closed:
+            logger.info("유휴 카트 위치 이력 조각 보관", extra={"fields": {"chunks": len(closed)}})
+
+    def expire(self, retention_days: float = TRACK_RETENTION_DAYS):
+        """보관 기간이 지난 닫힌 조각 삭제 (주기 작업, 0 이하면 삭제하지 않음)"""
+        if retention_days <= 0:
+            return
+        cutoff = int((time.time() - retention_days * 86400) * 1000)
+        # 조각은 닫힌 순서(대체로 끝 시각 순)로 저장되므로 보관 기간 안의 조각이 나오면 멈춤
+        # (앞 조각보다 끝 시각이 이른 뒤쪽 조각은 앞 조각과 함께 삭제됨)
+        keys = []
+        for chunk in self.chunks.iter_all():
+            if chunk["endTime"] >= cutoff:
+                break
+            keys.append(chunk["id"])
+        if keys:
+            with self.lock:
+                self.chunks.delete_many(keys)
+            track_chunks_expired_total.inc(amount=len(keys))
+            logger.info("보관 기간이 지난 위치 이력 조각 삭제", extra={"fields": {"chunks": len(keys), "retentionDays": retention_days}})
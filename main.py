@@ -1,13 +1,38 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 
 from routers import auth, golf_courses, carts, maps, address, users
-from routers import cart_models
+from routers import cart_models, batch, health, dashboard
+from dependencies.health import is_warmed, warmup
+from dependencies.logger import get_logger
+from dependencies.metrics import MetricsMiddleware, render as render_metrics
+from dependencies.profiling import ProfilingMiddleware
+from dependencies.scheduler import start_periodic, stop_periodic
+from dependencies.tracing import TracingMiddleware
+from dependencies.static_files import UPLOAD_DIR, UploadFiles
+
+logger = get_logger(__name__)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # server.py는 fork 전에 워밍업하므로 워커에서는 건너뜀, 단독 실행 시 백그라운드에서 워밍업 (완료 전 /readyz는 503)
+    warmup_task = None if is_warmed() else asyncio.get_running_loop().run_in_executor(None, warmup)
+    # 주기 작업 (배터리 추정 재계산 등)
+    periodic_tasks = start_periodic()
+    yield
+    await stop_periodic(periodic_tasks)
+    if warmup_task is not None:
+        await warmup_task
 
 app = FastAPI(
     title="Golf Cart Management API Mock Server",
     description="This is a mock API server for the Golf Cart Management Backoffice, based on the provided specification.",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 # CORS 미들웨어 설정
@@ -19,16 +44,37 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 요청 단위 프로파일링 (PROFILE_TOKEN 헤더 또는 PROFILE_SAMPLE_RATE로 선택 시에만 동작)
+app.add_middleware(ProfilingMiddleware)
+
+# 요청 메트릭 기록 (요청 수, 상태 코드, 처리 시간)
+app.add_middleware(MetricsMiddleware)
+
+# 요청 ID 부여, 구간별 시간 수집, SLOW_REQUEST_MS 이상 걸린 요청 로그
+app.add_middleware(TracingMiddleware)
+
 # 라우터 포함
 app.include_router(auth.router, prefix="/api")
 app.include_router(golf_courses.router, prefix="/api")
 app.include_router(carts.router, prefix="/api")
 app.include_router(cart_models.router, prefix="/api")
-print(f"🚗 Cart models router included with routes: {[route.path for route in cart_models.router.routes]}")
+logger.debug("Cart models router included", extra={"fields": {"routes": [route.path for route in cart_models.router.routes]}})
 # 골프장 카트 API는 carts 라우터에 통합됨
 app.include_router(maps.router, prefix="/api")
 app.include_router(address.router, prefix="/api")
 app.include_router(users.router, prefix="/api")
+app.include_router(batch.router, prefix="/api")
+app.include_router(dashboard.router, prefix="/api")
+# 상태 확인 (/healthz, /readyz)
+app.include_router(health.router)
+
+# 업로드 파일 서빙 (Range 요청, 콘텐츠 해시 ETag 지원)
+app.mount("/uploads", UploadFiles(UPLOAD_DIR), name="uploads")
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus 수집용 메트릭"""
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4; charset=utf-8")
 
 @app.get("/", tags=["Root"])
 async def read_root():
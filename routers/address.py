@@ -1,36 +1,109 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Query
+from pydantic import BaseModel, Field
+from typing import List, Optional
+
+from dependencies.geocoding import GeocodingUnavailable, get_geocoder
+from dependencies.health import register_warmup
+from dependencies.reverse_geocoding import REVERSE_GEOCODE_MAX_DISTANCE
 
 router = APIRouter(
     prefix="/address",
     tags=["Address"],
 )
 
+# 일괄 역지오코딩 최대 좌표 수
+MAX_BATCH_POINTS = 5000
+
+# 시작 시 제공자 준비 (로컬 제공자는 DB/트리 파일을 열고, 없으면 샘플 원본으로 생성)
+register_warmup("geocoding", lambda: get_geocoder().provider.warmup())
+
+def to_address(record: dict) -> dict:
+    return {
+        "postalCode": record["postalCode"],
+        "address": record["roadAddress"],
+        "jibunAddress": record["jibunAddress"],
+        "englishAddress": record["englishAddress"],
+        "building": record["buildingName"],
+        "addressType": "ROAD",
+        "latitude": record["latitude"],
+        "longitude": record["longitude"],
+    }
+
+def geocoding_unavailable(error: GeocodingUnavailable) -> dict:
+    return {
+        "success": False,
+        "error": {"code": "SERVICE_UNAVAILABLE", "message": str(error)}
+    }
+
 @router.get("/search")
 async def search_address_by_postal_code(postalCode: str):
+    """우편번호로 주소 조회 (같은 우편번호의 주소가 여러 개면 첫 번째, 전체는 items)"""
+    postal_code = postalCode.strip()
+    try:
+        records = await get_geocoder().find_by_postal_code(postal_code) if len(postal_code) == 5 else []
+    except GeocodingUnavailable as e:
+        return geocoding_unavailable(e)
+    if not records:
+        return {
+            "success": False,
+            "error": {"code": "NOT_FOUND", "message": "해당 우편번호의 주소를 찾을 수 없습니다."}
+        }
+    items = [to_address(record) for record in records]
+    return {"success": True, "data": {**items[0], "items": items}}
+
+@router.get("/autocomplete")
+async def autocomplete_address(q: str = Query(..., min_length=1), limit: int = Query(10, ge=1, le=50)):
+    """주소 자동완성 (숫자만 입력하면 우편번호 앞자리, 그 외에는 주소/건물명 단어 앞부분 일치)"""
+    try:
+        records = await get_geocoder().autocomplete(q, limit)
+    except GeocodingUnavailable as e:
+        return geocoding_unavailable(e)
+    items = [to_address(record) for record in records]
+    return {"success": True, "data": {"items": items, "total": len(items)}}
+
+def to_reverse_result(record: dict, lat: float, lng: float) -> dict:
     return {
-      "success": True,
-      "data": {
-        "postalCode": postalCode,
-        "address": "서울특별시 강남구 테헤란로",
-        "englishAddress": "Teheran-ro, Gangnam-gu, Seoul",
-        "addressType": "ROAD",
-        "latitude": 37.5065,
-        "longitude": 127.0539
-      }
+        **to_address(record),
+        "distanceMeters": record["distanceMeters"],
+        "coordinates": {"latitude": lat, "longitude": lng},
     }
 
 @router.get("/reverse-geocode")
-async def reverse_geocode(lat: float, lng: float):
-    return {
-      "success": True,
-      "data": {
-        "address": "서울특별시 강남구 테헤란로 123",
-        "postalCode": "06234",
-        "addressType": "ROAD",
-        "building": "골프빌딩",
-        "coordinates": {
-          "latitude": lat,
-          "longitude": lng
+async def reverse_geocode(lat: float = Query(..., ge=-90, le=90), lng: float = Query(..., ge=-180, le=180), maxDistance: Optional[float] = Query(None, gt=0)):
+    """좌표에서 가장 가까운 주소 (maxDistance 미터보다 멀면 NOT_FOUND)"""
+    try:
+        record = await get_geocoder().reverse(lat, lng, maxDistance or REVERSE_GEOCODE_MAX_DISTANCE)
+    except GeocodingUnavailable as e:
+        return geocoding_unavailable(e)
+    if record is None:
+        return {
+            "success": False,
+            "error": {"code": "NOT_FOUND", "message": "주변에서 주소를 찾을 수 없습니다."}
         }
-      }
+    return {"success": True, "data": to_reverse_result(record, lat, lng)}
+
+class ReverseGeocodePoint(BaseModel):
+    id: Optional[str] = None
+    lat: float = Field(..., ge=-90, le=90)
+    lng: float = Field(..., ge=-180, le=180)
+
+class ReverseGeocodeBatchRequest(BaseModel):
+    points: List[ReverseGeocodePoint] = Field(..., max_length=MAX_BATCH_POINTS)
+    maxDistance: Optional[float] = Field(None, gt=0)
+
+@router.post("/reverse-geocode/batch")
+async def reverse_geocode_batch(body: ReverseGeocodeBatchRequest):
+    """여러 좌표(예: 전체 카트 위치)를 한 번에 주소로 변환, 요청 순서대로 반환 (찾지 못하면 address: null)"""
+    coordinates = [(point.lat, point.lng) for point in body.points]
+    try:
+        records = await get_geocoder().reverse_many(coordinates, body.maxDistance or REVERSE_GEOCODE_MAX_DISTANCE)
+    except GeocodingUnavailable as e:
+        return geocoding_unavailable(e)
+    items = [
+        {"id": point.id, "address": to_reverse_result(record, point.lat, point.lng) if record else None}
+        for point, record in zip(body.points, records)
+    ]
+    return {
+        "success": True,
+        "data": {"items": items, "total": len(items), "found": sum(1 for item in items if item["address"])}
     }
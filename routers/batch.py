@@ -0,0 +1,105 @@
+from fastapi import APIRouter, HTTPException, Request
+from typing import Optional, List, Dict, Any
+from pydantic import BaseModel
+from urllib.parse import urlsplit
+import asyncio
+import json
+import os
+
+from dependencies.asgi_client import call_asgi
+
+router = APIRouter(
+    prefix="/batch",
+    tags=["Batch"],
+)
+
+# 한 번에 처리할 수 있는 최대 하위 요청 수
+BATCH_MAX_REQUESTS = int(os.getenv("BATCH_MAX_REQUESTS", "50"))
+# 하위 요청으로 전달하는 배치 요청 헤더 (하위 요청에 같은 헤더가 있으면 하위 요청 값 사용)
+FORWARDED_HEADERS = ("authorization", "accept-language", "x-request-id")
+API_PREFIX = "/api"
+
+class BatchOperation(BaseModel):
+    id: Optional[str] = None
+    method: str = "GET"
+    path: str  # 예: "/golf-courses?page=1" 또는 "/api/maps/MAP-001"
+    body: Optional[Any] = None
+    headers: Optional[Dict[str, str]] = None
+
+class BatchRequest(BaseModel):
+    requests: List[BatchOperation]
+
+def build_sub_request(operation: BatchOperation, forwarded: Dict[str, str]) -> tuple:
+    """하위 요청의 경로, 쿼리, 헤더, 본문 구성 (헤더를 인코딩할 수 없으면 ValueError)"""
+    url = urlsplit(operation.path)
+    path = url.path if url.path.startswith(API_PREFIX + "/") else API_PREFIX + "/" + url.path.lstrip("/")
+
+    headers = dict(forwarded)
+    headers.update({k.lower(): v for k, v in (operation.headers or {}).items()})
+    body = b""
+    if operation.body is not None:
+        body = json.dumps(operation.body, ensure_ascii=False).encode("utf-8")
+        headers.setdefault("content-type", "application/json")
+    headers["content-length"] = str(len(body))
+
+    try:
+        raw_headers = [(k.encode("latin-1"), v.encode("latin-1")) for k, v in headers.items()]
+    except UnicodeEncodeError:
+        raise ValueError("헤더 이름과 값은 latin-1 문자만 사용할 수 있습니다.")
+    return path, url.query.encode("utf-8"), raw_headers, body
+
+async def execute_operation(app, index: int, operation: BatchOperation, forwarded: Dict[str, str]) -> dict:
+    """하위 요청 하나를 앱에 직접 전달하고 결과 반환"""
+    result = {"id": operation.id or str(index), "status": 500, "body": None}
+    try:
+        path, query_string, headers, body = build_sub_request(operation, forwarded)
+    except ValueError as e:
+        result.update(status=400, body={"detail": str(e)})
+        return result
+
+    if path == API_PREFIX + router.prefix or path.startswith(API_PREFIX + router.prefix + "/"):
+        result.update(status=400, body={"detail": "배치 요청은 중첩할 수 없습니다."})
+        return result
+
+    try:
+        status_code, response_headers, response_body = await call_asgi(
+            app, operation.method, path, query_string, headers, body
+        )
+    except Exception as e:
+        result["body"] = {"detail": f"하위 요청 처리 실패: {str(e)}"}
+        return result
+
+    content_type = next((v.decode("latin-1") for k, v in response_headers if k.lower() == b"content-type"), "")
+    result["status"] = status_code
+    if "json" in content_type and response_body:
+        result["body"] = json.loads(response_body)
+    else:
+        result["body"] = response_body.decode("utf-8", errors="replace") if response_body else None
+    return result
+
+@router.post("")
+async def execute_batch(batch: BatchRequest, request: Request):
+    """
+    여러 API 요청을 한 번의 왕복으로 실행
+
+    하위 요청은 같은 프로세스에서 동시에 실행되며, 결과는 요청 순서대로 항목별 상태 코드와 함께 반환된다.
+    """
+    if not batch.requests:
+        raise HTTPException(status_code=400, detail="요청 목록이 비어 있습니다.")
+    if len(batch.requests) > BATCH_MAX_REQUESTS:
+        raise HTTPException(status_code=400, detail=f"한 번에 최대 {BATCH_MAX_REQUESTS}개의 요청만 처리할 수 있습니다.")
+
+    forwarded = {name: request.headers[name] for name in FORWARDED_HEADERS if name in request.headers}
+    results = await asyncio.gather(*[
+        execute_operation(request.app, i, operation, forwarded)
+        for i, operation in enumerate(batch.requests)
+    ])
+
+    return {
+        "success": True,
+        "data": {
+            "items": results,
+            "total": len(results),
+            "failed": sum(1 for r in results if r["status"] >= 400)
+        }
+    }
@@ -2,10 +2,16 @@ from fastapi import APIRouter, HTTPException, Query, Depends
 from typing import List, Optional
 from pydantic import BaseModel
 from datetime import datetime
+import uuid
+
+from dependencies.change_feed import CHANGES_MAX_PAGE_SIZE, CHANGES_PAGE_SIZE, get_changes
+from dependencies.logger import get_logger
+from dependencies.repository import create_repository
 
 router = APIRouter(prefix="/cart-models", tags=["cart-models"])
 
-print("🚗 Cart Models router loaded!")
+logger = get_logger(__name__)
+logger.debug("Cart Models router loaded")
 
 # Cart Model Data Models
 class CartModelSpecs(BaseModel):
@@ -43,8 +49,8 @@ class CartModelListResponse(BaseModel):
     page: int
     totalPages: int
 
-# Mock data storage (in production, this would be a database)
-cart_models_db = [
+# 초기 샘플 데이터
+initial_cart_models = [
     {
         "id": "MODEL-001",
         "modelName": "DY-CART-2024",
@@ -92,34 +98,34 @@ cart_models_db = [
     }
 ]
 
+# 카트 모델 저장소 (json 백엔드는 프로세스 메모리에만 유지)
+cart_model_repository = create_repository(
+    "cart_models",
+    key_field="id",
+    indexes={"status": "status", "modelCode": "modelCode"},
+    search_fields=("modelName", "modelCode"),
+    sort_fields=("modelName", "modelCode", "year", "status", "createdAt", "updatedAt"),
+    initial=initial_cart_models,
+    label="카트 모델"
+)
+
 def filter_cart_models(
     search: Optional[str] = None,
     status: Optional[str] = None,
     sort_by: str = "createdAt",
-    sort_order: str = "desc"
+    sort_order: str = "desc",
+    offset: int = 0,
+    limit: Optional[int] = None
 ):
-    """Filter and sort cart models based on parameters"""
-    filtered = cart_models_db.copy()
-    
-    # Apply search filter
-    if search:
-        search_lower = search.lower()
-        filtered = [
-            model for model in filtered
-            if search_lower in model["modelName"].lower() or 
-               search_lower in model["modelCode"].lower()
-        ]
-    
-    # Apply status filter
-    if status and status != "all":
-        filtered = [model for model in filtered if model["status"] == status]
-    
-    # Apply sorting
-    reverse = sort_order == "desc"
-    if sort_by in ["modelName", "modelCode", "year", "status", "createdAt", "updatedAt"]:
-        filtered.sort(key=lambda x: x.get(sort_by, ""), reverse=reverse)
-    
-    return filtered
+    """Filter and sort cart models based on parameters, returns (items, total)"""
+    return cart_model_repository.query(
+        filters={"status": status if status and status != "all" else None},
+        search=search,
+        sort_by=sort_by,
+        sort_order=sort_order,
+        offset=offset,
+        limit=limit
+    )
 
 @router.get("/")
 async def get_cart_models(
@@ -132,15 +138,9 @@ async def get_cart_models(
 ):
     """Get cart models with pagination and filtering"""
     try:
-        # Filter cart models
-        filtered_models = filter_cart_models(search, status, sortBy, sortOrder)
-        
-        # Apply pagination
-        total = len(filtered_models)
+        # Filter cart models (pagination is applied by the repository)
+        items, total = filter_cart_models(search, status, sortBy, sortOrder, (page - 1) * limit, limit)
         total_pages = (total + limit - 1) // limit
-        start_idx = (page - 1) * limit
-        end_idx = start_idx + limit
-        items = filtered_models[start_idx:end_idx]
         
         return {
             "success": True,
@@ -154,10 +154,18 @@ async def get_cart_models(
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch cart models: {str(e)}")
 
+@router.get("/changes")
+async def get_cart_model_changes(
+    since: Optional[int] = Query(None, ge=0),
+    limit: int = Query(CHANGES_PAGE_SIZE, ge=1, le=CHANGES_MAX_PAGE_SIZE)
+):
+    """Get cart models created/updated/deleted after `since` (current sequence only if omitted)"""
+    return {"success": True, "data": get_changes(cart_model_repository, since, limit)}
+
 @router.get("/{model_id}")
 async def get_cart_model(model_id: str):
     """Get a specific cart model by ID"""
-    model = next((m for m in cart_models_db if m["id"] == model_id), None)
+    model = cart_model_repository.get(model_id)
     if not model:
         raise HTTPException(status_code=404, detail="Cart model not found")
     return {
@@ -169,11 +177,11 @@ async def get_cart_model(model_id: str):
 async def create_cart_model(cart_model: CartModelCreate):
     """Create a new cart model"""
     try:
-        # Generate new ID
-        new_id = f"MODEL-{len(cart_models_db) + 1:03d}"
+        # Generate new ID (count-based numbers collide after deletes and across workers)
+        new_id = f"MODEL-{str(uuid.uuid4())[:8].upper()}"
         
         # Check if model code already exists
-        if any(m["modelCode"] == cart_model.modelCode for m in cart_models_db):
+        if cart_model_repository.find_keys("modelCode", cart_model.modelCode):
             raise HTTPException(status_code=400, detail="Model code already exists")
         
         # Create new cart model
@@ -185,7 +193,7 @@ async def create_cart_model(cart_model: CartModelCreate):
             "updatedAt": now
         }
         
-        cart_models_db.append(new_model)
+        cart_model_repository.insert(new_model)
         return {
             "success": True,
             "data": new_model,
@@ -201,24 +209,22 @@ async def update_cart_model(model_id: str, update_data: CartModelUpdate):
     """Update a cart model"""
     try:
         # Find the model
-        model_idx = next((i for i, m in enumerate(cart_models_db) if m["id"] == model_id), None)
-        if model_idx is None:
+        current_model = cart_model_repository.get(model_id)
+        if current_model is None:
             raise HTTPException(status_code=404, detail="Cart model not found")
         
         # Check if new model code conflicts (if provided)
         if update_data.modelCode:
-            existing = next((m for m in cart_models_db if m["modelCode"] == update_data.modelCode and m["id"] != model_id), None)
+            existing = [key for key in cart_model_repository.find_keys("modelCode", update_data.modelCode) if key != model_id]
             if existing:
                 raise HTTPException(status_code=400, detail="Model code already exists")
         
         # Update the model
-        current_model = cart_models_db[model_idx]
         update_dict = update_data.dict(exclude_unset=True)
         
-        for key, value in update_dict.items():
-            current_model[key] = value
-        
-        current_model["updatedAt"] = datetime.utcnow().isoformat() + "Z"
+        # Build a new record instead of mutating the stored one
+        current_model = {**current_model, **update_dict, "updatedAt": datetime.utcnow().isoformat() + "Z"}
+        cart_model_repository.update(current_model)
         
         return {
             "success": True,
@@ -234,11 +240,9 @@ async def update_cart_model(model_id: str, update_data: CartModelUpdate):
 async def delete_cart_model(model_id: str):
     """Delete a cart model"""
     try:
-        model_idx = next((i for i, m in enumerate(cart_models_db) if m["id"] == model_id), None)
-        if model_idx is None:
+        if cart_model_repository.delete(model_id) is None:
             raise HTTPException(status_code=404, detail="Cart model not found")
         
-        cart_models_db.pop(model_idx)
         return {
             "success": True,
             "message": "카트 모델이 삭제되었습니다."
@@ -257,8 +261,7 @@ async def bulk_delete_cart_models(request: dict):
             raise HTTPException(status_code=400, detail="No IDs provided")
         
         # Remove models with matching IDs
-        global cart_models_db
-        cart_models_db = [m for m in cart_models_db if m["id"] not in ids]
+        cart_model_repository.delete_many(ids)
         
         return {
             "success": True,
@@ -1,12 +1,138 @@
-from fastapi import APIRouter
-from typing import Optional, Dict, Any
-import time
+from fastapi import APIRouter, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+from typing import Optional, Dict, Any, List
+from datetime import datetime, timezone
+import json
+
+from dependencies.battery import BATTERY_RECOMPUTE_INTERVAL, BatteryEstimator, append_battery_sample, parse_timestamp
+from dependencies.change_feed import CHANGES_MAX_PAGE_SIZE, CHANGES_PAGE_SIZE, get_changes
+from dependencies.health import register_warmup
+from dependencies.repository import create_repository
+from dependencies.scheduler import register_periodic
+from dependencies.trajectory import LOCATION_GAP_SECONDS, TrackRecorder
+from routers import golf_course_carts
+from routers.golf_course_carts import golf_course_cart_repository
 
 router = APIRouter(
     prefix="/carts",
     tags=["Carts"],
 )
 
+MAX_TELEMETRY_BATCH = 1000
+# 저잔량 보고서 기본 기준 (주행 가능 거리, km)
+LOW_RANGE_KM = 10
+# 궤적 재생 응답 버퍼 크기
+TRACK_BUFFER_SIZE = 64 * 1024
+# 보관 기간이 지난 위치 이력 조각 삭제 주기 (초)
+TRACK_RETENTION_INTERVAL = 3600
+
+class CartTelemetry(BaseModel):
+    cartId: str
+    batteryLevel: Optional[float] = Field(None, ge=0, le=100)
+    voltage: Optional[float] = None
+    current: Optional[float] = None
+    temperature: Optional[float] = None
+    isCharging: Optional[bool] = None
+    latitude: Optional[float] = Field(None, ge=-90, le=90)
+    longitude: Optional[float] = Field(None, ge=-180, le=180)
+    speed: Optional[float] = Field(None, ge=0)
+    heading: Optional[float] = None
+    recordedAt: Optional[str] = None
+
+class CartTelemetryBatch(BaseModel):
+    items: List[CartTelemetry] = Field(..., max_length=MAX_TELEMETRY_BATCH)
+
+# 카트별 마지막 텔레메트리 (보내지 않은 값은 이전 값 유지, 대시보드 집계는 이 저장소의 변경 피드로 갱신)
+cart_telemetry_repository = create_repository(
+    "cart_telemetry",
+    key_field="cartId",
+    indexes={"golfCourseId": "golfCourseId", "isCharging": "isCharging"},
+    sort_fields=("batteryLevel", "updatedAt"),
+    label="카트 텔레메트리"
+)
+
+# 카트별 궤적 상태 (측정값마다 저장, anchor/마지막 측정값/속도 상자만) / 열린 조각 (점을 남길 때만 저장)
+# / 닫힌 위치 이력 조각 (델타 인코딩, 전체 목록을 파일로 다시 쓰지 않도록 STORAGE_BACKEND와 관계없이 SQLite에 한 행씩 추가)
+cart_track_repository = create_repository(
+    "cart_tracks",
+    key_field="cartId",
+    label="카트 궤적"
+)
+cart_track_open_repository = create_repository(
+    "cart_track_open",
+    key_field="cartId",
+    label="카트 위치 이력 (열린 조각)"
+)
+cart_track_chunk_repository = create_repository(
+    "cart_track_chunks",
+    key_field="id",
+    indexes={"cartId": "cartId"},
+    sort_fields=("startTime",),
+    label="카트 위치 이력",
+    backend="sqlite"
+)
+track_recorder = TrackRecorder(cart_track_repository, cart_track_open_repository, cart_track_chunk_repository)
+# 측정이 끊긴 카트의 열린 조각을 닫아 보관하고, 보관 기간이 지난 조각을 삭제
+register_periodic("track_flush", track_recorder.flush_idle, LOCATION_GAP_SECONDS)
+register_periodic("track_retention", track_recorder.expire, TRACK_RETENTION_INTERVAL)
+
+# 배터리 건강도/주행 가능 거리 (전체 카트를 주기적으로 한 번에 계산하여 보관)
+battery_estimator = BatteryEstimator(cart_telemetry_repository)
+register_warmup("battery_estimates", battery_estimator.recompute)
+register_periodic("battery_estimates", battery_estimator.recompute, BATTERY_RECOMPUTE_INTERVAL)
+
+@router.post("/telemetry")
+async def ingest_cart_telemetry(body: CartTelemetryBatch):
+    """카트 텔레메트리 일괄 수신 (등록되지 않은 카트는 rejected로 반환)"""
+    now = datetime.utcnow().isoformat() + "Z"
+    records: Dict[str, dict] = {}
+    fixes: Dict[str, list] = {}
+    rejected = []
+    for item in body.items:
+        cart = golf_course_cart_repository.get(item.cartId)
+        if cart is None:
+            rejected.append({"cartId": item.cartId, "reason": "등록되지 않은 카트입니다."})
+            continue
+        # 같은 요청 안의 같은 카트는 뒤의 값이 앞의 값을 덮어씀
+        previous = records.get(item.cartId) or cart_telemetry_repository.get(item.cartId) or {}
+        telemetry = item.model_dump(exclude_none=True)
+        records[item.cartId] = {
+            **previous,
+            **telemetry,
+            **append_battery_sample(previous, telemetry, parse_timestamp(item.recordedAt)),
+            "golfCourseId": cart["golfCourseId"],
+            "updatedAt": now
+        }
+        if item.latitude is not None and item.longitude is not None:
+            point = (int(parse_timestamp(item.recordedAt) * 1000), item.latitude, item.longitude)
+            fixes.setdefault(item.cartId, []).append(point)
+
+    cart_telemetry_repository.upsert_many(records.values())
+    # 조각 저장은 이벤트 루프를 막지 않도록 스레드 풀에서 실행
+    await run_in_threadpool(track_recorder.record, fixes)
+    return {
+        "success": True,
+        "data": {
+            "accepted": len(body.items) - len(rejected),
+            "rejected": rejected
+        }
+    }
+
+@router.get("/battery/low-range")
+async def get_low_range_carts(maxRange: float = Query(LOW_RANGE_KM, gt=0), golfCourseId: Optional[str] = None, limit: int = Query(100, ge=1, le=MAX_TELEMETRY_BATCH)):
+    """주행 가능 거리가 maxRange km 미만인 카트 (마지막 배터리 추정 기준, 가까운 순)"""
+    items, total = battery_estimator.low_range(maxRange, golfCourseId, limit)
+    return {
+        "success": True,
+        "data": {
+            "items": items,
+            "total": total,
+            "maxRange": maxRange
+        }
+    }
+
 @router.get("")
 async def get_carts(page: int = 1, limit: int = 20, golfCourseId: Optional[str] = None, status: Optional[str] = None, batteryLevel: Optional[str] = None, search: Optional[str] = None):
     return {
@@ -159,23 +285,49 @@ async def update_cart_status(id: str, body: Dict[Any, Any]):
 
 @router.get("/{id}/battery")
 async def get_cart_battery(id: str):
-    return {
-      "success": True,
-      "data": {
-        "cartId": id,
-        "level": 85,
-        "voltage": 47.8,
-        "current": 0,
-        "temperature": 25.5,
-        "status": "NORMAL",
-        "isCharging": False,
-        "estimatedRange": 35,
-        "estimatedTime": 6.5,
-        "cycles": 125,
-        "health": 95,
-        "lastUpdate": "2024-01-15T15:00:00Z"
-      }
-    }
+    """카트 배터리 상태와 건강도/주행 가능 거리 추정값 (마지막 주기 계산 결과 조회)"""
+    battery = battery_estimator.get(id)
+    if battery is None:
+        return {
+            "success": False,
+            "error": {"code": "NOT_FOUND", "message": "카트 배터리 정보를 찾을 수 없습니다."}
+        }
+    return {"success": True, "data": battery}
+
+@router.get("/{id}/track")
+async def replay_cart_track(id: str, startTime: Optional[datetime] = None, endTime: Optional[datetime] = None):
+    """카트 위치 이력을 NDJSON(한 줄에 한 점, 시각 순)으로 스트리밍 (단순화된 점, 구간과 겹치는 조각만 디코딩)"""
+    def to_ms(value: Optional[datetime], default: int) -> int:
+        if value is None:
+            return default
+        return int((value if value.tzinfo else value.replace(tzinfo=timezone.utc)).timestamp() * 1000)
+
+    points = track_recorder.replay(id, to_ms(startTime, 0), to_ms(endTime, 2 ** 62))
+    if points is None:
+        return {
+            "success": False,
+            "error": {"code": "NOT_FOUND", "message": "카트 위치 이력을 찾을 수 없습니다."}
+        }
+
+    def generate():
+        buffer = []
+        buffered = 0
+        for t, lat, lng in points:
+            line = json.dumps({
+                "time": datetime.fromtimestamp(t / 1000, timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z"),
+                "latitude": lat,
+                "longitude": lng
+            }) + "\n"
+            buffer.append(line)
+            buffered += len(line)
+            if buffered >= TRACK_BUFFER_SIZE:
+                yield "".join(buffer)
+                buffer.clear()
+                buffered = 0
+        if buffer:
+            yield "".join(buffer)
+
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
 
 @router.get("/{id}/location")
 async def get_cart_location(id: str):
@@ -195,106 +347,33 @@ async def get_cart_location(id: str):
       }
     }
 
-# 골프장별 카트 관리 API
+# 골프장별 카트 관리 API (골프장 카트 저장소 사용, 처리는 routers/golf_course_carts.py)
 @router.get("/golf-courses/{golf_course_id}/carts")
 async def get_golf_course_carts(golf_course_id: str, status: Optional[str] = None, modelId: Optional[str] = None):
     """골프장별 카트 목록 조회"""
-    mock_carts = [
-        {
-            "id": "cart-1",
-            "golfCourseId": golf_course_id,
-            "cartNumber": "CART-001",
-            "serialNumber": "DY-2024-001", 
-            "modelId": "model-1",
-            "modelName": "DY-GOLF-STANDARD",
-            "status": "active",
-            "deployedAt": "2024-01-15",
-            "lastMaintenanceAt": "2024-01-10",
-            "notes": "",
-            "createdAt": "2024-01-15T09:00:00Z",
-            "updatedAt": "2024-01-15T09:00:00Z"
-        },
-        {
-            "id": "cart-2",
-            "golfCourseId": golf_course_id, 
-            "cartNumber": "CART-002",
-            "serialNumber": "DY-2024-002",
-            "modelId": "model-2",
-            "modelName": "DY-GOLF-PREMIUM",
-            "status": "maintenance",
-            "deployedAt": "2024-02-01",
-            "lastMaintenanceAt": "2024-02-15",
-            "notes": "정기점검 중",
-            "createdAt": "2024-02-01T09:00:00Z",
-            "updatedAt": "2024-02-15T14:30:00Z"
-        }
-    ]
-    
-    # 필터링
-    if status and status != 'all':
-        mock_carts = [cart for cart in mock_carts if cart['status'] == status]
-    
-    if modelId:
-        mock_carts = [cart for cart in mock_carts if cart['modelId'] == modelId]
-    
-    return {
-        "success": True,
-        "data": {
-            "items": mock_carts,
-            "total": len(mock_carts),
-            "stats": {
-                "total": 2,
-                "active": 1,
-                "maintenance": 1,
-                "broken": 0,
-                "inactive": 0
-            }
-        }
-    }
+    return await golf_course_carts.get_golf_course_carts(golf_course_id, status, modelId)
+
+@router.get("/golf-courses/{golf_course_id}/carts/changes")
+async def get_golf_course_cart_changes(golf_course_id: str, since: Optional[int] = Query(None, ge=0), limit: int = Query(CHANGES_PAGE_SIZE, ge=1, le=CHANGES_MAX_PAGE_SIZE)):
+    """since 이후 생성/수정/삭제된 골프장 카트 (번호는 골프장 카트 저장소 공통, 삭제는 골프장 구분 없이 포함)"""
+    return {"success": True, "data": get_changes(
+        golf_course_cart_repository, since, limit,
+        include=lambda cart: cart.get('golfCourseId') == golf_course_id
+    )}
 
 @router.post("/golf-courses/{golf_course_id}/carts", status_code=201)
-async def add_cart_to_golf_course(golf_course_id: str, body: Dict[Any, Any]):
+async def add_cart_to_golf_course(golf_course_id: str, cart_data: golf_course_carts.AddCartToGolfCourseRequest):
     """골프장에 카트 추가"""
-    new_cart = {
-        "id": f"cart-{int(time.time())}",
-        "golfCourseId": golf_course_id,
-        "cartNumber": body.get("cartNumber"),
-        "serialNumber": body.get("serialNumber"),
-        "modelId": body.get("modelId"),
-        "modelName": "DY-GOLF-STANDARD",
-        "status": "active",
-        "deployedAt": "2024-01-15",
-        "lastMaintenanceAt": None,
-        "notes": body.get("notes", ""),
-        "createdAt": "2024-01-15T09:00:00Z",
-        "updatedAt": "2024-01-15T09:00:00Z"
-    }
-    
-    return {
-        "success": True,
-        "data": new_cart,
-        "message": "카트가 골프장에 추가되었습니다."
-    }
+    return await golf_course_carts.add_cart_to_golf_course(golf_course_id, cart_data)
 
 @router.patch("/golf-courses/{golf_course_id}/carts/{cart_id}/status")
-async def update_golf_course_cart_status(golf_course_id: str, cart_id: str, body: Dict[Any, Any]):
+async def update_golf_course_cart_status(golf_course_id: str, cart_id: str, status_data: golf_course_carts.UpdateCartStatusRequest):
     """골프장별 카트 상태 업데이트"""
-    return {
-        "success": True,
-        "data": {
-            "id": cart_id,
-            "golfCourseId": golf_course_id,
-            "status": body.get("status"),
-            "updatedAt": "2024-01-15T15:00:00Z"
-        },
-        "message": "카트 상태가 업데이트되었습니다."
-    }
+    return await golf_course_carts.update_cart_status(golf_course_id, cart_id, status_data)
 
 @router.delete("/golf-courses/{golf_course_id}/carts/{cart_id}")
 async def remove_cart_from_golf_course(golf_course_id: str, cart_id: str):
-    """골프장에서 카트 제거"""
-    return {
-        "success": True,
-        "message": "카트가 골프장에서 제거되었습니다."
-    }
-
+    """골프장에서 카트 제거 (마지막 텔레메트리도 삭제하여 대시보드 배터리 집계에서 제외)"""
+    result = await golf_course_carts.remove_cart_from_golf_course(golf_course_id, cart_id)
+    cart_telemetry_repository.delete(cart_id)
+    return result
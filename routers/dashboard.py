@@ -0,0 +1,121 @@
+from fastapi import APIRouter
+from typing import Any, Dict, Optional
+from datetime import datetime
+import os
+
+from dependencies.aggregates import GroupCounts
+from dependencies.health import register_warmup
+from dependencies.repository import get_path
+from dependencies.scheduler import register_periodic
+from routers.carts import cart_telemetry_repository
+from routers.golf_course_carts import CART_STATUSES, golf_course_cart_repository
+from routers.maps import get_golf_course_name, map_repository
+
+router = APIRouter(
+    prefix="/dashboard",
+    tags=["Dashboard"],
+)
+
+# 환경변수에서 설정값 가져오기 (집계 반영 주기, 초)
+DASHBOARD_REFRESH_INTERVAL = float(os.getenv("DASHBOARD_REFRESH_INTERVAL", "1"))
+
+# 배터리 잔량 구간 (상한 미만이면 해당 구간, 나머지는 high), 텔레메트리가 없는 카트는 unknown
+BATTERY_BANDS = ((20, "critical"), (50, "low"), (80, "medium"))
+BATTERY_BAND_NAMES = tuple(name for _, name in BATTERY_BANDS) + ("high", "unknown")
+
+def battery_band(level: Optional[float]) -> str:
+    if level is None:
+        return "unknown"
+    for upper, name in BATTERY_BANDS:
+        if level < upper:
+            return name
+    return "high"
+
+# 골프장별 집계 (골프장이 없는 레코드는 제외)
+cart_counts = GroupCounts(
+    "dashboard_carts", golf_course_cart_repository,
+    lambda cart: (cart["golfCourseId"], {"status": cart.get("status")}) if cart.get("golfCourseId") else None
+)
+telemetry_counts = GroupCounts(
+    "dashboard_telemetry", cart_telemetry_repository,
+    lambda item: (item["golfCourseId"], {
+        "battery": battery_band(item.get("batteryLevel")),
+        "charging": bool(item.get("isCharging"))
+    }) if item.get("golfCourseId") else None
+)
+map_counts = GroupCounts(
+    "dashboard_maps", map_repository,
+    lambda item: (item["connectedGolfCourseId"], {"status": get_path(item, "mapStatus.status")}) if item.get("connectedGolfCourseId") else None
+)
+
+def warm_dashboard():
+    for aggregate in (cart_counts, telemetry_counts, map_counts):
+        aggregate.refresh()
+
+register_warmup("dashboard", warm_dashboard)
+# 텔레메트리처럼 자주 바뀌는 저장소도 변경 기록에서 밀려나기 전에 반영하여 요약 요청이 전체 재계산을 하지 않도록 함
+register_periodic("dashboard", warm_dashboard, DASHBOARD_REFRESH_INTERVAL)
+
+def course_summary(cart_total: int, cart_dims: dict, telemetry_total: int, telemetry_dims: dict, map_total: int, map_dims: dict) -> Dict[str, Any]:
+    cart_status = cart_dims.get("status", {})
+    battery = {name: 0 for name in BATTERY_BAND_NAMES}
+    battery.update(telemetry_dims.get("battery", {}))
+    # 텔레메트리를 한 번도 보내지 않은 카트
+    battery["unknown"] += max(cart_total - telemetry_total, 0)
+    return {
+        "carts": {
+            "total": cart_total,
+            "byStatus": {**{status: 0 for status in CART_STATUSES}, **cart_status}
+        },
+        "battery": battery,
+        "charging": telemetry_dims.get("charging", {}).get(True, 0),
+        "maps": {
+            "total": map_total,
+            "byStatus": map_dims.get("status", {})
+        }
+    }
+
+@router.get("/summary")
+async def get_dashboard_summary(golfCourseId: Optional[str] = None):
+    """골프장별/전체 카트 상태, 배터리 구간, 충전 중 카트, 맵 상태 개수 (목록을 순회하지 않고 미리 집계한 값)"""
+    cart_totals, cart_groups = cart_counts.snapshot()
+    telemetry_totals, telemetry_groups = telemetry_counts.snapshot()
+    map_totals, map_groups = map_counts.snapshot()
+
+    course_ids = [golfCourseId] if golfCourseId else sorted(set(cart_totals) | set(telemetry_totals) | set(map_totals))
+    courses = []
+    for course_id in course_ids:
+        courses.append({
+            "golfCourseId": course_id,
+            "golfCourseName": get_golf_course_name(course_id),
+            **course_summary(
+                cart_totals.get(course_id, 0), cart_groups.get(course_id, {}),
+                telemetry_totals.get(course_id, 0), telemetry_groups.get(course_id, {}),
+                map_totals.get(course_id, 0), map_groups.get(course_id, {})
+            )
+        })
+
+    # 전체 합계는 골프장별 값을 더함
+    totals = {
+        "carts": {"total": 0, "byStatus": {}},
+        "battery": {name: 0 for name in BATTERY_BAND_NAMES},
+        "charging": 0,
+        "maps": {"total": 0, "byStatus": {}}
+    }
+    for course in courses:
+        for section in ("carts", "maps"):
+            totals[section]["total"] += course[section]["total"]
+            for status, count in course[section]["byStatus"].items():
+                totals[section]["byStatus"][status] = totals[section]["byStatus"].get(status, 0) + count
+        for name, count in course["battery"].items():
+            totals["battery"][name] += count
+        totals["charging"] += course["charging"]
+
+    return {
+        "success": True,
+        "data": {
+            "totals": {"golfCourses": len(courses), **totals},
+            "golfCourses": courses,
+            "generatedAt": datetime.utcnow().isoformat() + "Z"
+        }
+    }
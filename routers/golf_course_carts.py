@@ -1,6 +1,11 @@
 from fastapi import APIRouter, HTTPException
 from typing import Optional, Dict, Any, List
 from pydantic import BaseModel
+from datetime import datetime
+import uuid
+
+from dependencies.repository import create_repository
+from routers.cart_models import cart_model_repository
 
 router = APIRouter(
     tags=["Golf Course Carts"],
@@ -79,30 +84,47 @@ mock_golf_course_carts = {
     ]
 }
 
+# 골프장 카트 저장소 (골프장별 목록 대신 golfCourseId 인덱스로 조회)
+golf_course_cart_repository = create_repository(
+    "golf_course_carts",
+    key_field="id",
+    indexes={"golfCourseId": "golfCourseId", "status": "status", "modelId": "modelId", "cartNumber": "cartNumber", "serialNumber": "serialNumber"},
+    search_fields=("cartNumber", "serialNumber"),
+    sort_fields=("cartNumber", "status", "deployedAt", "createdAt", "updatedAt"),
+    initial=[cart for carts in mock_golf_course_carts.values() for cart in carts],
+    label="골프장 카트"
+)
+
+CART_STATUSES = ("active", "maintenance", "broken", "inactive")
+
+def find_cart_model(model_id: str) -> Optional[dict]:
+    """카트 모델 저장소, 없으면 기본 모델 목록에서 조회"""
+    return cart_model_repository.get(model_id) or next((m for m in mock_cart_models if m['id'] == model_id), None)
+
+def find_golf_course_cart(golf_course_id: str, cart_id: str) -> Optional[dict]:
+    cart = golf_course_cart_repository.get(cart_id)
+    return cart if cart and cart['golfCourseId'] == golf_course_id else None
+
 @router.get("/golf-courses/{golf_course_id}/carts")
 async def get_golf_course_carts(golf_course_id: str, status: Optional[str] = None, modelId: Optional[str] = None):
     """골프장별 카트 목록 조회"""
-    carts = mock_golf_course_carts.get(golf_course_id, [])
-    
-    # 필터링
-    if status and status != 'all':
-        carts = [cart for cart in carts if cart['status'] == status]
+    carts, total = golf_course_cart_repository.query(filters={
+        "golfCourseId": golf_course_id,
+        "status": status if status and status != 'all' else None,
+        "modelId": modelId or None
+    })
     
-    if modelId:
-        carts = [cart for cart in carts if cart['modelId'] == modelId]
+    # 상태별 개수는 인덱스로 계산
+    stats = {"total": golf_course_cart_repository.count({"golfCourseId": golf_course_id})}
+    for cart_status in CART_STATUSES:
+        stats[cart_status] = golf_course_cart_repository.count({"golfCourseId": golf_course_id, "status": cart_status})
     
     return {
         "success": True,
         "data": {
             "items": carts,
-            "total": len(carts),
-            "stats": {
-                "total": len(mock_golf_course_carts.get(golf_course_id, [])),
-                "active": len([c for c in mock_golf_course_carts.get(golf_course_id, []) if c['status'] == 'active']),
-                "maintenance": len([c for c in mock_golf_course_carts.get(golf_course_id, []) if c['status'] == 'maintenance']),
-                "broken": len([c for c in mock_golf_course_carts.get(golf_course_id, []) if c['status'] == 'broken']),
-                "inactive": len([c for c in mock_golf_course_carts.get(golf_course_id, []) if c['status'] == 'inactive'])
-            }
+            "total": total,
+            "stats": stats
         }
     }
 
@@ -110,39 +132,37 @@ async def get_golf_course_carts(golf_course_id: str, status: Optional[str] = Non
 async def add_cart_to_golf_course(golf_course_id: str, cart_data: AddCartToGolfCourseRequest):
     """골프장에 카트 추가"""
     # 모델 정보 조회
-    model = next((m for m in mock_cart_models if m['id'] == cart_data.modelId), None)
+    model = find_cart_model(cart_data.modelId)
     if not model:
         raise HTTPException(status_code=400, detail="유효하지 않은 카트 모델입니다.")
     
     # 카트 번호 중복 검사
-    existing_carts = mock_golf_course_carts.get(golf_course_id, [])
-    if any(cart['cartNumber'] == cart_data.cartNumber for cart in existing_carts):
+    if golf_course_cart_repository.count({"golfCourseId": golf_course_id, "cartNumber": cart_data.cartNumber}):
         raise HTTPException(status_code=400, detail="이미 존재하는 카트 번호입니다.")
     
     # 일련번호 중복 검사
-    if any(cart['serialNumber'] == cart_data.serialNumber for cart in existing_carts):
+    if golf_course_cart_repository.count({"golfCourseId": golf_course_id, "serialNumber": cart_data.serialNumber}):
         raise HTTPException(status_code=400, detail="이미 존재하는 일련번호입니다.")
     
     # 새 카트 생성
+    now = datetime.utcnow().isoformat() + "Z"
     new_cart = {
-        "id": f"cart-{len(existing_carts) + 1}",
+        "id": f"cart-{str(uuid.uuid4())[:8]}",
         "golfCourseId": golf_course_id,
         "cartNumber": cart_data.cartNumber,
         "serialNumber": cart_data.serialNumber,
         "modelId": cart_data.modelId,
         "modelName": model['modelName'],
         "status": "active",
-        "deployedAt": "2024-01-15",
+        "deployedAt": now[:10],
         "lastMaintenanceAt": None,
         "notes": cart_data.notes or "",
-        "createdAt": "2024-01-15T09:00:00Z",
-        "updatedAt": "2024-01-15T09:00:00Z"
+        "createdAt": now,
+        "updatedAt": now
     }
     
-    # 목록에 추가
-    if golf_course_id not in mock_golf_course_carts:
-        mock_golf_course_carts[golf_course_id] = []
-    mock_golf_course_carts[golf_course_id].append(new_cart)
+    # 저장소에 추가
+    golf_course_cart_repository.insert(new_cart)
     
     return {
         "success": True,
@@ -153,33 +173,29 @@ async def add_cart_to_golf_course(golf_course_id: str, cart_data: AddCartToGolfC
 @router.patch("/golf-courses/{golf_course_id}/carts/{cart_id}/status")
 async def update_cart_status(golf_course_id: str, cart_id: str, status_data: UpdateCartStatusRequest):
     """카트 상태 업데이트"""
-    carts = mock_golf_course_carts.get(golf_course_id, [])
-    cart_index = next((i for i, cart in enumerate(carts) if cart['id'] == cart_id), None)
+    cart = find_golf_course_cart(golf_course_id, cart_id)
     
-    if cart_index is None:
+    if cart is None:
         raise HTTPException(status_code=404, detail="카트를 찾을 수 없습니다.")
     
-    # 상태 업데이트
-    carts[cart_index]['status'] = status_data.status
-    carts[cart_index]['updatedAt'] = "2024-01-15T15:00:00Z"
+    # 상태 업데이트 (저장소 레코드를 직접 수정하지 않고 새 레코드로 교체)
+    cart = {**cart, 'status': status_data.status, 'updatedAt': datetime.utcnow().isoformat() + "Z"}
+    golf_course_cart_repository.update(cart)
     
     return {
         "success": True,
-        "data": carts[cart_index],
+        "data": cart,
         "message": "카트 상태가 업데이트되었습니다."
     }
 
 @router.delete("/golf-courses/{golf_course_id}/carts/{cart_id}")
 async def remove_cart_from_golf_course(golf_course_id: str, cart_id: str):
     """골프장에서 카트 제거"""
-    carts = mock_golf_course_carts.get(golf_course_id, [])
-    cart_index = next((i for i, cart in enumerate(carts) if cart['id'] == cart_id), None)
-    
-    if cart_index is None:
+    if find_golf_course_cart(golf_course_id, cart_id) is None:
         raise HTTPException(status_code=404, detail="카트를 찾을 수 없습니다.")
     
     # 카트 제거
-    removed_cart = carts.pop(cart_index)
+    removed_cart = golf_course_cart_repository.delete(cart_id)
     
     return {
         "success": True,
@@ -1,8 +1,15 @@
-from fastapi import APIRouter
-from typing import Optional, Dict, Any
+from fastapi import APIRouter, Query, Request
+from fastapi.responses import StreamingResponse
+from typing import Optional, Dict, Any, List
 from datetime import datetime
 import json
 import os
+import uuid
+
+from dependencies.change_feed import CHANGES_MAX_PAGE_SIZE, CHANGES_PAGE_SIZE, get_changes
+from dependencies.merge_patch import apply_merge_patch, diff_paths
+from dependencies.projection import get_projection, invalid_fields_error
+from dependencies.repository import create_repository
 
 router = APIRouter(
     prefix="/golf-courses",
@@ -12,6 +19,13 @@ router = APIRouter(
 # 데이터 파일 경로
 DATA_FILE = 'golf_courses_data.json'
 
+# NDJSON 가져오기: 이 줄 수마다 한 번씩 파일에 저장
+IMPORT_CHUNK_SIZE = int(os.getenv("GOLF_COURSE_IMPORT_CHUNK_SIZE", "500"))
+# 응답에 포함할 최대 오류 수
+IMPORT_MAX_ERRORS = int(os.getenv("GOLF_COURSE_IMPORT_MAX_ERRORS", "1000"))
+# 내보내기 시 한 번에 전송하는 최대 바이트 수
+EXPORT_BUFFER_SIZE = 64 * 1024
+
 # 초기 샘플 데이터 - 프론트엔드 타입에 맞는 형식
 initial_golf_courses = [
     {
@@ -117,80 +131,23 @@ initial_golf_courses = [
     }
 ]
 
-# 데이터 로드/저장 함수들
-def load_golf_courses():
-    """파일에서 골프장 데이터 로드"""
-    if os.path.exists(DATA_FILE):
-        try:
-            with open(DATA_FILE, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (json.JSONDecodeError, IOError):
-            print(f"⚠️ {DATA_FILE} 파일 읽기 실패, 초기 데이터로 복원")
-    
-    # 파일이 없거나 읽기 실패 시 초기 데이터 생성
-    save_golf_courses(initial_golf_courses)
-    return initial_golf_courses
-
-def save_golf_courses(courses):
-    """파일에 골프장 데이터 저장"""
-    try:
-        with open(DATA_FILE, 'w', encoding='utf-8') as f:
-            json.dump(courses, f, ensure_ascii=False, indent=2)
-        print(f"💾 골프장 데이터를 {DATA_FILE}에 저장했습니다.")
-    except IOError as e:
-        print(f"❌ 데이터 저장 실패: {e}")
-
-# 전역 데이터 (서버 시작시 로드)
-sample_golf_courses = load_golf_courses()
+# 골프장 저장소 (STORAGE_BACKEND에 따라 JSON 파일 또는 SQLite)
+golf_course_repository = create_repository(
+    "golf_courses",
+    key_field="id",
+    indexes={"status": "status", "courseCode": "courseCode", "courseName": "courseName"},
+    search_fields=("courseName", "courseCode", "address.address1"),
+    sort_fields=("courseName", "courseCode", "status", "totalCarts", "activeCarts", "createdAt", "lastModified"),
+    data_file=DATA_FILE,
+    initial=initial_golf_courses,
+    label="골프장"
+)
 
-@router.get("")
-async def get_golf_courses(page: int = 1, limit: int = 20, search: Optional[str] = None, status: Optional[str] = None, sortBy: Optional[str] = None, sortOrder: Optional[str] = None):
-    # 필터링 로직
-    filtered_courses = sample_golf_courses.copy()
-    
-    # 상태 필터
-    if status and status != 'all':
-        filtered_courses = [course for course in filtered_courses if course['status'] == status]
-    
-    # 검색 필터
-    if search:
-        search_lower = search.lower()
-        filtered_courses = [
-            course for course in filtered_courses 
-            if search_lower in course['courseName'].lower() or 
-               search_lower in course['courseCode'].lower() or
-               search_lower in course['address']['address1'].lower()
-        ]
-    
-    # 전체 개수
-    total = len(filtered_courses)
-    total_pages = (total + limit - 1) // limit
-    
-    # 페이지네이션
-    start = (page - 1) * limit
-    end = start + limit
-    items = filtered_courses[start:end]
-    
+def build_golf_course(body: Dict[Any, Any]) -> dict:
+    """요청 데이터에 기본값을 채워 새 골프장 데이터 생성"""
+    now = datetime.now().isoformat() + "Z"
     return {
-        "success": True,
-        "data": {
-            "items": items,
-            "total": total,
-            "page": page,
-            "limit": limit,
-            "totalPages": total_pages
-        }
-    }
-
-@router.post("", status_code=201)
-async def create_golf_course(body: Dict[Any, Any]):
-    # 새로운 ID 생성
-    import uuid
-    new_id = f"GC-{str(uuid.uuid4())[:8].upper()}"
-    
-    # 기본값으로 채워진 새로운 골프장 데이터 생성
-    new_course = {
-        "id": new_id,
+        "id": body.get("id") or f"GC-{str(uuid.uuid4())[:8].upper()}",
         "courseName": body.get("courseName", ""),
         "courseNameEn": body.get("courseNameEn", ""),
         "courseCode": body.get("courseCode", ""),
@@ -239,13 +196,49 @@ async def create_golf_course(body: Dict[Any, Any]):
         "totalCarts": body.get("totalCarts", 0),
         "activeCarts": body.get("activeCarts", 0),
         "status": body.get("status", "active"),
-        "lastModified": datetime.now().isoformat() + "Z",
-        "createdAt": datetime.now().isoformat() + "Z"
+        "lastModified": now,
+        "createdAt": body.get("createdAt", now)
     }
+
+@router.get("")
+async def get_golf_courses(page: int = 1, limit: int = 20, search: Optional[str] = None, status: Optional[str] = None, sortBy: Optional[str] = None, sortOrder: Optional[str] = None, fields: Optional[str] = None):
+    # fields: 응답에 포함할 경로 (예: courseName,courseCode,status,totalCarts,activeCarts)
+    try:
+        project = get_projection(fields)
+    except ValueError as e:
+        return invalid_fields_error(e)
+
+    # 상태 필터는 인덱스, 검색/정렬/페이지네이션은 저장소에서 처리
+    items, total = golf_course_repository.query(
+        filters={"status": status if status and status != 'all' else None},
+        search=search,
+        sort_by=sortBy,
+        sort_order=sortOrder or "asc",
+        offset=(page - 1) * limit,
+        limit=limit
+    )
+    total_pages = (total + limit - 1) // limit
+    if project:
+        items = [project(item) for item in items]
     
-    # 메모리와 파일에 저장
-    sample_golf_courses.append(new_course)
-    save_golf_courses(sample_golf_courses)
+    return {
+        "success": True,
+        "data": {
+            "items": items,
+            "total": total,
+            "page": page,
+            "limit": limit,
+            "totalPages": total_pages
+        }
+    }
+
+@router.post("", status_code=201)
+async def create_golf_course(body: Dict[Any, Any]):
+    # 기본값으로 채워진 새로운 골프장 데이터 생성 (ID는 서버에서 생성)
+    new_course = build_golf_course({**body, "id": None})
+    
+    # 저장소에 저장
+    golf_course_repository.insert(new_course)
     
     return {
         "success": True,
@@ -256,10 +249,7 @@ async def create_golf_course(body: Dict[Any, Any]):
 # 중복 확인 엔드포인트들
 @router.get("/check-name")
 async def check_name_duplicate(name: str, excludeId: Optional[str] = None):
-    is_duplicate = any(
-        course["courseName"] == name and course["id"] != excludeId
-        for course in sample_golf_courses
-    )
+    is_duplicate = any(course_id != excludeId for course_id in golf_course_repository.find_keys("courseName", name))
     return {
         "success": True,
         "data": {
@@ -269,10 +259,7 @@ async def check_name_duplicate(name: str, excludeId: Optional[str] = None):
 
 @router.get("/check-code")
 async def check_code_duplicate(code: str, excludeId: Optional[str] = None):
-    is_duplicate = any(
-        course["courseCode"] == code and course["id"] != excludeId
-        for course in sample_golf_courses
-    )
+    is_duplicate = any(course_id != excludeId for course_id in golf_course_repository.find_keys("courseCode", code))
     return {
         "success": True,
         "data": {
@@ -292,10 +279,130 @@ async def generate_code():
         }
     }
 
+@router.get("/changes")
+async def get_golf_course_changes(since: Optional[int] = Query(None, ge=0), limit: int = Query(CHANGES_PAGE_SIZE, ge=1, le=CHANGES_MAX_PAGE_SIZE)):
+    """since 이후 생성/수정/삭제된 골프장 (since 없으면 현재 번호만)"""
+    return {"success": True, "data": get_changes(golf_course_repository, since, limit)}
+
+# NDJSON 대량 내보내기/가져오기
+@router.get("/export")
+async def export_golf_courses(status: Optional[str] = None):
+    """골프장 목록을 NDJSON(한 줄에 한 골프장)으로 스트리밍"""
+    def generate():
+        buffer = []
+        buffered = 0
+        # 저장소에서 순차적으로 읽으므로 전체 응답을 메모리에 만들지 않음
+        for course in golf_course_repository.iter_all():
+            if status and status != 'all' and course.get('status') != status:
+                continue
+            line = json.dumps(course, ensure_ascii=False) + "\n"
+            buffer.append(line)
+            buffered += len(line)
+            if buffered >= EXPORT_BUFFER_SIZE:
+                yield "".join(buffer)
+                buffer.clear()
+                buffered = 0
+        if buffer:
+            yield "".join(buffer)
+
+    return StreamingResponse(
+        generate(),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": 'attachment; filename="golf-courses.ndjson"'}
+    )
+
+def validate_import_line(data: Any, pending_codes: Dict[str, Optional[str]]) -> Optional[str]:
+    """가져오기 한 줄 검증, 오류 메시지 반환 (정상이면 None)"""
+    if not isinstance(data, dict):
+        return "골프장 데이터는 JSON 객체여야 합니다."
+    for field in ("courseName", "courseCode"):
+        if not isinstance(data.get(field), str) or not data[field].strip():
+            return f"{field} 값이 필요합니다."
+    if data.get("id") is not None and not isinstance(data["id"], str):
+        return "id는 문자열이어야 합니다."
+    # 같은 묶음에서 먼저 처리된 줄의 코드도 중복 검사에 포함
+    if data["courseCode"] in pending_codes:
+        owner_ids = [pending_codes[data["courseCode"]]]
+    else:
+        owner_ids = golf_course_repository.find_keys("courseCode", data["courseCode"])
+    if any(owner_id != data.get("id") for owner_id in owner_ids):
+        return f"이미 사용 중인 골프장 코드입니다: {data['courseCode']}"
+    return None
+
+def apply_import_chunk(lines: List[tuple], result: dict):
+    """NDJSON 줄 묶음을 검증/반영하고 묶음당 한 번 저장"""
+    pending: Dict[str, dict] = {}
+    pending_codes: Dict[str, Optional[str]] = {}
+    for line_number, raw_line in lines:
+        try:
+            data = json.loads(raw_line)
+            error = validate_import_line(data, pending_codes)
+        except json.JSONDecodeError as e:
+            error = f"JSON 파싱 실패: {e.msg}"
+        except UnicodeDecodeError:
+            error = "UTF-8로 인코딩된 줄이 아닙니다."
+        except ValueError as e:
+            error = f"JSON 파싱 실패: {e}"
+
+        if error:
+            result["failed"] += 1
+            if len(result["errors"]) < IMPORT_MAX_ERRORS:
+                result["errors"].append({"line": line_number, "message": error})
+            continue
+
+        existing = pending.get(data.get("id")) or golf_course_repository.get(data.get("id"))
+        if existing:
+            course = {**existing, **data, "lastModified": datetime.now().isoformat() + "Z"}
+            result["updated"] += 1
+        else:
+            course = build_golf_course(data)
+            result["created"] += 1
+        pending[course["id"]] = course
+        pending_codes[course["courseCode"]] = course["id"]
+
+    if pending:
+        golf_course_repository.upsert_many(pending.values())
+    result["chunks"] += 1
+
+@router.post("/import")
+async def import_golf_courses(request: Request):
+    """
+    NDJSON 스트림으로 골프장 대량 등록/수정
+
+    id가 기존 골프장과 일치하면 수정, 아니면 새로 생성한다.
+    요청 본문을 일정 줄 수 단위로 처리하여 묶음마다 한 번만 저장하고, 줄 단위 오류를 반환한다.
+    """
+    result = {"created": 0, "updated": 0, "failed": 0, "chunks": 0, "errors": []}
+    pending: List[tuple] = []
+    remainder = b""
+    line_number = 0
+
+    async for chunk in request.stream():
+        lines = (remainder + chunk).split(b"\n")
+        remainder = lines.pop()
+        for raw_line in lines:
+            line_number += 1
+            if raw_line.strip():
+                pending.append((line_number, raw_line))
+            if len(pending) >= IMPORT_CHUNK_SIZE:
+                apply_import_chunk(pending, result)
+                pending = []
+
+    if remainder.strip():
+        pending.append((line_number + 1, remainder))
+    if pending:
+        apply_import_chunk(pending, result)
+
+    return {
+        "success": True,
+        "data": result,
+        "message": f"{result['created']}개 생성, {result['updated']}개 수정, {result['failed']}개 실패"
+    }
+
 @router.get("/{id}")
 async def get_golf_course_details(id: str):
     # 해당 ID의 골프장 찾기
-    course = next((course for course in sample_golf_courses if course["id"] == id), None)
+    course = golf_course_repository.get(id)
     
     if not course:
         return {
@@ -311,24 +418,51 @@ async def get_golf_course_details(id: str):
         "data": course
     }
 
+def save_golf_course_changes(course: dict, updated_course: dict) -> dict:
+    """바뀐 경로만 저장 (바뀐 값이 없으면 저장하지 않고 기존 레코드 반환)"""
+    updated_course["id"] = course["id"]
+    paths = diff_paths(course, updated_course)
+    if not paths:
+        return course
+    updated_course["lastModified"] = datetime.now().isoformat() + "Z"
+    if ("lastModified",) not in paths:
+        paths.append(("lastModified",))
+    return golf_course_repository.patch(updated_course, paths)
+
 @router.put("/{id}")
 async def update_golf_course(id: str, body: Dict[Any, Any]):
     # 해당 ID의 골프장 찾기 및 업데이트
-    for i, course in enumerate(sample_golf_courses):
-        if course["id"] == id:
-            # 기존 데이터와 새 데이터 병합
-            updated_course = course.copy()
-            updated_course.update(body)
-            updated_course["lastModified"] = datetime.now().isoformat() + "Z"
-            
-            sample_golf_courses[i] = updated_course
-            save_golf_courses(sample_golf_courses)
-            
-            return {
-                "success": True,
-                "data": updated_course,
-                "message": "골프장 정보가 수정되었습니다."
-            }
+    course = golf_course_repository.get(id)
+    if course:
+        # 기존 데이터와 새 데이터 병합 (최상위 키 단위 교체)
+        updated_course = save_golf_course_changes(course, {**course, **body})
+        
+        return {
+            "success": True,
+            "data": updated_course,
+            "message": "골프장 정보가 수정되었습니다."
+        }
+    
+    return {
+        "success": False,
+        "error": {
+            "code": "NOT_FOUND",
+            "message": "골프장을 찾을 수 없습니다."
+        }
+    }
+
+@router.patch("/{id}")
+async def patch_golf_course(id: str, body: Dict[Any, Any]):
+    """JSON Merge Patch(RFC 7386)로 바꿀 경로만 전송 (null은 삭제, 중첩 객체는 하위 키끼리 병합)"""
+    course = golf_course_repository.get(id)
+    if course:
+        updated_course = save_golf_course_changes(course, apply_merge_patch(course, body))
+        
+        return {
+            "success": True,
+            "data": updated_course,
+            "message": "골프장 정보가 수정되었습니다." if updated_course is not course else "변경된 내용이 없습니다."
+        }
     
     return {
         "success": False,
@@ -341,14 +475,11 @@ async def update_golf_course(id: str, body: Dict[Any, Any]):
 @router.delete("/{id}")
 async def delete_golf_course(id: str):
     # 해당 ID의 골프장 삭제
-    for i, course in enumerate(sample_golf_courses):
-        if course["id"] == id:
-            sample_golf_courses.pop(i)
-            save_golf_courses(sample_golf_courses)
-            return {
-                "success": True,
-                "message": "골프장이 삭제되었습니다."
-            }
+    if golf_course_repository.delete(id):
+        return {
+            "success": True,
+            "message": "골프장이 삭제되었습니다."
+        }
     
     return {
         "success": False,
@@ -361,15 +492,7 @@ async def delete_golf_course(id: str):
 @router.post("/bulk-delete")
 async def bulk_delete_golf_courses(body: Dict[str, list]):
     ids = body.get("ids", [])
-    deleted_count = 0
-    
-    # 역순으로 삭제 (인덱스 변경 방지)
-    for i in range(len(sample_golf_courses) - 1, -1, -1):
-        if sample_golf_courses[i]["id"] in ids:
-            sample_golf_courses.pop(i)
-            deleted_count += 1
-    
-    save_golf_courses(sample_golf_courses)
+    deleted_count = golf_course_repository.delete_many(ids)
     
     return {
         "success": True,
@@ -380,17 +503,17 @@ async def bulk_delete_golf_courses(body: Dict[str, list]):
 async def update_golf_course_status(id: str, body: Dict[str, str]):
     status = body.get("status")
     
-    for i, course in enumerate(sample_golf_courses):
-        if course["id"] == id:
-            sample_golf_courses[i]["status"] = status
-            sample_golf_courses[i]["lastModified"] = datetime.now().isoformat() + "Z"
-            save_golf_courses(sample_golf_courses)
-            
-            return {
-                "success": True,
-                "data": sample_golf_courses[i],
-                "message": "골프장 상태가 변경되었습니다."
-            }
+    course = golf_course_repository.get(id)
+    if course:
+        # 저장소 레코드를 직접 수정하지 않고 새 레코드로 교체 (저장 실패 시 메모리 값이 바뀌지 않음)
+        course = {**course, "status": status, "lastModified": datetime.now().isoformat() + "Z"}
+        golf_course_repository.update(course)
+        
+        return {
+            "success": True,
+            "data": course,
+            "message": "골프장 상태가 변경되었습니다."
+        }
     
     return {
         "success": False,
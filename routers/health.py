@@ -0,0 +1,25 @@
+from fastapi import APIRouter
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse
+
+from dependencies.health import readiness
+
+router = APIRouter(tags=["Health"])
+
+@router.get("/healthz")
+async def liveness():
+    """프로세스 응답 여부만 확인 (저장소 접근 없음)"""
+    return {"success": True, "data": {"status": "ok"}}
+
+@router.get("/readyz")
+async def readiness_check():
+    """저장소 로드/워밍업 완료, 변경 기록 반영 지연, 처리 중 요청 수 확인 (준비 전에는 503)"""
+    # SQLite 백엔드는 레코드 수 조회가 쿼리이므로 이벤트 루프 밖에서 실행
+    ready, checks = await run_in_threadpool(readiness)
+    if ready:
+        return {"success": True, "data": {"status": "ready", "checks": checks}}
+    return JSONResponse(status_code=503, content={
+        "success": False,
+        "error": {"code": "NOT_READY", "message": "서비스 준비 중입니다."},
+        "data": {"status": "not_ready", "checks": checks},
+    })
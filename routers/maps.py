@@ -1,9 +1,37 @@
-from fastapi import APIRouter, File, UploadFile
+from fastapi import APIRouter, File, Form, HTTPException, Query, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, JSONResponse, RedirectResponse
 from typing import Optional, List, Dict, Any
-import json
 import os
+import shutil
 from datetime import datetime
 
+from dependencies import blob_store
+from dependencies.change_feed import CHANGES_MAX_PAGE_SIZE, CHANGES_PAGE_SIZE, get_changes
+from dependencies.merge_patch import apply_merge_patch, diff_paths
+from dependencies.projection import get_projection, invalid_fields_error
+from dependencies.health import register_warmup
+from dependencies.hole_metadata import build_hole_index, parse_hole_files, safe_relative_path
+from dependencies.map_versions import (
+    bump_version,
+    commit_revision,
+    delete_history,
+    diff_revisions,
+    ensure_history,
+    get_head_manifest,
+    get_manifest,
+    get_revision,
+    get_revisions,
+    ingest_directory,
+    ingest_file,
+    ingest_json,
+    rollback,
+    snapshot_record
+)
+from dependencies.repository import create_repository
+from dependencies.tiles import IMAGE_TOO_LARGE_ERRORS, build_tile_pyramid, is_tiling_available, read_image_size
+from routers.golf_courses import golf_course_repository
+
 router = APIRouter(
     prefix="/maps",
     tags=["Maps"],
@@ -11,7 +39,15 @@ router = APIRouter(
 
 # 데이터 파일 경로
 DATA_FILE = 'maps_data.json'
-GOLF_COURSES_FILE = 'golf_courses_data.json'
+
+# 버전별 파일 목록(manifest) 경로 규칙
+IMAGE_PREFIX = "image/"
+TILES_PREFIX = "tiles/"
+METADATA_PREFIX = "metadata/"
+HOLE_INDEX_PATH = "metadata/index.json"
+
+# 버전이 포함된 타일 URL은 내용이 바뀌지 않으므로 장기 캐시
+TILE_CACHE_CONTROL = "public, max-age=31536000, immutable"
 
 # 초기 샘플 데이터
 initial_maps = [
@@ -107,84 +143,80 @@ initial_maps = [
           }
 ]
 
-# 데이터 로드/저장 함수들
-def load_maps():
-    """파일에서 맵 데이터 로드"""
-    if os.path.exists(DATA_FILE):
-        try:
-            with open(DATA_FILE, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (json.JSONDecodeError, IOError):
-            print(f"⚠️ {DATA_FILE} 파일 읽기 실패, 초기 데이터로 복원")
-    
-    # 파일이 없거나 읽기 실패 시 초기 데이터 생성
-    save_maps(initial_maps)
-    return initial_maps
-
-def save_maps(maps):
-    """파일에 맵 데이터 저장"""
-    try:
-        with open(DATA_FILE, 'w', encoding='utf-8') as f:
-            json.dump(maps, f, ensure_ascii=False, indent=2)
-        print(f"💾 맵 데이터를 {DATA_FILE}에 저장했습니다.")
-    except IOError as e:
-        print(f"❌ 데이터 저장 실패: {e}")
-
-def load_golf_courses():
-    """골프장 데이터 로드"""
-    if os.path.exists(GOLF_COURSES_FILE):
-        try:
-            with open(GOLF_COURSES_FILE, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (json.JSONDecodeError, IOError):
-            print(f"⚠️ {GOLF_COURSES_FILE} 파일 읽기 실패")
-    return []
+# 맵 저장소 (STORAGE_BACKEND에 따라 JSON 파일 또는 SQLite)
+map_repository = create_repository(
+    "maps",
+    key_field="mapId",
+    indexes={"golfCourseId": "connectedGolfCourseId", "status": "mapStatus.status"},
+    search_fields=("mapName", "mapId"),
+    sort_fields=("mapName", "mapId", "version", "createdAt", "updatedAt"),
+    data_file=DATA_FILE,
+    initial=initial_maps,
+    label="맵"
+)
 
 def get_golf_course_name(golf_course_id: str) -> str:
     """골프장 ID로 골프장 이름 조회"""
-    golf_courses = load_golf_courses()
-    for course in golf_courses:
-        if course.get('id') == golf_course_id:
-            return course.get('courseName', golf_course_id)
-    return golf_course_id
+    course = golf_course_repository.get(golf_course_id) if golf_course_id else None
+    return course.get('courseName', golf_course_id) if course else golf_course_id
+
+def get_hole_index(map_id: str) -> Optional[dict]:
+    """현재 버전의 홀 메타데이터 인덱스 (blob 해시 기준 캐시)"""
+    entry = get_head_manifest(map_id).get(HOLE_INDEX_PATH)
+    return blob_store.read_json(entry["hash"]) if entry else None
+
+def warm_hole_indexes():
+    """홀 메타데이터 인덱스 blob 캐시 워밍업 (캐시 크기만큼)"""
+    for count, map_item in enumerate(map_repository.iter_all()):
+        if count >= blob_store.JSON_CACHE_SIZE:
+            break
+        get_hole_index(map_item["mapId"])
+
+register_warmup("map_hole_indexes", warm_hole_indexes)
 
-# 전역 데이터 (서버 시작시 로드)
-sample_maps = load_maps()
+def save_upload_file(upload: UploadFile, destination: str) -> int:
+    """업로드 파일을 메모리에 모두 올리지 않고 디스크로 복사"""
+    os.makedirs(os.path.dirname(destination), exist_ok=True)
+    upload.file.seek(0)
+    with open(destination, 'wb') as f:
+        shutil.copyfileobj(upload.file, f, 1024 * 1024)
+    return os.path.getsize(destination)
 
 @router.get("")
-async def get_maps(page: int = 1, limit: int = 20, golfCourseId: Optional[str] = None, status: Optional[str] = None, search: Optional[str] = None, sortBy: Optional[str] = None, sortOrder: Optional[str] = None):
-    # 필터링 로직
-    filtered_maps = sample_maps.copy()
-    
-    # 골프장 필터
-    if golfCourseId and golfCourseId != 'all':
-        filtered_maps = [map_item for map_item in filtered_maps if map_item['connectedGolfCourseId'] == golfCourseId]
-    
-    # 상태 필터
-    if status and status != 'all':
-        filtered_maps = [map_item for map_item in filtered_maps if map_item['mapStatus']['status'] == status]
-    
-    # 검색 필터
-    if search:
-        search_lower = search.lower()
-        filtered_maps = [
-            map_item for map_item in filtered_maps 
-            if search_lower in map_item['mapName'].lower() or 
-               search_lower in map_item['mapId'].lower()
-        ]
-    
-    # 전체 개수
-    total = len(filtered_maps)
+async def get_maps(page: int = 1, limit: int = 20, golfCourseId: Optional[str] = None, status: Optional[str] = None, search: Optional[str] = None, sortBy: Optional[str] = None, sortOrder: Optional[str] = None, fields: Optional[str] = None):
+    # fields: 응답에 포함할 경로 (예: mapName,version,mapStatus.status,golfCourseName)
+    try:
+        project = get_projection(fields, key_field="mapId")
+    except ValueError as e:
+        return invalid_fields_error(e)
+
+    # 골프장/상태 필터는 인덱스, 검색/정렬/페이지네이션은 저장소에서 처리
+    page_items, total = map_repository.query(
+        filters={
+            "golfCourseId": golfCourseId if golfCourseId and golfCourseId != 'all' else None,
+            "status": status if status and status != 'all' else None
+        },
+        search=search,
+        sort_by=sortBy,
+        sort_order=sortOrder or "asc",
+        offset=(page - 1) * limit,
+        limit=limit
+    )
     total_pages = (total + limit - 1) // limit
     
-    # 페이지네이션
-    start = (page - 1) * limit
-    end = start + limit
-    items = filtered_maps[start:end]
-    
-    # 각 맵에 골프장 이름 추가
-    for item in items:
-        item['golfCourseName'] = get_golf_course_name(item.get('connectedGolfCourseId', ''))
+    # 각 맵에 골프장 이름 추가 (저장된 레코드는 수정하지 않도록 복사, 필드 선택 시 요청한 경우에만 조회)
+    if project is None:
+        items = [
+            {**item, 'golfCourseName': get_golf_course_name(item.get('connectedGolfCourseId', ''))}
+            for item in page_items
+        ]
+    elif 'golfCourseName' in project.top_level:
+        items = [
+            {**project(item), 'golfCourseName': get_golf_course_name(item.get('connectedGolfCourseId', ''))}
+            for item in page_items
+        ]
+    else:
+        items = [project(item) for item in page_items]
     
     return {
         "success": True,
@@ -236,9 +268,9 @@ async def create_map(body: Dict[Any, Any]):
         }
     }
     
-    # 메모리와 파일에 저장
-    sample_maps.append(new_map)
-    save_maps(sample_maps)
+    # 저장소에 저장
+    map_repository.insert(new_map)
+    ensure_history(new_map)
     
     return {
         "success": True,
@@ -246,10 +278,19 @@ async def create_map(body: Dict[Any, Any]):
         "message": "맵이 생성되었습니다."
     }
 
+@router.get("/changes")
+async def get_map_changes(since: Optional[int] = Query(None, ge=0), limit: int = Query(CHANGES_PAGE_SIZE, ge=1, le=CHANGES_MAX_PAGE_SIZE)):
+    """since 이후 생성/수정/삭제된 맵 (목록과 같이 골프장 이름 포함)"""
+    return {"success": True, "data": get_changes(
+        map_repository, since, limit,
+        transform=lambda item: {**item, 'golfCourseName': get_golf_course_name(item.get('connectedGolfCourseId', ''))},
+        always_fields=('golfCourseName',)
+    )}
+
 @router.get("/{id}")
 async def get_map_details(id: str):
     # 해당 ID의 맵 찾기
-    map_item = next((m for m in sample_maps if m["mapId"] == id), None)
+    map_item = map_repository.get(id)
     
     if not map_item:
         return {
@@ -269,24 +310,51 @@ async def get_map_details(id: str):
         "data": map_item_with_name
     }
 
+def save_map_changes(map_item: dict, updated_map: dict) -> dict:
+    """내용이 바뀐 경우에만 새 버전을 기록하고 바뀐 경로만 저장 (아니면 기존 레코드 반환)"""
+    updated_map["mapId"] = map_item["mapId"]
+    updated_map["version"] = map_item.get("version", "1.0.0")
+    if snapshot_record(updated_map) == snapshot_record(map_item):
+        return map_item
+    # 파일 목록은 이전 버전과 공유
+    ensure_history(map_item)
+    commit_revision(updated_map, message="맵 정보 수정")
+    return map_repository.patch(updated_map, diff_paths(map_item, updated_map))
+
 @router.put("/{id}")
 async def update_map(id: str, body: Dict[Any, Any]):
     # 해당 ID의 맵 찾기 및 업데이트
-    for i, map_item in enumerate(sample_maps):
-        if map_item["mapId"] == id:
-            # 기존 데이터와 새 데이터 병합
-            updated_map = map_item.copy()
-            updated_map.update(body)
-            updated_map["updatedAt"] = datetime.utcnow().isoformat() + "Z"
-            
-            sample_maps[i] = updated_map
-            save_maps(sample_maps)
-            
-            return {
-                "success": True,
-                "data": updated_map,
-                "message": "맵 정보가 수정되었습니다."
-            }
+    map_item = map_repository.get(id)
+    if map_item:
+        # 기존 데이터와 새 데이터 병합 (최상위 키 단위 교체)
+        updated_map = save_map_changes(map_item, {**map_item, **body})
+        
+        return {
+            "success": True,
+            "data": updated_map,
+            "message": "맵 정보가 수정되었습니다."
+        }
+    
+    return {
+        "success": False,
+        "error": {
+            "code": "NOT_FOUND",
+            "message": "맵을 찾을 수 없습니다."
+        }
+    }
+
+@router.patch("/{id}")
+async def patch_map(id: str, body: Dict[Any, Any]):
+    """JSON Merge Patch(RFC 7386)로 바꿀 경로만 전송 (null은 삭제, 중첩 객체는 하위 키끼리 병합)"""
+    map_item = map_repository.get(id)
+    if map_item:
+        updated_map = save_map_changes(map_item, apply_merge_patch(map_item, body))
+        
+        return {
+            "success": True,
+            "data": updated_map,
+            "message": "맵 정보가 수정되었습니다." if updated_map is not map_item else "변경된 내용이 없습니다."
+        }
     
     return {
         "success": False,
@@ -299,14 +367,12 @@ async def update_map(id: str, body: Dict[Any, Any]):
 @router.delete("/{id}")
 async def delete_map(id: str):
     # 해당 ID의 맵 삭제
-    for i, map_item in enumerate(sample_maps):
-        if map_item["mapId"] == id:
-            sample_maps.pop(i)
-            save_maps(sample_maps)
-            return {
-                "success": True,
-                "message": "맵이 삭제되었습니다."
-            }
+    if map_repository.delete(id):
+        delete_history(id)
+        return {
+            "success": True,
+            "message": "맵이 삭제되었습니다."
+        }
     
     return {
         "success": False,
@@ -317,36 +383,314 @@ async def delete_map(id: str):
     }
 
 @router.post("/upload-image")
-async def upload_map_image(image: UploadFile = File(...), mapId: Optional[str] = None):
+async def upload_map_image(image: UploadFile = File(...), mapId: Optional[str] = Form(None)):
+    filename = os.path.basename(image.filename or "map-image")
+    map_item = map_repository.get(mapId) if mapId else None
+
+    # 작업 디렉토리에 저장/타일링한 뒤 blob 저장소로 이동 (같은 내용은 한 번만 저장)
+    work_dir = await run_in_threadpool(blob_store.make_work_dir)
+    try:
+        image_path = os.path.join(work_dir, filename)
+        size = await run_in_threadpool(save_upload_file, image, image_path)
+        image_size = await run_in_threadpool(read_image_size, image_path)
+
+        pyramid = None
+        tile_entries = {}
+        if map_item and is_tiling_available():
+            tiles_dir = os.path.join(work_dir, "tiles")
+            pyramid = await run_in_threadpool(build_tile_pyramid, image_path, tiles_dir)
+            tile_entries = await run_in_threadpool(ingest_directory, tiles_dir, TILES_PREFIX)
+
+        image_entries = await run_in_threadpool(ingest_file, image_path, f"{IMAGE_PREFIX}{filename}")
+    except IMAGE_TOO_LARGE_ERRORS:
+        return JSONResponse(status_code=400, content={
+            "success": False,
+            "error": {
+                "code": "IMAGE_TOO_LARGE",
+                "message": "이미지 해상도가 너무 큽니다."
+            }
+        })
+    finally:
+        await run_in_threadpool(shutil.rmtree, work_dir, True)
+
+    image_url = blob_store.blob_url(image_entries[f"{IMAGE_PREFIX}{filename}"]["hash"])
+    data = {
+        "url": image_url,
+        "thumbnailUrl": f"/uploads/maps/thumbnails/{filename}-thumb.jpg",
+        "filename": filename,
+        "size": size,
+        "mimeType": image.content_type,
+        "resolution": f"{image_size[0]}x{image_size[1]}" if image_size else None,
+        "tiles": None
+    }
+
+    # 파일 처리 중 다른 수정이 저장되었을 수 있으므로 마지막 await 뒤 다시 읽은 레코드의 사본에 반영
+    map_item = map_repository.get(mapId) if map_item else None
+    if map_item:
+        ensure_history(map_item)
+        new_version = bump_version(map_item.get("version", "1.0.0"))
+        manifest_updates = dict(image_entries)
+        replace_prefixes = (IMAGE_PREFIX,)
+
+        updated_map = {
+            **map_item,
+            "mapData": {**map_item.get("mapData", {}), "size": f"{size / (1024 * 1024):.1f}MB"},
+            "mapFiles": {**map_item.get("mapFiles", {}), "imageFile": image_url}
+        }
+        if data["resolution"]:
+            updated_map["mapData"]["resolution"] = data["resolution"]
+        if pyramid:
+            # 타일 URL은 새 버전에 묶이므로 이전 버전 URL의 캐시와 충돌하지 않음
+            updated_map["mapFiles"]["tiles"] = {
+                "urlTemplate": f"/api/maps/{map_item['mapId']}/tiles/{{z}}/{{x}}/{{y}}?v={new_version}",
+                "version": new_version,
+                **pyramid
+            }
+            manifest_updates.update(tile_entries)
+            replace_prefixes += (TILES_PREFIX,)
+            data["tiles"] = updated_map["mapFiles"]["tiles"]
+
+        commit_revision(updated_map, manifest_updates, replace_prefixes, message=f"이미지 업로드: {filename}")
+        map_repository.patch(updated_map, diff_paths(map_item, updated_map))
+
     return {
       "success": True,
-      "data": {
-        "url": f"/uploads/maps/images/{image.filename}",
-        "thumbnailUrl": f"/uploads/maps/thumbnails/{image.filename}-thumb.jpg",
-        "filename": image.filename,
-        "size": image.size,
-        "mimeType": image.content_type,
-        "resolution": "4096x4096"
-      },
+      "data": data,
       "message": "이미지가 업로드되었습니다."
     }
 
+@router.get("/{id}/tiles/{z}/{x}/{y}")
+async def get_map_tile(id: str, z: int, x: int, y: int, v: Optional[str] = None):
+    """맵 타일 조회 (z/x/y), 버전(v)이 포함된 URL은 장기 캐시"""
+    map_item = map_repository.get(id)
+    if not map_item:
+        raise HTTPException(status_code=404, detail="맵을 찾을 수 없습니다.")
+
+    if v is None:
+        # 버전 없는 요청은 현재 버전 URL로 보내 캐시 키를 버전에 묶음
+        return RedirectResponse(
+            url=f"/api/maps/{id}/tiles/{z}/{x}/{y}?v={map_item.get('version', '1.0.0')}",
+            status_code=302,
+            headers={"Cache-Control": "no-cache"}
+        )
+
+    manifest = get_manifest(get_revision(id, v))
+    for tile_format, media_type in (("jpg", "image/jpeg"), ("png", "image/png")):
+        entry = manifest.get(f"{TILES_PREFIX}{z}/{x}/{y}.{tile_format}")
+        if entry:
+            return FileResponse(
+                blob_store.blob_path(entry["hash"]),
+                media_type=media_type,
+                headers={"Cache-Control": TILE_CACHE_CONTROL, "ETag": f'"{entry["hash"]}"'}
+            )
+
+    raise HTTPException(status_code=404, detail="타일을 찾을 수 없습니다.")
+
 @router.post("/upload-metadata")
-async def upload_map_metadata(metadata_files: List[UploadFile] = File(...), mapId: Optional[str] = None):
+async def upload_map_metadata(metadata_files: List[UploadFile] = File(...), mapId: Optional[str] = Form(None)):
+    map_item = None
+    if mapId:
+        map_item = map_repository.get(mapId)
+        if not map_item:
+            return {
+                "success": False,
+                "error": {
+                    "code": "NOT_FOUND",
+                    "message": "맵을 찾을 수 없습니다."
+                }
+            }
+
+    work_dir = await run_in_threadpool(blob_store.make_work_dir)
+    saved_files = []
+    try:
+        for upload in metadata_files:
+            relative_path = safe_relative_path(upload.filename).replace(os.sep, "/")
+            size = await run_in_threadpool(save_upload_file, upload, os.path.join(work_dir, relative_path))
+            saved_files.append({"name": upload.filename, "path": relative_path, "size": size})
+
+        json_files = [
+            (os.path.join(work_dir, f["path"]), f["path"])
+            for f in saved_files if f["path"].lower().endswith('.json')
+        ]
+        results = await parse_hole_files(json_files)
+        index = build_hole_index(mapId, results)
+
+        # 원본 파일은 blob 저장소로 이동, 변경되지 않은 파일은 이전 버전과 공유됨
+        manifest_updates = {}
+        for f in saved_files:
+            manifest_updates.update(await run_in_threadpool(
+                ingest_file, os.path.join(work_dir, f["path"]), f"{METADATA_PREFIX}{f['path']}"
+            ))
+    finally:
+        await run_in_threadpool(shutil.rmtree, work_dir, True)
+
+    for f in saved_files:
+        f["url"] = blob_store.blob_url(manifest_updates[f"{METADATA_PREFIX}{f['path']}"]["hash"])
+    for hole in index["holes"].values():
+        hole["blob"] = manifest_updates[f"{METADATA_PREFIX}{hole['file']}"]["hash"]
+    manifest_updates.update(await run_in_threadpool(ingest_json, index, HOLE_INDEX_PATH))
+    folder_path = blob_store.blob_url(manifest_updates[HOLE_INDEX_PATH]["hash"])
+
+    # 파일 처리 중 다른 수정이 저장되었을 수 있으므로 마지막 await 뒤 다시 읽은 레코드의 사본에 반영
+    map_item = map_repository.get(mapId) if map_item else None
+    if map_item:
+        updated_map = {
+            **map_item,
+            "mapFiles": {**map_item.get("mapFiles", {}), "metadataFile": folder_path, "holeCount": index["holeCount"]}
+        }
+        commit_revision(updated_map, manifest_updates, (METADATA_PREFIX,), message="홀 메타데이터 업로드")
+        map_repository.patch(updated_map, diff_paths(map_item, updated_map))
+
     return {
       "success": True,
       "data": {
-        "folderPath": "/uploads/maps/metadata/folder-12345",
-        "fileCount": len(metadata_files),
-        "jsonFileCount": len([f for f in metadata_files if f.filename.endswith('.json')]),
-        "totalSize": sum(f.size for f in metadata_files),
-        "files": [
-          {
-            "name": f.filename,
-            "path": f"holes/{f.filename}",
-            "size": f.size
-          } for f in metadata_files
-        ]
+        "folderPath": folder_path,
+        "fileCount": len(saved_files),
+        "jsonFileCount": len(json_files),
+        "totalSize": sum(f["size"] for f in saved_files),
+        "files": saved_files,
+        "holeCount": index["holeCount"],
+        "errors": index["errors"]
       },
       "message": "메타데이터가 업로드되었습니다."
     }
+
+@router.get("/{id}/holes")
+async def get_map_holes(id: str):
+    """업로드된 홀 메타데이터 인덱스 조회 (원본 파일 재파싱 없음)"""
+    index = get_hole_index(id)
+    if not index:
+        return {
+            "success": False,
+            "error": {
+                "code": "NOT_FOUND",
+                "message": "홀 메타데이터를 찾을 수 없습니다."
+            }
+        }
+
+    return {
+        "success": True,
+        "data": index
+    }
+
+@router.get("/{id}/holes/{holeNumber}")
+async def get_map_hole(id: str, holeNumber: int):
+    """홀 번호별 경계 박스와 원본 파일 경로 조회"""
+    index = get_hole_index(id)
+    hole = index["holes"].get(str(holeNumber)) if index else None
+    if not hole:
+        return {
+            "success": False,
+            "error": {
+                "code": "NOT_FOUND",
+                "message": "홀 메타데이터를 찾을 수 없습니다."
+            }
+        }
+
+    return {
+        "success": True,
+        "data": {
+            "hole": holeNumber,
+            "url": blob_store.blob_url(hole["blob"]),
+            **hole
+        }
+    }
+
+# 맵 버전 이력 API
+@router.get("/{id}/versions")
+async def get_map_versions(id: str):
+    """맵 버전 목록 조회 (최신순)"""
+    map_item = map_repository.get(id)
+    if not map_item:
+        return {
+            "success": False,
+            "error": {
+                "code": "NOT_FOUND",
+                "message": "맵을 찾을 수 없습니다."
+            }
+        }
+
+    revisions = get_revisions(id)
+    return {
+        "success": True,
+        "data": {
+            "currentVersion": map_item.get("version"),
+            "items": list(reversed(revisions)),
+            "total": len(revisions)
+        }
+    }
+
+@router.get("/{id}/versions/diff")
+async def diff_map_versions(id: str, fromVersion: str, toVersion: str):
+    """두 버전 비교 (변경된 레코드 필드, 추가/삭제/변경된 파일)"""
+    diff = diff_revisions(id, fromVersion, toVersion)
+    if not diff:
+        return {
+            "success": False,
+            "error": {
+                "code": "NOT_FOUND",
+                "message": "맵 버전을 찾을 수 없습니다."
+            }
+        }
+
+    return {
+        "success": True,
+        "data": diff
+    }
+
+@router.get("/{id}/versions/{version}")
+async def get_map_version(id: str, version: str):
+    """특정 버전의 레코드 스냅샷과 파일 목록 조회"""
+    revision = get_revision(id, version)
+    if not revision:
+        return {
+            "success": False,
+            "error": {
+                "code": "NOT_FOUND",
+                "message": "맵 버전을 찾을 수 없습니다."
+            }
+        }
+
+    return {
+        "success": True,
+        "data": {
+            **revision,
+            "record": blob_store.read_json(revision["record"]),
+            "files": [
+                {"path": path, "url": blob_store.blob_url(entry["hash"]), **entry}
+                for path, entry in sorted(get_manifest(revision).items())
+            ]
+        }
+    }
+
+@router.post("/{id}/versions/{version}/rollback")
+async def rollback_map_version(id: str, version: str):
+    """이전 버전으로 롤백 (기존 blob을 참조하는 새 버전 생성, 데이터 복사 없음)"""
+    map_item = map_repository.get(id)
+    if not map_item:
+        return {
+            "success": False,
+            "error": {
+                "code": "NOT_FOUND",
+                "message": "맵을 찾을 수 없습니다."
+            }
+        }
+
+    # 저장된 레코드를 직접 수정하지 않도록 사본에 롤백하고 바뀐 경로만 저장
+    rolled_back = {**map_item}
+    revision = rollback(rolled_back, version)
+    if not revision:
+        return {
+            "success": False,
+            "error": {
+                "code": "NOT_FOUND",
+                "message": "맵 버전을 찾을 수 없습니다."
+            }
+        }
+    rolled_back = map_repository.patch(rolled_back, diff_paths(map_item, rolled_back))
+
+    return {
+        "success": True,
+        "data": rolled_back,
+        "message": f"{version} 버전으로 롤백되었습니다."
+    }
@@ -1,35 +1,47 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Query
 from typing import Optional
 
+from dependencies.auth import to_public_user, user_repository
+
 router = APIRouter(
     prefix="/users",
     tags=["Users"],
 )
 
 @router.get("")
-async def get_users(page: int = 1, limit: int = 20, role: Optional[str] = None, status: Optional[str] = None, search: Optional[str] = None):
+async def get_users(
+    page: int = Query(1, ge=1),
+    limit: int = Query(20, ge=1, le=100),
+    role: Optional[str] = None,
+    status: Optional[str] = None,
+    golfCourseId: Optional[str] = None,
+    search: Optional[str] = None,
+    sortBy: Optional[str] = None,
+    sortOrder: Optional[str] = None
+):
+    # 역할/상태/골프장 필터는 인덱스, 검색은 이메일/이름/전화번호 접두어 인덱스로 처리
+    items, total = user_repository.query(
+        filters={
+            "role": role if role and role != 'all' else None,
+            "status": status if status and status != 'all' else None,
+            "golfCourseId": golfCourseId,
+        },
+        search=search,
+        sort_by=sortBy,
+        sort_order=sortOrder or "asc",
+        offset=(page - 1) * limit,
+        limit=limit
+    )
+
     return {
       "success": True,
       "data": {
-        "items": [
-          {
-            "id": "USER-001",
-            "email": "admin@example.com",
-            "name": "관리자",
-            "role": "ADMIN",
-            "status": "ACTIVE",
-            "phone": "010-1234-5678",
-            "department": "시스템관리팀",
-            "golfCourseId": None,
-            "lastLoginAt": "2024-01-15T09:00:00Z",
-            "createdAt": "2024-01-01T09:00:00Z"
-          }
-        ],
+        "items": [to_public_user(user) for user in items],
         "pagination": {
           "page": page,
           "limit": limit,
-          "total": 35,
-          "totalPages": (35 // limit) + 1
+          "total": total,
+          "totalPages": (total + limit - 1) // limit
         }
       }
     }
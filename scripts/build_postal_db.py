@@ -0,0 +1,41 @@
+"""
+우편번호 DB 파일 생성
+
+    python scripts/build_postal_db.py data/postal_codes_sample.tsv
+    python scripts/build_postal_db.py 서울특별시.txt 경기도.txt ... --output postal_codes.bin
+
+입력은 저장소 샘플 형식(탭 구분, postalCode/roadAddress/... 헤더) 또는 우체국 도로명주소 우편번호 DB
+('|' 구분, 시도별 파일)이며 여러 파일을 한 DB로 합친다. 좌표가 있는 주소로 역지오코딩 트리(<출력>.kdtree)도 만든다.
+서버는 POSTAL_DB_PATH 파일과 트리 파일을 mmap으로 연다.
+"""
+import argparse
+import itertools
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dependencies.postal_codes import POSTAL_DB_PATH, PostalCodeDatabase, build_database, read_source  # noqa: E402
+from dependencies.reverse_geocoding import build_kdtree  # noqa: E402
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="우편번호 DB 파일 생성")
+    parser.add_argument("sources", nargs="+", help="원본 주소 파일")
+    parser.add_argument("--output", default=POSTAL_DB_PATH, help=f"생성할 DB 파일 (기본: {POSTAL_DB_PATH})")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    count = build_database(itertools.chain.from_iterable(read_source(path) for path in args.sources), args.output)
+    print(f"💾 {count}개 주소 -> {args.output} ({os.path.getsize(args.output):,} bytes, {time.perf_counter() - started:.1f}초)")
+
+    # 좌표가 있는 주소로 역지오코딩 트리도 함께 생성
+    started = time.perf_counter()
+    points = build_kdtree(PostalCodeDatabase(args.output), args.output + ".kdtree")
+    print(f"💾 {points}개 좌표 -> {args.output}.kdtree ({time.perf_counter() - started:.1f}초)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
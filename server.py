@@ -0,0 +1,185 @@
+"""
+운영 서버 실행 스크립트
+
+    python server.py
+
+- 저장소를 부모 프로세스에서 한 번 로드한 뒤 워커를 fork하여 공유 (copy-on-write)
+- 부모가 만든 소켓 하나를 모든 워커가 함께 accept
+- uvloop/httptools가 설치되어 있으면 사용 (uvicorn[standard])
+- SIGTERM/SIGINT 시 워커에 전달하여 처리 중인 요청을 마친 뒤 종료, GRACEFUL_TIMEOUT 초과 시 강제 종료
+- 비정상 종료된 워커는 다시 띄움
+"""
+import os
+import signal
+import sys
+import time
+
+# 환경변수에서 설정값 가져오기
+SERVER_HOST = os.getenv("SERVER_HOST", "0.0.0.0")
+SERVER_PORT = int(os.getenv("SERVER_PORT", "8000"))
+
+
+def default_workers() -> int:
+    """사용 가능한 CPU 수 (컨테이너에서 CPU를 제한한 경우 반영)"""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", "0")) or default_workers()
+SERVER_LOOP = os.getenv("SERVER_LOOP", "auto")  # auto | uvloop | asyncio
+SERVER_HTTP = os.getenv("SERVER_HTTP", "auto")  # auto | httptools | h11
+SERVER_BACKLOG = int(os.getenv("SERVER_BACKLOG", "2048"))
+KEEPALIVE_TIMEOUT = int(os.getenv("KEEPALIVE_TIMEOUT", "5"))
+GRACEFUL_TIMEOUT = int(os.getenv("GRACEFUL_TIMEOUT", "30"))
+# 워커별 최대 처리 요청 수 (0: 제한 없음), 도달하면 워커를 교체
+MAX_REQUESTS = int(os.getenv("MAX_REQUESTS", "0"))
+LOG_LEVEL = os.getenv("LOG_LEVEL", "info")
+ACCESS_LOG = os.getenv("ACCESS_LOG", "true").lower() == "true"
+FORWARDED_ALLOW_IPS = os.getenv("FORWARDED_ALLOW_IPS", "127.0.0.1")
+
+# 워커가 빠르게 반복 종료되면 재시작 간격을 둠
+RESPAWN_DELAY = 1.0
+
+# 여러 워커가 JSON 저장소를 공유하도록 변경 기록 사용 (main 임포트 전에 설정해야 함)
+if WEB_CONCURRENCY > 1:
+    os.environ.setdefault("STORE_JOURNAL", "store_journal.ndjson")
+    os.environ["STORE_JOURNAL_SESSION"] = f"{os.getpid()}-{time.time_ns()}"
+
+import uvicorn  # noqa: E402
+
+from dependencies import logger as log  # noqa: E402
+
+logger = log.get_logger("server")
+
+
+def build_config(app) -> uvicorn.Config:
+    return uvicorn.Config(
+        app,
+        host=SERVER_HOST,
+        port=SERVER_PORT,
+        loop=SERVER_LOOP,
+        http=SERVER_HTTP,
+        lifespan="on",
+        log_level=LOG_LEVEL,
+        access_log=ACCESS_LOG,
+        proxy_headers=True,
+        forwarded_allow_ips=FORWARDED_ALLOW_IPS,
+        backlog=SERVER_BACKLOG,
+        timeout_keep_alive=KEEPALIVE_TIMEOUT,
+        timeout_graceful_shutdown=GRACEFUL_TIMEOUT,
+        limit_max_requests=MAX_REQUESTS or None,
+    )
+
+
+def run_worker(config: uvicorn.Config, sock):
+    """워커 프로세스: 공유 소켓으로 서버 실행 (uvicorn이 SIGTERM 시 처리 중인 요청을 마치고 종료)"""
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+class Supervisor:
+    """워커 프로세스 생성/감시/종료"""
+
+    def __init__(self, config: uvicorn.Config, sock, workers: int):
+        self.config = config
+        self.sock = sock
+        self.workers = workers
+        self.pids = set()
+        self.stopping = False
+
+    def spawn(self):
+        pid = os.fork()
+        if pid == 0:
+            exit_code = 0
+            try:
+                run_worker(self.config, self.sock)
+            except BaseException:
+                exit_code = 1
+            finally:
+                # os._exit는 atexit을 실행하지 않으므로 남은 로그를 직접 출력
+                log.flush()
+                os._exit(exit_code)
+        self.pids.add(pid)
+
+    def handle_stop(self, signum, frame):
+        self.stopping = True
+
+    def reap(self) -> list:
+        """종료된 워커 회수, (pid, 종료 코드) 목록 반환"""
+        exited = []
+        while self.pids:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                self.pids.clear()
+                break
+            if pid == 0:
+                break
+            self.pids.discard(pid)
+            exited.append((pid, os.waitstatus_to_exitcode(status)))
+        return exited
+
+    def run(self):
+        signal.signal(signal.SIGTERM, self.handle_stop)
+        signal.signal(signal.SIGINT, self.handle_stop)
+
+        for _ in range(self.workers):
+            self.spawn()
+        logger.info(f"{self.workers}개 워커로 http://{SERVER_HOST}:{SERVER_PORT} 에서 실행 중", extra={"fields": {"pid": os.getpid()}})
+
+        while not self.stopping:
+            for pid, exit_code in self.reap():
+                if self.stopping:
+                    break
+                # MAX_REQUESTS 도달로 정상 종료한 워커도 같은 방식으로 교체
+                logger.warning("워커 종료, 새 워커 시작", extra={"fields": {"pid": pid, "exitCode": exit_code}})
+                time.sleep(0 if exit_code == 0 else RESPAWN_DELAY)
+                self.spawn()
+            time.sleep(0.2)
+
+        self.shutdown()
+
+    def shutdown(self):
+        """워커에 SIGTERM 전달 후 GRACEFUL_TIMEOUT 동안 대기, 남은 워커는 강제 종료"""
+        logger.info(f"종료 신호 수신, 처리 중인 요청 완료 대기 (최대 {GRACEFUL_TIMEOUT}초)")
+        for pid in list(self.pids):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                self.pids.discard(pid)
+
+        deadline = time.monotonic() + GRACEFUL_TIMEOUT + 1
+        while self.pids and time.monotonic() < deadline:
+            self.reap()
+            time.sleep(0.1)
+
+        for pid in list(self.pids):
+            try:
+                os.kill(pid, signal.SIGKILL)
+                os.waitpid(pid, 0)
+            except (ProcessLookupError, ChildProcessError):
+                pass
+            self.pids.discard(pid)
+
+
+def main():
+    # 저장소/인덱스를 부모에서 미리 로드하고 캐시를 데워 워커가 fork 시점의 메모리를 공유
+    from main import app
+    from dependencies.health import warmup
+    warmup()
+
+    config = build_config(app)
+    if WEB_CONCURRENCY <= 1:
+        uvicorn.Server(config).run()
+        return
+
+    # 모든 워커가 같은 리슨 소켓을 사용
+    sock = config.bind_socket()
+    Supervisor(config, sock, WEB_CONCURRENCY).run()
+    sock.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())